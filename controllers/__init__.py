@@ -3,13 +3,21 @@ VERICOM DLP 3D Printer GUI - Controllers Package
 하드웨어 제어 모듈
 """
 
-from .motor_controller import MotorController
+from .motor_controller import MotorController, MotionStep
 from .dlp_controller import DLPController
-from .gcode_parser import GCodeParser, extract_print_parameters
+from .moonraker_ws import MoonrakerWebSocket
+from .gcode_parser import GCodeParser, LayerArchive, extract_print_parameters
+from .job_info import JobInfo, load_job_info, invalidate_job_info
 
 __all__ = [
     'MotorController',
+    'MotionStep',
     'DLPController',
+    'MoonrakerWebSocket',
     'GCodeParser',
-    'extract_print_parameters'
+    'LayerArchive',
+    'extract_print_parameters',
+    'JobInfo',
+    'load_job_info',
+    'invalidate_job_info'
 ]
@@ -82,6 +82,7 @@ class DLPConfig:
     port: str = ""                      # 자동 검색 또는 수동 지정
     baudrate: int = 9600
     timeout: float = 1.0                # 읽기 타임아웃 (초)
+    command_timeout: float = 0.5        # 명령당 응답 대기 한도 (초, 종료 문자 도착 시 즉시 반환)
 
     # 밝기 설정 (vgui 호환)
     default_brightness: int = 440       # 기본 밝기
@@ -114,6 +115,7 @@ class DLPController:
         self._projector_on = False
         self._led_on = False
         self._current_brightness = self.config.default_brightness
+        self._brightness_synced = False  # _current_brightness가 DF10에 실제 설정된 값인지
         self._flip_mode = FlipMode.NONE
 
         # 시리얼 포트 핸들
@@ -200,6 +202,7 @@ class DLPController:
             print("[DLP] 시리얼 포트 닫힘")
 
         self._is_initialized = False
+        self._brightness_synced = False
         print("[DLP] 컨트롤러 종료")
 
     @property
@@ -208,8 +211,57 @@ class DLPController:
 
     # ==================== 시리얼 통신 ====================
 
-    def _send_command(self, command: str, expect_response: bool = True) -> Optional[str]:
-        """문자열 명령 전송"""
+    # 응답 종료 문자
+    ASCII_TERMINATOR = b"\n"       # 문자열 명령 응답: ...\r\n
+    HEX_TERMINATOR = b"\x0d"       # HEX 명령 응답: 0x2A ... 0x0D
+    HEX_MIN_LENGTH = 4             # HEX 응답 최소 길이 (0x2A, 명령, 상태, 0x0D)
+
+    def _read_response(self, terminator: bytes, timeout: float, min_length: int = 0) -> bytes:
+        """
+        종료 문자가 도착하는 즉시 응답 반환 (명령당 deadline)
+
+        Args:
+            terminator: 응답 종료 바이트
+            timeout: 최대 대기 시간 (초)
+            min_length: 최소 응답 길이 (HEX 응답 안의 0x0D 오인 방지)
+
+        Returns:
+            수신한 바이트 (타임아웃 시 그때까지 받은 데이터)
+        """
+        deadline = time.monotonic() + timeout
+        buffer = bytearray()
+
+        # 포트 timeout은 읽는 동안만 남은 시간으로 바꾸고 끝나면 원래 값으로 복원
+        original_timeout = self._serial.timeout
+        try:
+            while True:
+                if buffer.endswith(terminator) and len(buffer) >= min_length:
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+
+                self._serial.timeout = remaining
+                chunk = self._serial.read(max(1, self._serial.in_waiting))
+                if not chunk:
+                    break
+                buffer.extend(chunk)
+        finally:
+            self._serial.timeout = original_timeout
+
+        return bytes(buffer)
+
+    def _send_command(self, command: str, expect_response: bool = True,
+                      timeout: Optional[float] = None) -> Optional[str]:
+        """
+        문자열 명령 전송
+
+        Args:
+            command: DF10 명령 (CR+LF는 자동 추가)
+            expect_response: 응답 대기 여부
+            timeout: 응답 대기 한도 (초), None이면 config.command_timeout
+        """
         if self.simulation:
             print(f"[DLP-SIM] 명령 전송: {command}")
             return "OK"
@@ -219,10 +271,8 @@ class DLPController:
             return None
 
         try:
-            # 버퍼 클리어 (입력/출력 모두)
+            # 이전 명령의 늦은 응답 제거
             self._serial.reset_input_buffer()
-            self._serial.reset_output_buffer()
-            time.sleep(0.05)  # 버퍼 클리어 안정화
 
             # 명령 전송 (CR+LF 추가)
             full_command = f"{command}\r\n"
@@ -232,9 +282,11 @@ class DLPController:
             if not expect_response:
                 return None
 
-            # 응답 읽기
-            time.sleep(0.1)
-            raw_response = self._serial.readline()
+            # 응답 읽기 (LF 도착 즉시 반환)
+            raw_response = self._read_response(
+                self.ASCII_TERMINATOR,
+                timeout if timeout is not None else self.config.command_timeout
+            )
 
             # 응답 디코딩 (바이너리 데이터 처리)
             try:
@@ -249,8 +301,16 @@ class DLPController:
             print(f"[DLP] 명령 전송 실패: {e}")
             return None
 
-    def _send_hex_command(self, command: bytes, expect_response: bool = True) -> Optional[bytes]:
-        """HEX 명령 전송"""
+    def _send_hex_command(self, command: bytes, expect_response: bool = True,
+                          timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        HEX 명령 전송
+
+        Args:
+            command: HEX 명령 바이트
+            expect_response: 응답 대기 여부
+            timeout: 응답 대기 한도 (초), None이면 config.command_timeout
+        """
         if self.simulation:
             print(f"[DLP-SIM] HEX 명령 전송: {command.hex()}")
             return bytes([0x2A, 0x00, 0x00, 0x0D])
@@ -260,10 +320,8 @@ class DLPController:
             return None
 
         try:
-            # 버퍼 클리어 (입력/출력 모두)
+            # 이전 명령의 늦은 응답 제거
             self._serial.reset_input_buffer()
-            self._serial.reset_output_buffer()
-            time.sleep(0.05)  # 버퍼 클리어 안정화
 
             self._serial.write(command)
             self._serial.flush()  # 출력 버퍼 비우기
@@ -271,8 +329,12 @@ class DLPController:
             if not expect_response:
                 return None
 
-            time.sleep(0.1)
-            response = self._serial.read(10)
+            # 응답 읽기 (최소 길이 + 0x0D 도착 즉시 반환)
+            response = self._read_response(
+                self.HEX_TERMINATOR,
+                timeout if timeout is not None else self.config.command_timeout,
+                min_length=self.HEX_MIN_LENGTH
+            )
 
             return response
 
@@ -306,6 +368,7 @@ class DLPController:
 
         if response and len(response) >= 4 and response[2] == 0x00:
             self._projector_on = True
+            self._brightness_synced = False  # Boot ON 후 밝기 다시 설정
             print("[DLP] ✅ 프로젝터 ON 성공")
             # Boot ON 후 프로젝터 초기화 대기 (중요!)
             print(f"[DLP] 프로젝터 초기화 대기 {wait_time}초...")
@@ -316,6 +379,7 @@ class DLPController:
         response = self._send_command(DF10Command.POWER_ON)
         if response == "OK":
             self._projector_on = True
+            self._brightness_synced = False
             print("[DLP] ✅ 프로젝터 ON 성공 (문자열 명령)")
             print(f"[DLP] 프로젝터 초기화 대기 {wait_time}초...")
             time.sleep(wait_time)
@@ -350,6 +414,7 @@ class DLPController:
         if response and len(response) >= 4 and response[2] == 0x00:
             self._projector_on = False
             self._led_on = False  # Boot OFF 시 LED도 OFF됨
+            self._brightness_synced = False
             print("[DLP] ✅ 프로젝터 OFF 성공")
             return True
 
@@ -358,6 +423,7 @@ class DLPController:
         if response == "OK":
             self._projector_on = False
             self._led_on = False
+            self._brightness_synced = False
             print("[DLP] ✅ 프로젝터 OFF 성공 (문자열 명령)")
             return True
 
@@ -389,7 +455,7 @@ class DLPController:
                 print("[DLP] ❌ 자동 Boot ON 실패, LED ON 취소")
                 return False
 
-        # 밝기 설정
+        # 밝기 설정 (DF10에 이미 같은 값이 설정돼 있으면 생략)
         if brightness is not None:
             self.set_brightness(brightness)
 
@@ -446,20 +512,26 @@ class DLPController:
     def is_led_on(self) -> bool:
         return self._led_on
 
-    def set_brightness(self, brightness: int) -> bool:
+    def set_brightness(self, brightness: int, force: bool = False) -> bool:
         """
         LED 밝기 설정
 
         Args:
             brightness: 91~1023
+            force: True면 캐시와 관계없이 다시 전송
         """
         brightness = max(self.config.min_brightness,
                         min(brightness, self.config.max_brightness))
 
+        # 같은 값이 이미 설정돼 있으면 재전송 생략 (매 레이어 LED ON 경로)
+        if not force and self._brightness_synced and brightness == self._current_brightness:
+            return True
+
         print(f"[DLP] LED 밝기를 {brightness}(으)로 설정 중...")
 
         if self.simulation:
             self._current_brightness = brightness
+            self._brightness_synced = True
             print(f"[DLP] ✅ LED 밝기 {brightness} 설정 성공 (시뮬레이션)")
             return True
 
@@ -468,9 +540,11 @@ class DLPController:
 
         if response == "OK":
             self._current_brightness = brightness
+            self._brightness_synced = True
             print(f"[DLP] ✅ LED 밝기 {brightness} 설정 성공")
             return True
 
+        self._brightness_synced = False
         print(f"[DLP] ❌ LED 밝기 설정 실패")
         return False
 
@@ -4,12 +4,19 @@ ZIP 파일 내 run.gcode에서 프린트 파라미터 추출
 """
 
 import os
+import hashlib
 import re
+import threading
 import zipfile
-from typing import Dict, Any, Optional
+from array import array
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, asdict
 
 
+# 레이어 경계 상자 인덱스 경로 (작업 내용 해시별 파일)
+LAYER_BOUNDS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "layer_bounds")
+
+
 @dataclass
 class PrintParameters:
     """프린트 파라미터"""
@@ -36,6 +43,8 @@ class PrintParameters:
     # 빌드 정보 (DF10: HDMI 입력 해상도 1920x1080)
     resolutionX: int = 1920
     resolutionY: int = 1080
+    machineX: float = 124.8  # 출력 영역 (mm, 픽셀 피치 = machineX / resolutionX)
+    machineY: float = 70.2
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -63,6 +72,8 @@ class GCodeParser:
         'normalDropSpeed': r';normalDropSpeed:([\d.]+)',
         'resolutionX': r';resolutionX:(\d+)',
         'resolutionY': r';resolutionY:(\d+)',
+        'machineX': r';machineX:([\d.]+)',
+        'machineY': r';machineY:([\d.]+)',
     }
 
     # 블레이드 속도 추출용 (G0 X... F{speed})
@@ -120,22 +131,7 @@ class GCodeParser:
 
                 # PNG 파일 개수 카운트 (레이어 수)
                 # 썸네일 제외, 숫자 포함된 PNG만 카운트
-                png_files = []
-                thumbnail_names = ['preview_cropping.png', 'preview.png', 'thumbnail.png']
-
-                for name in namelist:
-                    if not name.lower().endswith('.png'):
-                        continue
-
-                    filename = os.path.basename(name)
-
-                    # 썸네일 제외
-                    if filename.lower() in [t.lower() for t in thumbnail_names]:
-                        continue
-
-                    # 숫자가 포함된 PNG 파일 (1.png, 001.png, layer_1.png 등)
-                    if re.search(r'\d+', filename):
-                        png_files.append(name)
+                png_files = GCodeParser.filter_layer_images(namelist)
 
                 print(f"[Parser] ZIP 내 파일 목록: {namelist[:10]}...")
                 print(f"[Parser] 레이어 이미지 후보: {png_files[:5]}...")
@@ -176,6 +172,52 @@ class GCodeParser:
     # 썸네일 파일명 (제외 대상)
     THUMBNAIL_NAMES = ['preview_cropping.png', 'preview.png', 'thumbnail.png']
 
+    @staticmethod
+    def is_layer_image_name(name: str) -> bool:
+        """
+        ZIP 멤버 이름이 레이어 이미지인지 확인
+
+        Args:
+            name: ZIP 내 파일명
+
+        Returns:
+            숫자가 포함된 PNG이고 썸네일이 아니면 True
+        """
+        if not name.lower().endswith('.png'):
+            return False
+
+        # 파일명만 추출
+        filename = os.path.basename(name)
+
+        # 썸네일 제외
+        if filename.lower() in [t.lower() for t in GCodeParser.THUMBNAIL_NAMES]:
+            return False
+
+        # 파일명에 숫자가 포함되어 있으면 레이어 이미지
+        return re.search(r'\d+', filename) is not None
+
+    @staticmethod
+    def layer_sort_key(name: str) -> int:
+        """레이어 정렬 키 (파일명의 첫 번째 숫자)"""
+        filename = os.path.basename(name)
+        match = re.search(r'(\d+)', filename)
+        return int(match.group(1)) if match else 0
+
+    @staticmethod
+    def filter_layer_images(namelist: list) -> list:
+        """
+        파일명 목록에서 레이어 이미지만 골라 숫자순 정렬
+
+        Args:
+            namelist: ZIP 내 파일명 리스트
+
+        Returns:
+            레이어 이미지 파일명 리스트 (정렬됨)
+        """
+        images = [name for name in namelist if GCodeParser.is_layer_image_name(name)]
+        images.sort(key=GCodeParser.layer_sort_key)
+        return images
+
     @staticmethod
     def get_layer_images(zip_path: str) -> list:
         """
@@ -187,36 +229,13 @@ class GCodeParser:
         Returns:
             레이어 이미지 파일명 리스트 (정렬됨)
         """
-        images = []
-
         try:
             with zipfile.ZipFile(zip_path, 'r') as z:
-                for name in z.namelist():
-                    if not name.lower().endswith('.png'):
-                        continue
-
-                    # 파일명만 추출
-                    filename = os.path.basename(name)
-
-                    # 썸네일 제외
-                    if filename.lower() in [t.lower() for t in GCodeParser.THUMBNAIL_NAMES]:
-                        continue
-
-                    # 파일명에 숫자가 포함되어 있으면 레이어 이미지
-                    if re.search(r'\d+', filename):
-                        images.append(name)
-
+                return GCodeParser.filter_layer_images(z.namelist())
         except Exception as e:
             print(f"[Parser] 이미지 목록 추출 오류: {e}")
 
-        # 숫자 기준 정렬 (파일명에서 숫자 추출)
-        def sort_key(name):
-            filename = os.path.basename(name)
-            match = re.search(r'(\d+)', filename)
-            return int(match.group(1)) if match else 0
-
-        images.sort(key=sort_key)
-        return images
+        return []
 
     @staticmethod
     def get_preview_image(zip_path: str) -> Optional[bytes]:
@@ -252,7 +271,9 @@ class GCodeParser:
     @staticmethod
     def get_layer_image(zip_path: str, layer_index: int) -> Optional[bytes]:
         """
-        특정 레이어 이미지 추출
+        특정 레이어 이미지 추출 (단발성 조회용)
+
+        프린트 작업처럼 레이어를 연속으로 읽을 때는 LayerArchive 사용
 
         Args:
             zip_path: ZIP 파일 경로
@@ -263,8 +284,8 @@ class GCodeParser:
         """
         try:
             with zipfile.ZipFile(zip_path, 'r') as z:
-                # 이미지 목록 가져와서 인덱스로 접근 (참고 파일 방식)
-                images = GCodeParser.get_layer_images(zip_path)
+                # 같은 핸들에서 이미지 목록을 만들어 인덱스로 접근
+                images = GCodeParser.filter_layer_images(z.namelist())
 
                 if 0 <= layer_index < len(images):
                     image_name = images[layer_index]
@@ -279,6 +300,327 @@ class GCodeParser:
         return None
 
 
+class LayerBounds:
+    """
+    레이어별 경계 상자 (검정이 아닌 영역) 인덱스
+
+    레이어는 대부분 검정이라 경계 상자만 알면 MASK 합성 / 미리보기 축소 / 면적 계산을
+    프레임 전체(2MP)가 아닌 단면 크기만큼만 처리할 수 있음
+    레이어를 처음 디코딩할 때 한 번 계산해 data/layer_bounds/<작업 해시>.bin에 저장
+
+    경계 상자: (x0, y0, x1, y1), x1/y1은 포함하지 않음 (PIL getbbox와 같음)
+        None        → 아직 모름
+        EMPTY       → 완전히 검정인 레이어
+    """
+
+    EMPTY = (0, 0, 0, 0)
+
+    _MAGIC = b"VLB1"
+    _UNKNOWN = 0xFFFF
+
+    def __init__(self, count: int, path: str = ""):
+        """
+        Args:
+            count: 레이어 개수
+            path: 저장 파일 경로 (빈 문자열이면 메모리에만 보관)
+        """
+        self.path = path
+        self._boxes: List[Optional[Tuple[int, int, int, int]]] = [None] * count
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, count: int) -> 'LayerBounds':
+        """저장 파일 로드 (없거나 레이어 개수가 다르면 빈 인덱스)"""
+        bounds = cls(count, path)
+        try:
+            with open(path, 'rb') as f:
+                blob = f.read()
+        except FileNotFoundError:
+            return bounds
+        except OSError as e:
+            print(f"[LayerBounds] 로드 실패: {e}")
+            return bounds
+
+        values = array('H')
+        if blob[:4] == cls._MAGIC and len(blob) == 4 + count * 4 * values.itemsize:
+            values.frombytes(blob[4:])
+            for i in range(count):
+                box = tuple(values[i * 4:i * 4 + 4])
+                if box[0] != cls._UNKNOWN:
+                    bounds._boxes[i] = box
+        return bounds
+
+    def save(self):
+        """변경된 경우에만 저장 (임시 파일에 쓴 뒤 교체)"""
+        with self._lock:
+            if not self._dirty or not self.path:
+                return
+            values = array('H')
+            for box in self._boxes:
+                values.extend(box if box is not None else (self._UNKNOWN,) * 4)
+            self._dirty = False
+
+        # 분석 워커 / 프린트 워커가 같은 작업을 동시에 저장할 수 있으므로 임시 파일은 스레드별로
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(self._MAGIC + values.tobytes())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[LayerBounds] 저장 실패: {e}")
+            with self._lock:
+                self._dirty = True
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def get(self, index: int) -> Optional[Tuple[int, int, int, int]]:
+        """경계 상자 (모르면 None, 범위 밖이면 None)"""
+        if 0 <= index < len(self._boxes):
+            return self._boxes[index]
+        return None
+
+    def set(self, index: int, bbox: Optional[Tuple[int, int, int, int]]):
+        """
+        경계 상자 기록
+
+        Args:
+            index: 레이어 인덱스
+            bbox: (x0, y0, x1, y1), 완전히 검정이면 EMPTY (None은 무시)
+        """
+        if bbox is None or not 0 <= index < len(self._boxes):
+            return
+        box = tuple(int(v) for v in bbox)
+        if len(box) != 4 or max(box) >= self._UNKNOWN:
+            return
+        with self._lock:
+            if self._boxes[index] != box:
+                self._boxes[index] = box
+                self._dirty = True
+
+    @property
+    def known_count(self) -> int:
+        """경계 상자를 아는 레이어 수"""
+        return sum(1 for box in self._boxes if box is not None)
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+
+class LayerArchive:
+    """
+    프린트 작업용 레이어 아카이브
+
+    작업 시작 시 ZIP을 한 번 열어 레이어 파일명 → ZipInfo 인덱스를 만들고,
+    작업이 끝날 때까지 파일 핸들을 유지한다.
+    레이어는 인덱스로 O(1) 조회 (매 레이어마다 ZIP 재오픈/재정렬 없음)
+
+    여러 스레드(프린트 워커, 프리페치 등)에서 동시에 읽을 수 있도록 잠금 사용
+    """
+
+    def __init__(self, zip_path: str, layer_names: Optional[List[str]] = None):
+        """
+        Args:
+            zip_path: ZIP 파일 경로
+            layer_names: 정렬된 레이어 파일명 (JobInfo 결과, None이면 열 때 직접 분류)
+        """
+        self.zip_path = zip_path
+        self._layer_names = layer_names
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._layers: List[zipfile.ZipInfo] = []
+        self._lock = threading.Lock()
+        self.bounds: Optional[LayerBounds] = None  # 레이어 경계 상자 (open 시 로드)
+
+    # ==================== 열기/닫기 ====================
+
+    def open(self) -> bool:
+        """
+        ZIP 열기 및 레이어 인덱스 생성 (작업당 1회)
+
+        Returns:
+            성공 여부
+        """
+        with self._lock:
+            self._close_locked()
+            try:
+                self._zip = zipfile.ZipFile(self.zip_path, 'r')
+                infos = {info.filename: info for info in self._zip.infolist()}
+                names = self._layer_names
+                if names is None or any(name not in infos for name in names):
+                    names = GCodeParser.filter_layer_images(list(infos.keys()))
+                self._layers = [infos[name] for name in names]
+                self._load_bounds()
+                print(f"[LayerArchive] 인덱스 생성: {len(self._layers)}개 레이어 ({self.zip_path})")
+                return True
+            except Exception as e:
+                print(f"[LayerArchive] ZIP 열기 실패: {e}")
+                self._close_locked()
+                return False
+
+    def reopen(self) -> bool:
+        """ZIP 다시 열기 (USB 일시 오류 복구용)"""
+        print(f"[LayerArchive] 다시 열기: {self.zip_path}")
+        return self.open()
+
+    def relocate(self, zip_path: str) -> bool:
+        """
+        같은 내용의 다른 ZIP(로컬 복사본)으로 전환
+
+        레이어 항목의 이름/CRC/크기가 모두 같을 때만 전환하고,
+        다른 스레드의 read_layer()와는 잠금으로 순서가 보장됨
+
+        Returns:
+            전환 성공 여부 (실패 시 기존 ZIP 유지)
+        """
+        try:
+            new_zip = zipfile.ZipFile(zip_path, 'r')
+        except Exception as e:
+            print(f"[LayerArchive] 전환할 ZIP 열기 실패: {e}")
+            return False
+
+        infos = {info.filename: info for info in new_zip.infolist()}
+        with self._lock:
+            if self._zip is None:
+                new_zip.close()
+                return False
+
+            layers = []
+            for old in self._layers:
+                new = infos.get(old.filename)
+                if new is None or new.CRC != old.CRC or new.file_size != old.file_size:
+                    print(f"[LayerArchive] 전환 취소 - 레이어 불일치: {old.filename}")
+                    new_zip.close()
+                    return False
+                layers.append(new)
+
+            self._close_locked()
+            self._zip = new_zip
+            self._layers = layers
+            self.zip_path = zip_path
+
+        print(f"[LayerArchive] 전환: {zip_path}")
+        return True
+
+    def close(self):
+        """ZIP 닫기 (새로 계산한 경계 상자 저장)"""
+        with self._lock:
+            self._close_locked()
+        if self.bounds is not None:
+            self.bounds.save()
+
+    def _close_locked(self):
+        """ZIP 닫기 (잠금 상태에서 호출)"""
+        if self._zip is not None:
+            try:
+                self._zip.close()
+            except Exception:
+                pass
+        self._zip = None
+        self._layers = []
+
+    @property
+    def is_open(self) -> bool:
+        return self._zip is not None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ==================== 레이어 조회 ====================
+
+    def __len__(self) -> int:
+        return len(self._layers)
+
+    @property
+    def layer_count(self) -> int:
+        """레이어 개수"""
+        return len(self._layers)
+
+    @property
+    def layer_names(self) -> List[str]:
+        """레이어 파일명 리스트 (정렬됨)"""
+        return [info.filename for info in self._layers]
+
+    def content_key(self) -> str:
+        """
+        레이어 내용 식별자 (레이어 항목의 이름/CRC/크기 해시)
+
+        ZIP 중앙 디렉터리 정보만 사용하므로 파일 전체를 읽지 않음
+        (같은 내용이면 다른 경로로 복사한 파일도 같은 키)
+        """
+        digest = hashlib.sha1()
+        for info in self._layers:
+            digest.update(f"{info.filename}:{info.CRC:08x}:{info.file_size};".encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    # ==================== 레이어 경계 상자 ====================
+
+    def _load_bounds(self):
+        """경계 상자 인덱스 로드 (같은 내용으로 다시 열면 기존 인덱스 유지)"""
+        path = os.path.join(LAYER_BOUNDS_DIR, f"{self.content_key()}.bin")
+        if self.bounds is not None and self.bounds.path == path and len(self.bounds) == len(self._layers):
+            return
+        self.bounds = LayerBounds.load(path, len(self._layers))
+
+    def layer_bbox(self, layer_index: int) -> Optional[Tuple[int, int, int, int]]:
+        """
+        레이어 경계 상자 (검정이 아닌 영역)
+
+        Returns:
+            (x0, y0, x1, y1), 완전히 검정이면 LayerBounds.EMPTY, 아직 모르면 None
+        """
+        return self.bounds.get(layer_index) if self.bounds is not None else None
+
+    def set_layer_bbox(self, layer_index: int, bbox: Optional[Tuple[int, int, int, int]]):
+        """디코딩한 레이어의 경계 상자 기록 (완전히 검정이면 LayerBounds.EMPTY)"""
+        if self.bounds is not None:
+            self.bounds.set(layer_index, bbox)
+
+    def get_layer_info(self, layer_index: int) -> Optional[zipfile.ZipInfo]:
+        """
+        레이어 ZipInfo 조회
+
+        Args:
+            layer_index: 레이어 인덱스 (0부터 시작)
+
+        Returns:
+            ZipInfo 또는 None (범위 초과)
+        """
+        if 0 <= layer_index < len(self._layers):
+            return self._layers[layer_index]
+        return None
+
+    def read_layer(self, layer_index: int) -> Optional[bytes]:
+        """
+        레이어 이미지 바이트 읽기
+
+        Args:
+            layer_index: 레이어 인덱스 (0부터 시작)
+
+        Returns:
+            이미지 바이트 데이터 또는 None (범위 초과)
+
+        Raises:
+            ZIP 읽기 오류 (USB 분리 등)는 호출자에게 전달 (재시도 판단용)
+        """
+        with self._lock:
+            if self._zip is None:
+                raise IOError(f"아카이브가 열려있지 않음: {self.zip_path}")
+
+            info = self.get_layer_info(layer_index)
+            if info is None:
+                print(f"[LayerArchive] 레이어 인덱스 범위 초과: {layer_index} (총 {len(self._layers)}개)")
+                return None
+
+            return self._zip.read(info)
+
+
 def extract_print_parameters(zip_path: str) -> Dict[str, Any]:
     """
     편의 함수: ZIP 파일에서 프린트 파라미터 추출 (딕셔너리 반환)
@@ -304,6 +646,33 @@ def validate_zip_file(zip_path: str) -> ZipValidationResult:
     """
     ZIP 파일 유효성 검증
 
+    ZIP을 열어 파일 목록과 run.gcode를 읽은 뒤 validate_zip_contents()로 검증
+    (JobInfo는 이미 읽은 내용으로 validate_zip_contents()를 직접 호출)
+
+    Args:
+        zip_path: ZIP 파일 경로
+
+    Returns:
+        ZipValidationResult 객체
+    """
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as z:
+            namelist = z.namelist()
+            gcode_file = next((name for name in namelist if name.lower() == 'run.gcode'), None)
+            content = z.read(gcode_file).decode('utf-8', errors='ignore') if gcode_file else None
+            return validate_zip_contents(namelist, content)
+
+    except zipfile.BadZipFile:
+        return ZipValidationResult(False, "ZIP 파일이 손상되었습니다")
+    except Exception as e:
+        print(f"[Parser] ZIP 검증 오류: {e}")
+        return ZipValidationResult(False, "ZIP 파일을 읽을 수 없습니다")
+
+
+def validate_zip_contents(namelist: List[str], gcode_content: Optional[str]) -> ZipValidationResult:
+    """
+    ZIP 내용 유효성 검증 (이미 읽은 파일 목록 / run.gcode 내용 사용)
+
     검증 조건:
     1. run.gcode 파일 존재
     2. run.gcode 내용에 필수 머신 설정 일치
@@ -311,7 +680,8 @@ def validate_zip_file(zip_path: str) -> ZipValidationResult:
     4. 숫자.png 파일들이 연속 (중간에 빠지면 손상)
 
     Args:
-        zip_path: ZIP 파일 경로
+        namelist: ZIP 내 파일명 리스트
+        gcode_content: run.gcode 내용 (없으면 None)
 
     Returns:
         ZipValidationResult 객체
@@ -329,61 +699,43 @@ def validate_zip_file(zip_path: str) -> ZipValidationResult:
     #     ";machineZ:80",
     # ]
     #
-    # try:
-    #     with zipfile.ZipFile(zip_path, 'r') as z:
-    #         namelist = z.namelist()
-    #
-    #         # 1. run.gcode 파일 존재 확인
-    #         gcode_file = None
-    #         for name in namelist:
-    #             if name.lower() == 'run.gcode':
-    #                 gcode_file = name
-    #                 break
-    #
-    #         if not gcode_file:
-    #             return ZipValidationResult(False, "run.gcode 파일이 없습니다")
-    #
-    #         # 2. run.gcode 내용에 필수 머신 설정 확인
-    #         content = z.read(gcode_file).decode('utf-8', errors='ignore')
-    #
-    #         for setting in REQUIRED_MACHINE_SETTINGS:
-    #             if setting not in content:
-    #                 return ZipValidationResult(False, "지원하지 않는 프린터 파일입니다")
+    # # 1. run.gcode 파일 존재 확인
+    # if gcode_content is None:
+    #     return ZipValidationResult(False, "run.gcode 파일이 없습니다")
     #
-    #         # 3. preview_cropping.png, preview.png 존재 확인
-    #         # namelist_lower = [name.lower() for name in namelist]
-    #         # if 'preview_cropping.png' not in namelist_lower:
-    #         #     return ZipValidationResult(False, "미리보기 이미지가 없습니다")
-    #         # if 'preview.png' not in namelist_lower:
-    #         #     return ZipValidationResult(False, "미리보기 이미지가 없습니다")
+    # # 2. run.gcode 내용에 필수 머신 설정 확인
+    # for setting in REQUIRED_MACHINE_SETTINGS:
+    #     if setting not in gcode_content:
+    #         return ZipValidationResult(False, "지원하지 않는 프린터 파일입니다")
     #
-    #         # 4. 숫자.png 파일들 연속성 확인
-    #         layer_numbers = []
-    #         for name in namelist:
-    #             filename = os.path.basename(name).lower()
-    #             # 숫자.png 패턴 (예: 1.png, 2.png, 001.png)
-    #             match = re.match(r'^(\d+)\.png$', filename)
-    #             if match:
-    #                 layer_numbers.append(int(match.group(1)))
+    # # 3. preview_cropping.png, preview.png 존재 확인
+    # # namelist_lower = [name.lower() for name in namelist]
+    # # if 'preview_cropping.png' not in namelist_lower:
+    # #     return ZipValidationResult(False, "미리보기 이미지가 없습니다")
+    # # if 'preview.png' not in namelist_lower:
+    # #     return ZipValidationResult(False, "미리보기 이미지가 없습니다")
     #
-    #         if not layer_numbers:
-    #             return ZipValidationResult(False, "레이어 이미지가 손상되었습니다")
+    # # 4. 숫자.png 파일들 연속성 확인
+    # layer_numbers = []
+    # for name in namelist:
+    #     filename = os.path.basename(name).lower()
+    #     # 숫자.png 패턴 (예: 1.png, 2.png, 001.png)
+    #     match = re.match(r'^(\d+)\.png$', filename)
+    #     if match:
+    #         layer_numbers.append(int(match.group(1)))
     #
-    #         # 정렬 후 연속성 확인
-    #         layer_numbers.sort()
-    #         expected_start = layer_numbers[0]
-    #         for i, num in enumerate(layer_numbers):
-    #             if num != expected_start + i:
-    #                 return ZipValidationResult(False, "레이어 이미지가 손상되었습니다")
+    # if not layer_numbers:
+    #     return ZipValidationResult(False, "레이어 이미지가 손상되었습니다")
     #
-    #         # 모든 검증 통과
-    #         return ZipValidationResult(True, "")
+    # # 정렬 후 연속성 확인
+    # layer_numbers.sort()
+    # expected_start = layer_numbers[0]
+    # for i, num in enumerate(layer_numbers):
+    #     if num != expected_start + i:
+    #         return ZipValidationResult(False, "레이어 이미지가 손상되었습니다")
     #
-    # except zipfile.BadZipFile:
-    #     return ZipValidationResult(False, "ZIP 파일이 손상되었습니다")
-    # except Exception as e:
-    #     print(f"[Parser] ZIP 검증 오류: {e}")
-    #     return ZipValidationResult(False, "ZIP 파일을 읽을 수 없습니다")
+    # # 모든 검증 통과
+    # return ZipValidationResult(True, "")
 
 
 # 테스트용
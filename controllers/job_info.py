@@ -0,0 +1,182 @@
+"""
+VERICOM DLP 3D Printer - Job Info
+작업 ZIP을 한 번만 열어 파라미터 / 레이어 목록 / 미리보기 / 검증 결과를 함께 추출
+
+파일 선택 → 검증 → 미리보기 → 프린트 시작까지 같은 결과를 재사용
+(USB 메모리에서 같은 ZIP을 여러 번 열고 중앙 디렉터리를 다시 읽지 않도록)
+"""
+
+import os
+import zipfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, List, Tuple
+
+from .gcode_parser import GCodeParser, PrintParameters, ZipValidationResult, validate_zip_contents
+
+
+# 미리보기 이미지 우선순위 (소문자, ZIP 항목 이름은 대소문자 구분 없이 비교)
+PREVIEW_NAMES = ['preview_cropping.png', 'preview.png', 'thumbnail.png']
+
+
+@dataclass
+class JobInfo:
+    """작업 ZIP 정보 (1회 오픈 결과)"""
+    path: str
+    size: int = 0
+    mtime: float = 0.0
+    params: PrintParameters = field(default_factory=PrintParameters)
+    layer_names: List[str] = field(default_factory=list)  # 레이어 이미지 (숫자순 정렬)
+    preview_name: str = ""
+    preview: Optional[bytes] = None  # 미리보기 PNG 바이트
+    has_gcode: bool = False
+    validation: ZipValidationResult = field(default_factory=lambda: ZipValidationResult(True, ""))
+
+    @property
+    def is_valid(self) -> bool:
+        return self.validation.is_valid
+
+    @property
+    def layer_count(self) -> int:
+        return len(self.layer_names)
+
+    @property
+    def identity(self) -> Tuple[str, int, float]:
+        """파일 식별자 (경로, 크기, 수정 시각)"""
+        return (self.path, self.size, self.mtime)
+
+    @classmethod
+    def load(cls, zip_path: str) -> "JobInfo":
+        """
+        ZIP을 한 번 열어 모든 정보 추출
+
+        Args:
+            zip_path: ZIP 파일 경로
+
+        Returns:
+            JobInfo (ZIP 손상/읽기 실패 시 validation.is_valid = False)
+        """
+        info = cls(path=zip_path)
+        try:
+            stat = os.stat(zip_path)
+            info.size = stat.st_size
+            info.mtime = stat.st_mtime
+        except OSError as e:
+            print(f"[JobInfo] 파일 정보 조회 실패: {e}")
+            info.validation = ZipValidationResult(False, "ZIP 파일을 읽을 수 없습니다")
+            return info
+
+        try:
+            with zipfile.ZipFile(zip_path, 'r') as z:
+                namelist = z.namelist()
+
+                # 이름 목록 1회 순회로 gcode / 미리보기 찾기
+                gcode_name = None
+                preview_candidates = {}  # 소문자 이름 → 실제 항목 이름
+                fallback_preview = None
+                for name in namelist:
+                    lower = name.lower()
+                    if lower == 'run.gcode':
+                        gcode_name = name
+                    elif lower in PREVIEW_NAMES:
+                        preview_candidates.setdefault(lower, name)
+                    elif fallback_preview is None and 'preview' in lower and lower.endswith('.png'):
+                        fallback_preview = name
+
+                info.layer_names = GCodeParser.filter_layer_images(namelist)
+
+                # 파라미터 (run.gcode 값 우선, totalLayer는 PNG 개수 우선)
+                content = None
+                if gcode_name:
+                    content = z.read(gcode_name).decode('utf-8', errors='ignore')
+                    info.params = GCodeParser.parse_gcode_content(content)
+                    info.has_gcode = True
+                if info.layer_names:
+                    info.params.totalLayer = len(info.layer_names)
+
+                # 미리보기
+                for name in PREVIEW_NAMES:
+                    if name in preview_candidates:
+                        info.preview_name = preview_candidates[name]
+                        break
+                else:
+                    info.preview_name = fallback_preview or ""
+                if info.preview_name:
+                    info.preview = z.read(info.preview_name)
+
+                # 검증 (이미 읽은 목록 / run.gcode 재사용)
+                info.validation = validate_zip_contents(namelist, content)
+
+        except zipfile.BadZipFile:
+            print(f"[JobInfo] 잘못된 ZIP 파일: {zip_path}")
+            info.validation = ZipValidationResult(False, "ZIP 파일이 손상되었습니다")
+        except Exception as e:
+            print(f"[JobInfo] ZIP 읽기 오류: {e}")
+            info.validation = ZipValidationResult(False, "ZIP 파일을 읽을 수 없습니다")
+
+        print(f"[JobInfo] {os.path.basename(zip_path)}: 레이어 {info.layer_count}개, "
+              f"미리보기 {info.preview_name or '없음'}, 검증 {'OK' if info.is_valid else info.validation.error_message}")
+        return info
+
+
+class _JobInfoCache:
+    """최근 JobInfo 메모리 캐시 (경로 + 크기 + 수정 시각 일치 시 재사용)"""
+
+    def __init__(self, max_entries: int = 16):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, JobInfo]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, zip_path: str) -> JobInfo:
+        try:
+            stat = os.stat(zip_path)
+            identity = (zip_path, stat.st_size, stat.st_mtime)
+        except OSError:
+            identity = None
+
+        with self._lock:
+            cached = self._entries.get(zip_path)
+            if cached is not None and identity is not None and cached.identity == identity:
+                self._entries.move_to_end(zip_path)
+                return cached
+
+        info = JobInfo.load(zip_path)
+
+        with self._lock:
+            self._entries[zip_path] = info
+            self._entries.move_to_end(zip_path)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return info
+
+    def invalidate(self, zip_path: Optional[str] = None):
+        with self._lock:
+            if zip_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(zip_path, None)
+
+
+_cache = _JobInfoCache()
+
+
+def load_job_info(zip_path: str, use_cache: bool = True) -> JobInfo:
+    """
+    작업 정보 조회 (같은 파일이면 캐시된 결과 반환)
+
+    Args:
+        zip_path: ZIP 파일 경로
+        use_cache: False면 항상 ZIP을 다시 읽음
+
+    Returns:
+        JobInfo
+    """
+    if not use_cache:
+        return JobInfo.load(zip_path)
+    return _cache.get(zip_path)
+
+
+def invalidate_job_info(zip_path: Optional[str] = None):
+    """캐시 항목 제거 (파일 삭제 시 등, None이면 전체)"""
+    _cache.invalidate(zip_path)
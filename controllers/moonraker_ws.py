@@ -0,0 +1,289 @@
+"""
+VERICOM DLP 3D Printer - Moonraker WebSocket Client
+Moonraker JSON-RPC 웹소켓으로 toolhead/idle_timeout 상태 구독
+
+HTTP M400 블로킹 + 고정 대기 대신 Klipper가 idle을 보고하는 즉시
+모션 완료를 알 수 있도록 함 (websocket-client 패키지 필요, 없으면 비활성화)
+"""
+
+import json
+import threading
+import time
+from typing import Optional, Callable, Dict, Any, List
+
+# websocket-client (선택)
+try:
+    import websocket
+    WEBSOCKET_AVAILABLE = True
+except ImportError:
+    WEBSOCKET_AVAILABLE = False
+    print("[MoonrakerWS] websocket-client 없음 - HTTP M400 대기 사용")
+
+
+class MoonrakerWebSocket:
+    """
+    Moonraker 웹소켓 클라이언트
+
+    구독 객체:
+        toolhead.position   → 위치 콜백 (명령 위치, X/Y/Z/E)
+        idle_timeout.state  → "Printing" / "Ready" / "Idle"
+
+    Moonraker는 상태 알림을 약 250ms 단위로 묶어서 보내므로
+    wait_for_idle()은 그보다 긴 안정화 구간(settle_time) 동안
+    "Printing"이 아닌 상태가 유지되는지 확인한다.
+    """
+
+    SUBSCRIBE_OBJECTS = {
+        "toolhead": ["position"],
+        "idle_timeout": ["state"],
+    }
+
+    def __init__(self, url: str = "ws://localhost:7125/websocket",
+                 settle_time: float = 0.3):
+        """
+        Args:
+            url: Moonraker 웹소켓 주소
+            settle_time: idle 판정 안정화 구간 (초, 알림 묶음 250ms보다 길게)
+        """
+        self.url = url
+        self.settle_time = settle_time
+
+        # 위치 변경 콜백 (웹소켓 스레드에서 호출)
+        self.on_position: Optional[Callable[[List[float]], None]] = None
+
+        self._ws = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._connected = False
+
+        # JSON-RPC 요청 대기
+        self._next_id = 1
+        self._pending: Dict[int, Dict[str, Any]] = {}
+
+        # 구독 상태
+        self._cond = threading.Condition()
+        self._position: List[float] = [0.0, 0.0, 0.0, 0.0]
+        self._idle_state = "unknown"
+        self._last_change = 0.0  # 상태/위치 마지막 변경 (monotonic)
+
+    # ==================== 연결 관리 ====================
+
+    def connect(self, timeout: float = 5.0) -> bool:
+        """
+        연결 + 상태 구독
+
+        Returns:
+            성공 여부
+        """
+        if not WEBSOCKET_AVAILABLE:
+            return False
+
+        self.close()
+
+        try:
+            self._ws = websocket.create_connection(self.url, timeout=timeout)
+            # 수신 루프는 주기적으로 종료 여부 확인
+            self._ws.settimeout(1.0)
+        except Exception as e:
+            print(f"[MoonrakerWS] 연결 실패: {e}")
+            self._ws = None
+            return False
+
+        self._running = True
+        self._connected = True
+        self._thread = threading.Thread(target=self._receive_loop, daemon=True)
+        self._thread.start()
+
+        result = self.call("printer.objects.subscribe",
+                           {"objects": self.SUBSCRIBE_OBJECTS}, timeout=timeout)
+        if result is None:
+            print("[MoonrakerWS] 구독 실패")
+            self.close()
+            return False
+
+        self._apply_status(result.get("status", {}))
+        print(f"[MoonrakerWS] 연결됨: {self.url} (상태: {self._idle_state})")
+        return True
+
+    def close(self):
+        """연결 종료"""
+        self._running = False
+        self._connected = False
+
+        if self._ws is not None:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
+            self._ws = None
+
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+
+        with self._cond:
+            for pending in self._pending.values():
+                pending["event"].set()
+            self._pending.clear()
+            self._cond.notify_all()
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    @property
+    def position(self) -> List[float]:
+        with self._cond:
+            return list(self._position)
+
+    @property
+    def idle_state(self) -> str:
+        with self._cond:
+            return self._idle_state
+
+    # ==================== JSON-RPC ====================
+
+    def call(self, method: str, params: Optional[dict] = None,
+             timeout: float = 5.0) -> Optional[Any]:
+        """
+        JSON-RPC 요청 후 응답 대기
+
+        Returns:
+            result 값 (오류/타임아웃 시 None)
+        """
+        if not self._connected:
+            return None
+
+        event = threading.Event()
+        with self._cond:
+            request_id = self._next_id
+            self._next_id += 1
+            self._pending[request_id] = {"event": event, "result": None}
+
+        message = {"jsonrpc": "2.0", "method": method, "id": request_id}
+        if params is not None:
+            message["params"] = params
+
+        try:
+            self._ws.send(json.dumps(message))
+        except Exception as e:
+            print(f"[MoonrakerWS] 전송 오류: {e}")
+            with self._cond:
+                self._pending.pop(request_id, None)
+            return None
+
+        event.wait(timeout)
+        with self._cond:
+            pending = self._pending.pop(request_id, None)
+        return pending["result"] if pending else None
+
+    def _receive_loop(self):
+        """수신 스레드"""
+        while self._running:
+            try:
+                raw = self._ws.recv()
+            except websocket.WebSocketTimeoutException:
+                continue
+            except Exception as e:
+                if self._running:
+                    print(f"[MoonrakerWS] 연결 끊김: {e}")
+                break
+
+            if not raw:
+                continue
+
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                continue
+
+            self._handle_message(message)
+
+        self._connected = False
+        with self._cond:
+            for pending in self._pending.values():
+                pending["event"].set()
+            self._cond.notify_all()
+
+    def _handle_message(self, message: dict):
+        """응답 / 알림 처리"""
+        request_id = message.get("id")
+        if request_id is not None:
+            with self._cond:
+                pending = self._pending.get(request_id)
+                if pending is not None:
+                    if "error" in message:
+                        print(f"[MoonrakerWS] 요청 오류: {message['error']}")
+                    else:
+                        pending["result"] = message.get("result")
+                    pending["event"].set()
+            return
+
+        if message.get("method") == "notify_status_update":
+            params = message.get("params") or [{}]
+            self._apply_status(params[0])
+
+    def _apply_status(self, status: dict):
+        """구독 상태 반영"""
+        position = None
+
+        with self._cond:
+            changed = False
+
+            toolhead = status.get("toolhead", {})
+            if "position" in toolhead:
+                self._position = list(toolhead["position"])
+                position = list(self._position)
+                changed = True
+
+            idle_timeout = status.get("idle_timeout", {})
+            if "state" in idle_timeout:
+                self._idle_state = idle_timeout["state"]
+                changed = True
+
+            if changed:
+                self._last_change = time.monotonic()
+                self._cond.notify_all()
+
+        if position is not None and self.on_position:
+            self.on_position(position)
+
+    # ==================== 모션 완료 대기 ====================
+
+    def wait_for_idle(self, timeout: float = 300.0) -> bool:
+        """
+        모션 완료 대기 (idle_timeout.state가 "Printing"이 아닌 상태로 안정)
+
+        명령 전송 직후에는 "Printing" 알림이 아직 도착하지 않았을 수 있으므로
+        호출 시점과 마지막 상태 변경 이후 모두 settle_time이 지나야 완료로 판정
+
+        Args:
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            bool: 완료 시 True, 타임아웃/연결 끊김 시 False
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+
+        with self._cond:
+            while True:
+                if not self._connected:
+                    return False
+
+                now = time.monotonic()
+                quiet_since = max(start, self._last_change)
+
+                if self._idle_state != "Printing" and now - quiet_since >= self.settle_time:
+                    return True
+
+                remaining = deadline - now
+                if remaining <= 0:
+                    print(f"[MoonrakerWS] idle 대기 타임아웃 (상태: {self._idle_state})")
+                    return False
+
+                if self._idle_state == "Printing":
+                    wait_time = remaining
+                else:
+                    wait_time = min(remaining, self.settle_time - (now - quiet_since))
+                self._cond.wait(wait_time)
@@ -6,10 +6,17 @@ Moonraker API를 통한 Z축/X축 모터 제어
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
-from typing import Optional, Tuple
+from typing import Optional, Tuple, List
 from dataclasses import dataclass
 
+try:
+    from controllers.moonraker_ws import MoonrakerWebSocket, WEBSOCKET_AVAILABLE
+except ImportError:
+    from .moonraker_ws import MoonrakerWebSocket, WEBSOCKET_AVAILABLE
+
 
 @dataclass
 class MotorConfig:
@@ -23,6 +30,19 @@ class MotorConfig:
     z_min: float = 0.0          # Z축 최소 위치 (mm)
     z_max: float = 80.0         # Z축 최대 위치 (mm) - 실제 스펙
     drop_speed: int = 150       # Z축 하강 속도 (mm/min)
+    http_pool_size: int = 4     # Moonraker keep-alive 연결 수 (GUI + PrintWorker 동시 사용)
+    http_connect_retries: int = 2  # 연결 실패 시 재시도 횟수 (요청이 전송되지 않은 경우만)
+    use_websocket: bool = True  # 웹소켓 idle 알림으로 모션 완료 판정 (없으면 HTTP M400)
+    ws_settle_time: float = 0.3  # idle 판정 안정화 구간 (Moonraker 알림 묶음 250ms보다 길게)
+
+
+@dataclass
+class MotionStep:
+    """모션 프로그램의 단일 이동 (절대 좌표)"""
+    name: str                   # 단계 이름 (실패 보고용, 예: "Z축 리프트")
+    axis: str                   # 'Z' 또는 'X'
+    position: float             # 목표 위치 (mm)
+    speed: int                  # 이동 속도 (mm/min)
 
 
 class MotorController:
@@ -38,6 +58,12 @@ class MotorController:
         self.config = MotorConfig()
         self._is_connected = False
 
+        # HTTP 세션 (keep-alive, 명령마다 TCP 연결을 새로 열지 않음)
+        self._session = self._create_session()
+
+        # 웹소켓 상태 구독 (모션 완료 + 위치 알림)
+        self._ws: Optional[MoonrakerWebSocket] = None
+
         # 현재 위치 캐시
         self._z_position: float = 0.0
         self._x_position: float = 0.0
@@ -48,16 +74,80 @@ class MotorController:
 
     # ==================== 연결 관리 ====================
 
+    def _create_session(self) -> requests.Session:
+        """
+        Moonraker용 HTTP 세션 생성
+
+        재시도는 연결 단계 오류에만 적용 (G-code가 전송된 뒤의 읽기 오류는
+        재시도하면 이동이 두 번 실행될 수 있으므로 재시도하지 않음)
+        """
+        retry = Retry(
+            total=self.config.http_connect_retries,
+            connect=self.config.http_connect_retries,
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=0.1,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.config.http_pool_size,
+            max_retries=retry,
+        )
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self):
+        """HTTP 세션 / 웹소켓 닫기"""
+        self._stop_websocket()
+        self._session.close()
+        self._is_connected = False
+
+    def _start_websocket(self) -> bool:
+        """웹소켓 구독 시작 (이미 연결돼 있으면 유지)"""
+        if not (self.config.use_websocket and WEBSOCKET_AVAILABLE):
+            return False
+        if self._ws is not None and self._ws.is_connected:
+            return True
+
+        ws_url = self.moonraker_url.replace("https://", "wss://").replace("http://", "ws://")
+        self._ws = MoonrakerWebSocket(f"{ws_url}/websocket", settle_time=self.config.ws_settle_time)
+        self._ws.on_position = self._on_ws_position
+        if not self._ws.connect():
+            self._ws = None
+            return False
+        return True
+
+    def _stop_websocket(self):
+        if self._ws is not None:
+            self._ws.close()
+            self._ws = None
+
+    def _on_ws_position(self, position: List[float]):
+        """웹소켓 위치 알림 → 위치 캐시 (toolhead.position = 명령 위치)"""
+        if len(position) > 2:
+            self._x_position = position[0]
+            self._z_position = position[2]
+
+    @property
+    def websocket_connected(self) -> bool:
+        return self._ws is not None and self._ws.is_connected
+
     def connect(self) -> bool:
         """Moonraker 연결 확인"""
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.moonraker_url}/printer/info",
                 timeout=5
             )
             if response.status_code == 200:
                 self._is_connected = True
                 print("[Motor] Moonraker 연결됨")
+                self._start_websocket()
                 return True
         except requests.exceptions.RequestException as e:
             print(f"[Motor] 연결 실패: {e}")
@@ -97,7 +187,7 @@ class MotorController:
 
         try:
             url = f"{self.moonraker_url}/printer/gcode/script"
-            response = requests.post(
+            response = self._session.post(
                 url,
                 json={"script": gcode},
                 timeout=timeout
@@ -115,9 +205,20 @@ class MotorController:
             return False
 
     def wait_for_movement_complete(self, timeout: int = 300) -> bool:
-        """모든 모터 움직임 완료 대기 (M400)"""
+        """
+        모든 모터 움직임 완료 대기
+
+        웹소켓이 연결돼 있으면 Klipper idle 알림으로 판정,
+        아니면 HTTP M400 (재시도 + 고정 대기)
+        """
         print("[Motor] 모터 움직임 완료 대기 중...")
 
+        if self.websocket_connected:
+            if self._ws.wait_for_idle(timeout):
+                print("[Motor] 모터 움직임 완료 (idle 알림)")
+                return True
+            print("[Motor] idle 알림 대기 실패 - M400 사용")
+
         for attempt in range(3):
             print(f"[Motor] M400 시도 {attempt + 1}/3")
             success = self.send_gcode("M400", timeout=timeout)
@@ -335,6 +436,104 @@ class MotorController:
         """X축 홈(0mm)으로 이동 (G0 이동, G28 아님)"""
         return self.x_move_absolute(0, speed)
 
+    # ==================== 모션 프로그램 ====================
+
+    def run_motion_program(self, steps: List[MotionStep],
+                           timeout: int = 300) -> Tuple[bool, Optional[MotionStep]]:
+        """
+        여러 이동을 하나의 G-code 스크립트로 전송 (완료 대기 1회)
+
+        Moonraker의 gcode/script는 스크립트 끝의 M400까지 실행된 뒤 응답하므로
+        이동마다 HTTP 왕복 + M400 + 고정 대기를 반복하지 않아도 됨
+
+        Args:
+            steps: 순서대로 실행할 이동 목록
+            timeout: 전체 스크립트 타임아웃 (초)
+
+        Returns:
+            (성공 여부, 실패한 단계 또는 None)
+        """
+        if not steps:
+            return True, None
+
+        # 위치 제한
+        limits = {
+            'Z': (self.config.z_min, self.config.z_max),
+            'X': (self.config.x_min, self.config.x_max),
+        }
+        for step in steps:
+            low, high = limits[step.axis]
+            clamped = max(low, min(step.position, high))
+            if clamped != step.position:
+                print(f"[Motor] {step.name} 위치 제한: {step.position:.3f}mm → {clamped:.3f}mm")
+                step.position = clamped
+
+        lines = ["G90"]
+        for step in steps:
+            lines.append(f"G1 {step.axis}{step.position:.3f} F{step.speed}")
+        lines.append("M400")
+        gcode = "\n".join(lines)
+
+        # 시작 위치 스냅샷 (스크립트 실행 중에는 웹소켓 알림이 _z/_x_position을 갱신함)
+        start = (self._z_position, self._x_position)
+
+        print(f"[Motor] 모션 프로그램: {' → '.join(step.name for step in steps)}")
+        if self.send_gcode(gcode, timeout=timeout):
+            for step in steps:
+                self._set_cached_position(step.axis, step.position)
+            return True, None
+
+        failed = self._locate_failed_step(steps, start)
+        print(f"[Motor] ❌ 모션 프로그램 실패: {failed.name}")
+        return False, failed
+
+    def layer_motion_program(self, lift_z: float, lift_speed: int,
+                             blade_home: float, blade_speed: int,
+                             next_z: float, drop_speed: int) -> Tuple[bool, Optional[MotionStep]]:
+        """
+        노광 후 레이어 모션 (리프트 → 블레이드 복귀 → 다음 레이어 하강)
+
+        Returns:
+            (성공 여부, 실패한 단계 또는 None)
+        """
+        return self.run_motion_program([
+            MotionStep("Z축 리프트", 'Z', lift_z, lift_speed),
+            MotionStep("X축 복귀", 'X', blade_home, blade_speed),
+            MotionStep("Z축 하강", 'Z', next_z, drop_speed),
+        ])
+
+    def _set_cached_position(self, axis: str, position: float):
+        if axis == 'Z':
+            self._z_position = position
+        else:
+            self._x_position = position
+
+    def _locate_failed_step(self, steps: List[MotionStep], start: Tuple[float, float],
+                            tolerance: float = 0.01) -> MotionStep:
+        """
+        실패 후 실제 위치로 어느 단계에서 멈췄는지 추정
+
+        각 단계까지 완료됐을 때의 예상 위치와 현재 위치를 비교해
+        일치하는 마지막 지점의 다음 단계를 실패 단계로 판단
+
+        Args:
+            steps: 전송한 이동 목록
+            start: 스크립트 전송 직전 (Z, X) 위치
+            tolerance: 위치 일치 허용 오차 (mm)
+        """
+        z_start, x_start = start
+        z_now, x_now = self.get_position()
+
+        expected = {'Z': z_start, 'X': x_start}
+        completed = 0
+        for idx in range(len(steps) + 1):
+            if abs(expected['Z'] - z_now) <= tolerance and abs(expected['X'] - x_now) <= tolerance:
+                completed = idx
+            if idx < len(steps):
+                expected[steps[idx].axis] = steps[idx].position
+
+        return steps[min(completed, len(steps) - 1)]
+
     # ==================== 복합 동작 ====================
 
     def home_all(self) -> bool:
@@ -350,7 +549,7 @@ class MotorController:
         """
         print("[Motor] 비상 정지! (Klipper 셧다운)")
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.moonraker_url}/printer/emergency_stop",
                 timeout=5
             )
@@ -441,7 +640,7 @@ class MotorController:
             (z_position, x_position)
         """
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.moonraker_url}/printer/objects/query",
                 params={"toolhead": "position"},
                 timeout=5
@@ -459,7 +658,7 @@ class MotorController:
     def get_printer_state(self) -> str:
         """프린터 상태 조회 (ready, printing, paused, error 등)"""
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.moonraker_url}/printer/objects/query",
                 params={"print_stats": "state"},
                 timeout=5
@@ -28,11 +28,36 @@ class PrintSettings:
     blade_speed: int = 30       # Blade 속도 (10-100 mm/s)
 
 
+@dataclass
+class FileBrowserSettings:
+    """파일 목록 관련 설정"""
+    scan_depth: int = 4         # USB 하위 폴더 탐색 깊이 (0 = 최상위만)
+    sort_key: str = "name"      # 정렬 기준 (name / date / size)
+    sort_descending: bool = False
+
+
+@dataclass
+class LayerCacheSettings:
+    """MASK 적용 레이어 캐시 설정"""
+    enabled: bool = True        # 반복 출력 시 캐시된 프레임 사용
+    max_mb: int = 1024          # 캐시 최대 크기 (MB, 초과 시 LRU 삭제)
+
+
+@dataclass
+class StagingSettings:
+    """작업 파일 로컬 복사 설정"""
+    enabled: bool = True        # 프린트 시작 시 USB 작업 파일을 로컬로 복사
+    max_mb: int = 4096          # 복사본 최대 크기 (MB, 초과 시 오래된 복사본 삭제)
+
+
 @dataclass
 class AppSettings:
     """앱 전체 설정"""
     print_settings: PrintSettings = None
     mask_settings: MaskSettings = None
+    file_browser_settings: FileBrowserSettings = None
+    layer_cache_settings: LayerCacheSettings = None
+    staging_settings: StagingSettings = None
     language: str = "en"        # 언어 설정
     theme: str = "Light"        # 테마 설정
 
@@ -41,6 +66,12 @@ class AppSettings:
             self.print_settings = PrintSettings()
         if self.mask_settings is None:
             self.mask_settings = MaskSettings()
+        if self.file_browser_settings is None:
+            self.file_browser_settings = FileBrowserSettings()
+        if self.layer_cache_settings is None:
+            self.layer_cache_settings = LayerCacheSettings()
+        if self.staging_settings is None:
+            self.staging_settings = StagingSettings()
 
 
 class SettingsManager:
@@ -92,6 +123,28 @@ class SettingsManager:
                 file_path=mask_data.get('file_path', '')
             )
 
+            # FileBrowserSettings 로드
+            browser_data = data.get('file_browser_settings', {})
+            self._settings.file_browser_settings = FileBrowserSettings(
+                scan_depth=browser_data.get('scan_depth', 4),
+                sort_key=browser_data.get('sort_key', 'name'),
+                sort_descending=browser_data.get('sort_descending', False)
+            )
+
+            # LayerCacheSettings 로드
+            cache_data = data.get('layer_cache_settings', {})
+            self._settings.layer_cache_settings = LayerCacheSettings(
+                enabled=cache_data.get('enabled', True),
+                max_mb=cache_data.get('max_mb', 1024)
+            )
+
+            # StagingSettings 로드
+            staging_data = data.get('staging_settings', {})
+            self._settings.staging_settings = StagingSettings(
+                enabled=staging_data.get('enabled', True),
+                max_mb=staging_data.get('max_mb', 4096)
+            )
+
             # 기타 설정 로드
             self._settings.language = data.get('language', 'en')
             self._settings.theme = data.get('theme', 'Light')
@@ -111,6 +164,9 @@ class SettingsManager:
             data = {
                 'print_settings': asdict(self._settings.print_settings),
                 'mask_settings': asdict(self._settings.mask_settings),
+                'file_browser_settings': asdict(self._settings.file_browser_settings),
+                'layer_cache_settings': asdict(self._settings.layer_cache_settings),
+                'staging_settings': asdict(self._settings.staging_settings),
                 'language': self._settings.language,
                 'theme': self._settings.theme
             }
@@ -189,6 +245,69 @@ class SettingsManager:
         self._settings.mask_settings.file_path = path
         self.save()
 
+    # ==================== File Browser ====================
+
+    def get_scan_depth(self) -> int:
+        """USB 하위 폴더 탐색 깊이 반환"""
+        return self._settings.file_browser_settings.scan_depth
+
+    def set_scan_depth(self, depth: int):
+        """USB 하위 폴더 탐색 깊이 설정 (0-10, 다음 실행부터 적용)"""
+        self._settings.file_browser_settings.scan_depth = max(0, min(10, depth))
+        self.save()
+
+    def get_file_sort(self) -> tuple:
+        """파일 정렬 (기준, 내림차순 여부) 반환"""
+        browser = self._settings.file_browser_settings
+        return browser.sort_key, browser.sort_descending
+
+    def set_file_sort(self, sort_key: str, descending: bool):
+        """파일 정렬 설정"""
+        browser = self._settings.file_browser_settings
+        browser.sort_key = sort_key
+        browser.sort_descending = descending
+        self.save()
+
+    # ==================== Layer Cache ====================
+
+    def get_layer_cache_enabled(self) -> bool:
+        """레이어 캐시 사용 여부 반환"""
+        return self._settings.layer_cache_settings.enabled
+
+    def set_layer_cache_enabled(self, enabled: bool):
+        """레이어 캐시 사용 여부 설정"""
+        self._settings.layer_cache_settings.enabled = enabled
+        self.save()
+
+    def get_layer_cache_mb(self) -> int:
+        """레이어 캐시 최대 크기 반환 (MB)"""
+        return self._settings.layer_cache_settings.max_mb
+
+    def set_layer_cache_mb(self, max_mb: int):
+        """레이어 캐시 최대 크기 설정 (MB, 다음 실행부터 적용)"""
+        self._settings.layer_cache_settings.max_mb = max(64, max_mb)
+        self.save()
+
+    # ==================== Staging ====================
+
+    def get_staging_enabled(self) -> bool:
+        """작업 파일 로컬 복사 사용 여부 반환"""
+        return self._settings.staging_settings.enabled
+
+    def set_staging_enabled(self, enabled: bool):
+        """작업 파일 로컬 복사 사용 여부 설정"""
+        self._settings.staging_settings.enabled = enabled
+        self.save()
+
+    def get_staging_mb(self) -> int:
+        """복사본 최대 크기 반환 (MB)"""
+        return self._settings.staging_settings.max_mb
+
+    def set_staging_mb(self, max_mb: int):
+        """복사본 최대 크기 설정 (MB, 다음 실행부터 적용)"""
+        self._settings.staging_settings.max_mb = max(256, max_mb)
+        self.save()
+
     # ==================== Generic get/set ====================
 
     def get(self, key: str, default=None):
@@ -205,6 +324,16 @@ class SettingsManager:
             return self._settings.mask_settings.enabled
         elif key == "mask_file_path":
             return self._settings.mask_settings.file_path
+        elif key == "scan_depth":
+            return self._settings.file_browser_settings.scan_depth
+        elif key == "layer_cache_enabled":
+            return self._settings.layer_cache_settings.enabled
+        elif key == "layer_cache_mb":
+            return self._settings.layer_cache_settings.max_mb
+        elif key == "staging_enabled":
+            return self._settings.staging_settings.enabled
+        elif key == "staging_mb":
+            return self._settings.staging_settings.max_mb
         return default
 
     def set(self, key: str, value):
@@ -221,6 +350,16 @@ class SettingsManager:
             self._settings.mask_settings.enabled = value
         elif key == "mask_file_path":
             self._settings.mask_settings.file_path = value
+        elif key == "scan_depth":
+            self._settings.file_browser_settings.scan_depth = value
+        elif key == "layer_cache_enabled":
+            self._settings.layer_cache_settings.enabled = value
+        elif key == "layer_cache_mb":
+            self._settings.layer_cache_settings.max_mb = value
+        elif key == "staging_enabled":
+            self._settings.staging_settings.enabled = value
+        elif key == "staging_mb":
+            self._settings.staging_settings.max_mb = value
         self.save()
 
 
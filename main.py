@@ -74,12 +74,14 @@ from pages.theme_page import ThemePage
 # 하드웨어 컨트롤러
 from controllers.motor_controller import MotorController
 from controllers.dlp_controller import DLPController
-from controllers.gcode_parser import extract_print_parameters, validate_zip_file
+from controllers.job_info import load_job_info, invalidate_job_info
 from controllers.settings_manager import get_settings
 # theme_manager는 이미 상단에서 임포트됨
 
 # 워커
 from workers.print_worker import PrintWorker, PrintStatus
+from workers.layer_cache_warmer import LayerCacheWarmer
+from workers.job_analysis_worker import JobAnalysisWorker
 
 # 프로젝터 윈도우
 from windows.projector_window import ProjectorWindow
@@ -87,6 +89,12 @@ from windows.projector_window import ProjectorWindow
 # 키오스크 관리자
 from utils.kiosk_manager import get_kiosk_manager
 
+# 작업 파일 메타데이터 / 썸네일 캐시
+from utils.metadata_cache import get_metadata_cache
+
+# USB 감시 (inotify, 없으면 폴링)
+from utils.usb_monitor import USBMonitor
+
 # 화면 설정
 SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 600
@@ -154,6 +162,12 @@ class MainWindow(QMainWindow):
         # 프린트 워커
         self.print_worker = None
 
+        # 레이어 캐시 워머 (미리보기 화면에 있는 동안 MASK 적용 프레임 미리 준비)
+        self.cache_warmer = None
+
+        # 작업 분석 워커 (미리보기 화면에서 레이어별 면적 / 레진 사용량 계산)
+        self.analysis_worker = None
+
         # 모터 워커 (비동기 모터 제어용)
         self.motor_thread = None
         self.motor_worker = None
@@ -209,6 +223,11 @@ class MainWindow(QMainWindow):
         self.setting_page = SettingPage()
         self.theme_page = ThemePage()
 
+        # USB 감시 (앱 전체에서 하나, 파일 목록은 증분 갱신)
+        self.usb_monitor = USBMonitor(scan_depth=get_settings().get_scan_depth(), parent=self)
+        self.print_page.set_usb_monitor(self.usb_monitor)
+        self.usb_monitor.start()
+
         # 스택에 추가
         self.stack.addWidget(self.main_page)         # 0
         self.stack.addWidget(self.tool_page)         # 1
@@ -313,7 +332,7 @@ class MainWindow(QMainWindow):
         self.service_page.go_back.connect(lambda: self._go_to_page(self.PAGE_SYSTEM))
         
         # 파일 미리보기 페이지
-        self.file_preview_page.go_back.connect(lambda: self._go_to_page(self.PAGE_PRINT))
+        self.file_preview_page.go_back.connect(self._on_file_preview_back)
         self.file_preview_page.start_print.connect(self._on_start_print)
         self.file_preview_page.file_deleted.connect(self._on_file_deleted)
         
@@ -411,8 +430,8 @@ class MainWindow(QMainWindow):
         """파일 선택됨 -> ZIP 검증 후 File Preview로 이동"""
         print(f"[Print] 파일 선택: {file_path}")
 
-        # ZIP 파일 검증
-        validation = validate_zip_file(file_path)
+        # ZIP 파일 검증 (한 번 읽은 JobInfo를 미리보기/프린트 시작에서 재사용)
+        validation = load_job_info(file_path).validation
         if not validation.is_valid:
             print(f"[Print] ZIP 검증 실패: {validation.error_message}")
             # 오류 다이얼로그 표시 (print_page에서)
@@ -423,7 +442,102 @@ class MainWindow(QMainWindow):
         # 검증 통과 시 File Preview로 이동
         self.file_preview_page.set_file(file_path)
         self._go_to_page(self.PAGE_FILE_PREVIEW)
+
+        # 미리보기를 보는 동안 레이어 분석 (끝나면 레이어 캐시 채우기 - 같은 ZIP 동시 디코딩 방지)
+        self._start_job_analysis(file_path)
+    
+    def _on_file_preview_back(self):
+        """File Preview → 파일 목록"""
+        self._stop_job_analysis()
+        self._stop_cache_warmer()
+        self._go_to_page(self.PAGE_PRINT)
+
+    def _start_job_analysis(self, file_path: str):
+        """작업 분석 시작 (이미 분석한 파일이면 바로 캐시 워머, 프린트 중이면 생략)"""
+        self._stop_job_analysis()
+        if self.print_worker is not None and self.print_worker.isRunning():
+            return
+        if get_metadata_cache().get_analysis(file_path) is not None:
+            self._start_cache_warmer(file_path)
+            return
+
+        job_info = load_job_info(file_path)
+        if not job_info.is_valid or job_info.layer_count == 0:
+            return
+
+        self.analysis_worker = JobAnalysisWorker(
+            file_path,
+            job_info.params,
+            layer_names=job_info.layer_names,
+            parent=self
+        )
+        self.analysis_worker.progress.connect(self.file_preview_page.set_analysis_progress)
+        self.analysis_worker.analysis_ready.connect(self.file_preview_page.set_analysis)
+        self.analysis_worker.finished.connect(self._on_job_analysis_finished)
+        self.file_preview_page.set_analysis_progress(0, job_info.layer_count)
+        self.analysis_worker.start(QThread.LowPriority)
+
+    def _on_job_analysis_finished(self):
+        """작업 분석 종료 → 레이어 캐시 채우기 (정지/다른 파일로 바뀐 분석은 무시)"""
+        worker = self.sender()
+        if worker is None or worker is not self.analysis_worker:
+            return
+        self.analysis_worker = None
+        worker.deleteLater()
+        self._start_cache_warmer(worker.zip_path)
+
+    def _stop_job_analysis(self):
+        """작업 분석 정지 (프로세스 풀 작업 취소)"""
+        if self.analysis_worker is not None:
+            self.analysis_worker.stop()
+            self.analysis_worker = None
+    
+    def _start_cache_warmer(self, file_path: str):
+        """레이어 캐시 워머 시작 (설정에서 끈 경우 / 프린트한 적 없는 작업은 생략)"""
+        self._stop_cache_warmer()
+        if not get_settings().get_layer_cache_enabled():
+            return
+
+        job_info = load_job_info(file_path)
+        if not job_info.is_valid or job_info.layer_count == 0:
+            return
+
+        use_mask = self.setting_page.get_mask_enabled()
+        mask_path = self.setting_page.get_mask_path() if use_mask else ""
+        params = job_info.params
+        self.cache_warmer = LayerCacheWarmer(
+            file_path,
+            (params.resolutionX, params.resolutionY),
+            mask_path=mask_path,
+            layer_names=job_info.layer_names,
+            resume_only=True,  # 미리보기만 할 때는 채우지 않음 (시작한 작업의 남은 레이어만)
+            parent=self
+        )
+        self.cache_warmer.start(QThread.LowestPriority)
+    
+    def _stop_cache_warmer(self):
+        """레이어 캐시 워머 정지"""
+        if self.cache_warmer is not None:
+            self.cache_warmer.stop()
+            self.cache_warmer = None
     
+    def _cleanup_print_worker(self):
+        """이전 PrintWorker 정리 (프로젝터 시그널 연결 해제 후 삭제)"""
+        worker = self.print_worker
+        if worker is None:
+            return
+        self.print_worker = None
+
+        if worker.isRunning():
+            worker.stop()
+            worker.wait(3000)
+        if self.projector_window:
+            try:
+                self.projector_window.frame_presented.disconnect(worker.on_frame_presented)
+            except (RuntimeError, TypeError):
+                pass
+        worker.deleteLater()
+
     def _on_start_print(self, file_path: str, params: dict):
         """프린트 시작"""
         print(f"[Print] 프린트 시작: {file_path}")
@@ -446,6 +560,14 @@ class MainWindow(QMainWindow):
         use_mask = self.setting_page.get_mask_enabled()
         mask_path = self.setting_page.get_mask_path()
 
+        # 캐시 워머 / 작업 분석 정지 (프린트 중에는 PrintWorker가 남은 레이어를 채움)
+        self._stop_cache_warmer()
+        self._stop_job_analysis()
+
+        # 미리보기에서 읽은 레이어 목록 재사용 (ZIP 재분류 생략)
+        job_info = self.file_preview_page.get_job_info()
+        layer_names = job_info.layer_names if job_info and job_info.path == file_path else None
+
         # 추가 파라미터 (run.gcode에서 추출된 값)
         estimated_time = int(params.get('estimatedPrintTime', 0))  # 초 단위
         layer_height = float(params.get('layerHeight', 0.0))
@@ -464,7 +586,9 @@ class MainWindow(QMainWindow):
             layer_height=layer_height,
             bottom_exposure=bottom_exposure,
             normal_exposure=normal_exposure,
-            bottom_layer_count=bottom_layer_count
+            bottom_layer_count=bottom_layer_count,
+            params=params,
+            leveling_cycles=leveling_cycles
         )
         self._go_to_page(self.PAGE_PRINT_PROGRESS)
 
@@ -477,7 +601,8 @@ class MainWindow(QMainWindow):
         else:
             print("[Projector] 두 번째 모니터 없음, 프로젝터 윈도우 생략")
 
-        # PrintWorker 생성 및 시작
+        # 이전 작업의 워커 정리 후 PrintWorker 생성 및 시작
+        self._cleanup_print_worker()
         self.print_worker = PrintWorker(
             motor=self.motor,
             dlp=self.dlp,
@@ -496,8 +621,13 @@ class MainWindow(QMainWindow):
             self.print_worker.show_image.connect(self.projector_window.show_image)
             self.print_worker.clear_image.connect(self.projector_window.clear_screen)
 
-        # PrintProgressPage에 레이어 이미지 업데이트 연결
+            # 프레임 표시 확인 (실제로 화면에 떠 있을 때만 LED ON 전 대기)
+            self.projector_window.frame_presented.connect(self.print_worker.on_frame_presented)
+            self.print_worker.set_frame_ack(self.projector_window.isVisible())
+
+        # PrintProgressPage에 레이어 이미지 / 단계별 시간 업데이트 연결
         self.print_worker.show_image.connect(self.print_progress_page.update_layer_image)
+        self.print_worker.profile_updated.connect(self.print_progress_page.update_profile)
 
         # 프린트 시작
         self.print_worker.start_print(
@@ -507,7 +637,10 @@ class MainWindow(QMainWindow):
             led_power=led_power,
             leveling_cycles=leveling_cycles,
             use_mask=use_mask,  # MASK 적용 여부 (Setting 페이지 설정)
-            mask_path=mask_path  # MASK 파일 경로
+            mask_path=mask_path,  # MASK 파일 경로
+            layer_names=layer_names,
+            use_layer_cache=get_settings().get_layer_cache_enabled(),
+            stage_local=get_settings().get_staging_enabled()  # USB 작업 파일 로컬 복사 후 읽기
         )
         print(f"  - MASK 적용: {use_mask}, 경로: {mask_path}")
 
@@ -571,6 +704,10 @@ class MainWindow(QMainWindow):
     def _on_file_deleted(self, file_path: str):
         """파일 삭제됨"""
         print(f"[Print] 파일 삭제됨: {file_path}")
+        self._stop_job_analysis()
+        self._stop_cache_warmer()
+        invalidate_job_info(file_path)
+        get_metadata_cache().remove(file_path)
     
     def _start_exposure(self, pattern: str, time: float, image_path: str = ""):
         """노출 테스트 시작 (MASK 적용)"""
@@ -1060,6 +1197,10 @@ class MainWindow(QMainWindow):
             self.print_worker.stop()
             self.print_worker.wait(3000)  # 최대 3초 대기
 
+        # 레이어 캐시 워머 / 작업 분석 정지
+        self._stop_cache_warmer()
+        self._stop_job_analysis()
+
         # 프로젝터 윈도우 닫기
         if self.projector_window:
             self.projector_window.close()
@@ -1069,6 +1210,15 @@ class MainWindow(QMainWindow):
             self.dlp.led_off()
             self.dlp.projector_off()
 
+        # Moonraker HTTP 세션 닫기
+        self.motor.close()
+
+        # USB 감시 중지
+        self.usb_monitor.stop()
+
+        # 썸네일 로드 작업 정리
+        self.print_page.shutdown()
+
         event.accept()
 
 
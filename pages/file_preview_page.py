@@ -4,7 +4,6 @@ VERICOM DLP 3D Printer GUI - File Preview Page
 """
 
 import os
-import zipfile
 import json
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
@@ -18,7 +17,8 @@ from components.numeric_keypad import NumericKeypad
 from styles.colors import Colors
 from styles.fonts import Fonts
 from styles.icons import Icons
-from controllers.gcode_parser import extract_print_parameters
+from controllers.job_info import JobInfo, load_job_info
+from utils.metadata_cache import get_metadata_cache
 
 
 class InfoRow(QFrame):
@@ -310,6 +310,7 @@ class FilePreviewPage(BasePage):
 
         self._file_path = ""
         self._print_params = {}
+        self._job_info: JobInfo = None
 
         # 사용자 설정값 (기본값)
         self._blade_speed = 30   # mm/s (실제값 = 표시값 × 50)
@@ -379,6 +380,7 @@ class FilePreviewPage(BasePage):
             (Icons.RULER, "layerHeight"),             # 레이어 높이
             (Icons.EXPOSURE_BOTTOM, "bottomLayerExposureTime"),  # 바닥 노출
             (Icons.EXPOSURE_NORMAL, "normalExposureTime"),       # 일반 노출
+            (Icons.BAR_CHART, "analysis"),            # 레진 사용량 / 최대 단면 (백그라운드 분석)
         ]
 
         for icon_svg, key in info_items:
@@ -501,31 +503,36 @@ class FilePreviewPage(BasePage):
             self._clear_info()
     
     def _load_zip_info(self, file_path: str):
-        """ZIP 파일에서 정보 로드 (검증은 main.py에서 완료됨)"""
+        """ZIP 파일에서 정보 로드 (main.py에서 검증할 때 읽은 JobInfo 재사용)"""
         try:
-            with zipfile.ZipFile(file_path, 'r') as z:
-                # 썸네일 로드
-                preview_names = ['preview_cropping.png', 'preview.png', 'thumbnail.png']
-                thumbnail_loaded = False
-
-                for name in preview_names:
-                    if name in z.namelist():
-                        data = z.read(name)
-                        pixmap = QPixmap()
-                        pixmap.loadFromData(data)
-                        scaled = pixmap.scaled(260, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                        self.lbl_thumbnail.setPixmap(scaled)
-                        thumbnail_loaded = True
-                        break
-
-                if not thumbnail_loaded:
-                    self.lbl_thumbnail.setPixmap(Icons.get_pixmap(Icons.FILE, 64, Colors.TEXT_DISABLED))
-
-            # gcode_parser를 사용하여 전체 파라미터 추출 (totalLayer 포함)
-            self._print_params = extract_print_parameters(file_path)
+            self._job_info = load_job_info(file_path)
+
+            # 썸네일 로드 (캐시된 260px 썸네일 우선, 없으면 미리보기 원본 축소)
+            thumbnail_loaded = False
+            pixmap = QPixmap()
+            cache = get_metadata_cache()
+            entry = cache.get(file_path) or cache.put(file_path, self._job_info)
+            thumb_path = cache.thumbnail_path(entry, 260) if entry else ""
+            if thumb_path:
+                pixmap.load(thumb_path)
+            if pixmap.isNull() and self._job_info.preview:
+                pixmap.loadFromData(self._job_info.preview)
+            if not pixmap.isNull():
+                scaled = pixmap.scaled(260, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                self.lbl_thumbnail.setPixmap(scaled)
+                thumbnail_loaded = True
+
+            if not thumbnail_loaded:
+                self.lbl_thumbnail.setPixmap(Icons.get_pixmap(Icons.FILE, 64, Colors.TEXT_DISABLED))
+
+            # 전체 파라미터 (totalLayer 포함)
+            self._print_params = self._job_info.params.to_dict()
             print(f"[FilePreview] 파라미터 추출 완료: totalLayer={self._print_params.get('totalLayer', 0)}")
             self._update_info_display()
 
+            # 레이어 분석 결과 (없으면 main.py에서 분석 시작 → set_analysis)
+            self._show_analysis(cache.get_analysis(file_path))
+
         except Exception as e:
             print(f"ZIP 파일 로드 오류: {e}")
             self._clear_info()
@@ -588,9 +595,32 @@ class FilePreviewPage(BasePage):
         self.info_rows['bottomLayerExposureTime'].set_value(f"{p.get('bottomLayerExposureTime', 0)} sec")
         self.info_rows['normalExposureTime'].set_value(f"{p.get('normalExposureTime', 0)} sec")
     
+    def set_analysis_progress(self, done: int, total: int):
+        """레이어 분석 진행률 (JobAnalysisWorker.progress)"""
+        percent = done * 100 // total if total > 0 else 0
+        self.info_rows['analysis'].set_value(f"Analyzing... {percent}%")
+
+    def set_analysis(self, file_path: str, summary: dict):
+        """레이어 분석 완료 (JobAnalysisWorker.analysis_ready)"""
+        if file_path == self._file_path:
+            self._show_analysis(summary)
+
+    def _show_analysis(self, summary: dict):
+        """레진 사용량 / 최대 단면 표시"""
+        if not summary:
+            self.info_rows['analysis'].set_value("-")
+            return
+
+        largest = summary.get('largest_layers') or [0]
+        self.info_rows['analysis'].set_value(
+            f"{summary.get('volume_ml', 0):.1f} ml, "
+            f"max {summary.get('max_area_mm2', 0):.0f} mm² (L{largest[0] + 1})"
+        )
+
     def _clear_info(self):
         """정보 초기화"""
         self._print_params = {}
+        self._job_info = None
         for row in self.info_rows.values():
             row.set_value("-")
     
@@ -629,6 +659,10 @@ class FilePreviewPage(BasePage):
         """현재 파일 경로 반환"""
         return self._file_path
     
+    def get_job_info(self) -> JobInfo:
+        """현재 파일의 JobInfo 반환 (ZIP이 아니면 None)"""
+        return self._job_info
+
     def get_print_params(self) -> dict:
         """프린트 파라미터 반환"""
         return {
@@ -3,13 +3,12 @@ VERICOM DLP 3D Printer GUI - Print Page (File Selection)
 """
 
 import os
-import zipfile
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QPushButton, QLabel, QFrame
 )
-from PySide6.QtCore import Signal, Qt, QTimer, QSize
-from PySide6.QtGui import QPixmap, QIcon
+from PySide6.QtCore import Signal, Qt, QSize
+from PySide6.QtGui import QPixmap, QIcon, QImage
 
 from pages.base_page import BasePage
 from components.icon_button import IconButton
@@ -18,8 +17,12 @@ from styles.fonts import Fonts
 from styles.icons import Icons
 from styles.stylesheets import (
     BUTTON_FILE_ITEM_STYLE, BUTTON_FILE_ITEM_SELECTED_STYLE,
-    get_button_nav_style
+    get_button_nav_style, get_distance_button_style, get_distance_button_active_style
 )
+from controllers.settings_manager import get_settings
+from utils.metadata_cache import get_metadata_cache
+from utils.usb_index import SORT_NAME, SORT_DATE, SORT_SIZE
+from utils.thumbnail_loader import ThumbnailLoader
 
 
 class FileItem(QFrame):
@@ -33,6 +36,8 @@ class FileItem(QFrame):
         self._filename = ""
         self._filepath = ""
         self._is_selected = False
+        self._file_identity = None  # 파일의 (크기, 수정 시각)
+        self._thumbnail_identity = None  # 표시 중인 썸네일을 만든 파일의 (크기, 수정 시각)
         
         self.setCursor(Qt.PointingHandCursor)
         self.setFixedSize(200, 160)
@@ -103,7 +108,7 @@ class FileItem(QFrame):
             """)
     
     def _update_content(self):
-        """내용 업데이트"""
+        """내용 업데이트 (썸네일은 로더 결과가 올 때까지 기본 아이콘)"""
         if self._filename:
             # 파일명 표시 (긴 경우 축약)
             display_name = self._filename
@@ -111,51 +116,59 @@ class FileItem(QFrame):
                 display_name = display_name[:15] + "..."
             self.lbl_filename.setText(display_name)
             
-            # 썸네일 로드 시도
-            thumbnail = self._load_thumbnail()
-            if thumbnail:
-                self.lbl_thumbnail.setPixmap(thumbnail)
-            else:
-                # 기본 아이콘
-                self.lbl_thumbnail.setPixmap(
-                    Icons.get_pixmap(Icons.FILE_TEXT, 48, Colors.NAVY)
-                )
+            # 기본 아이콘 (썸네일 로드 전 / 썸네일 없음)
+            self.lbl_thumbnail.setPixmap(
+                Icons.get_pixmap(Icons.FILE_TEXT, 48, Colors.NAVY)
+            )
         else:
             self.lbl_filename.setText("")
             self.lbl_thumbnail.setPixmap(
                 Icons.get_pixmap(Icons.FILE, 48, Colors.TEXT_DISABLED)
             )
     
-    def _load_thumbnail(self) -> QPixmap:
-        """ZIP 파일에서 썸네일 로드"""
-        if not self._filepath:
-            return None
-        
-        ext = os.path.splitext(self._filepath)[1].lower()
-        if ext != '.zip':
-            return None
-        
-        try:
-            with zipfile.ZipFile(self._filepath, 'r') as z:
-                # 미리보기 이미지 찾기
-                preview_names = ['preview_cropping.png', 'preview.png', 'thumbnail.png']
-                for name in preview_names:
-                    if name in z.namelist():
-                        data = z.read(name)
-                        pixmap = QPixmap()
-                        pixmap.loadFromData(data)
-                        # 썸네일 크기에 맞게 스케일
-                        return pixmap.scaled(96, 96, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        except:
-            pass
-        
-        return None
-    
-    def set_file(self, filepath: str):
-        """파일 설정"""
+    def set_file(self, filepath: str) -> bool:
+        """
+        파일 설정
+
+        Returns:
+            썸네일을 새로 로드해야 하면 True
+            (같은 파일이 바뀌지 않았으면 stat 1회 후 False)
+        """
+        self._file_identity = None
+        if filepath:
+            try:
+                stat = os.stat(filepath)
+                self._file_identity = (stat.st_size, stat.st_mtime)
+            except OSError:
+                pass
+
+        if (filepath and filepath == self._filepath
+                and self._thumbnail_identity is not None
+                and self._thumbnail_identity == self._file_identity):
+            return False
+
         self._filepath = filepath
         self._filename = os.path.basename(filepath) if filepath else ""
+        self._thumbnail_identity = None
         self._update_content()
+        return bool(filepath)
+    
+    def set_thumbnail(self, image: QImage, identity):
+        """
+        로드된 썸네일 표시 (GUI 스레드)
+
+        Args:
+            image: 썸네일 QImage (null이면 기본 아이콘 유지)
+            identity: 썸네일을 만든 파일의 (크기, 수정 시각)
+        """
+        self._thumbnail_identity = identity
+        if not image.isNull():
+            self.lbl_thumbnail.setPixmap(QPixmap.fromImage(image))
+    
+    @property
+    def file_identity(self):
+        """파일의 (크기, 수정 시각) - set_file 시점"""
+        return self._file_identity
     
     def set_selected(self, selected: bool):
         """선택 상태 설정"""
@@ -190,6 +203,9 @@ class PrintPage(BasePage):
     
     # 시그널
     file_selected = Signal(str)  # 파일 선택됨 (파일 경로)
+
+    # 정렬 버튼 (기준, 표시 이름)
+    SORT_OPTIONS = [(SORT_NAME, "Name"), (SORT_DATE, "Date"), (SORT_SIZE, "Size")]
     
     def __init__(self, parent=None):
         super().__init__("Print", show_back=True, parent=parent)
@@ -198,9 +214,15 @@ class PrintPage(BasePage):
         self._current_page = 0      # 현재 페이지
         self._files_per_page = 6    # 페이지당 파일 수
         self._selected_index = None # 선택된 파일 인덱스
+        self._usb_monitor = None    # 공유 USB 감시 (main.py에서 연결)
+        self._grid_dirty = False    # 숨김 상태에서 목록이 바뀌면 표시할 때 갱신
+        self._sort_key, self._sort_descending = get_settings().get_file_sort()
+
+        # 썸네일 비동기 로드 (현재 페이지 우선, 다음 페이지 프리페치)
+        self._thumb_loader = ThumbnailLoader(size=96, parent=self)
+        self._thumb_loader.thumbnail_ready.connect(self._on_thumbnail_ready)
         
         self._setup_content()
-        self._setup_polling()
     
     def _setup_content(self):
         """콘텐츠 구성"""
@@ -210,6 +232,21 @@ class PrintPage(BasePage):
         
         main_layout = QHBoxLayout()
         main_layout.setSpacing(16)
+
+        # 정렬 버튼 (같은 버튼을 다시 누르면 오름차순/내림차순 전환)
+        sort_layout = QHBoxLayout()
+        sort_layout.setSpacing(8)
+        sort_layout.addStretch()
+
+        self._sort_buttons = {}
+        for key, label in self.SORT_OPTIONS:
+            btn = QPushButton(label)
+            btn.setFixedSize(96, 40)
+            btn.setCursor(Qt.PointingHandCursor)
+            btn.clicked.connect(lambda checked, k=key: self._on_sort_clicked(k))
+            self._sort_buttons[key] = btn
+            sort_layout.addWidget(btn)
+        self._update_sort_buttons()
         
         # 파일 그리드 (3×2)
         file_grid = QGridLayout()
@@ -280,7 +317,12 @@ class PrintPage(BasePage):
         nav_layout.addWidget(self.btn_open)
         nav_layout.addWidget(self.btn_home)
         
-        main_layout.addLayout(file_grid, 1)
+        grid_layout = QVBoxLayout()
+        grid_layout.setSpacing(12)
+        grid_layout.addLayout(sort_layout)
+        grid_layout.addLayout(file_grid)
+
+        main_layout.addLayout(grid_layout, 1)
         main_layout.addLayout(nav_layout)
         
         wrapper_layout.addLayout(main_layout)
@@ -288,78 +330,131 @@ class PrintPage(BasePage):
         
         self.content_layout.addLayout(wrapper_layout)
     
-    def _setup_polling(self):
-        """USB 폴링 타이머 설정"""
-        self._poll_timer = QTimer(self)
-        self._poll_timer.timeout.connect(self._scan_files)
-        self._poll_timer.setInterval(2000)  # 2초마다
+    def set_usb_monitor(self, monitor):
+        """USB 감시 연결 (파일 추가/제거를 증분으로 반영)"""
+        self._usb_monitor = monitor
+        monitor.files_added.connect(self._on_files_added)
+        monitor.files_removed.connect(self._on_files_removed)
+
+        self._selected_index = None
+        self._reload_file_list()
     
-    def start_polling(self):
-        """폴링 시작"""
-        self._scan_files()
-        self._poll_timer.start()
+    def _reload_file_list(self):
+        """
+        감시 인덱스에서 정렬된 목록 다시 구성
+
+        크기/수정 시각은 인덱스에 기록된 값을 쓰므로 파일을 다시 stat 하지 않음
+        """
+        selected = self.get_selected_file()
+        if self._usb_monitor is not None:
+            self._file_paths = self._usb_monitor.get_sorted_files(self._sort_key, self._sort_descending)
+        self._restore_selection(selected)
+
+        # 현재 페이지가 목록 범위를 벗어나면 마지막 페이지로
+        total_pages = max(1, (len(self._file_paths) + self._files_per_page - 1) // self._files_per_page)
+        self._current_page = min(self._current_page, total_pages - 1)
+        self._refresh_grid()
     
-    def stop_polling(self):
-        """폴링 중지"""
-        self._poll_timer.stop()
+    def _on_files_added(self, paths: list):
+        """파일 추가 (덮어쓴 파일 포함 - 날짜/크기 정렬 위치가 바뀔 수 있음)"""
+        self._reload_file_list()
     
-    def _scan_files(self):
-        """USB에서 파일 스캔"""
-        self._file_paths = []
-        
-        # /media 디렉토리에서 마운트된 USB 찾기 (3단계 스캔)
-        media_path = "/media"
-        if os.path.exists(media_path):
-            try:
-                for user in os.listdir(media_path):
-                    user_path = os.path.join(media_path, user)
-                    if os.path.isdir(user_path):
-                        try:
-                            for device in os.listdir(user_path):
-                                device_path = os.path.join(user_path, device)
-                                if os.path.isdir(device_path):
-                                    self._scan_directory(device_path)
-                        except PermissionError:
-                            continue
-            except PermissionError:
-                pass
-        
-        self._update_file_grid()
+    def _on_files_removed(self, paths: list):
+        """파일 제거"""
+        for path in paths:
+            self._thumb_loader.invalidate(path)
+        self._reload_file_list()
+    
+    def _on_sort_clicked(self, sort_key: str):
+        """정렬 기준 선택 (현재 기준이면 순서 반전)"""
+        if sort_key == self._sort_key:
+            self._sort_descending = not self._sort_descending
+        else:
+            self._sort_key = sort_key
+            self._sort_descending = sort_key != SORT_NAME  # 날짜/크기는 큰 값(최신) 먼저
+        get_settings().set_file_sort(self._sort_key, self._sort_descending)
+        self._update_sort_buttons()
+
+        self._current_page = 0
+        self._reload_file_list()
+    
+    def _update_sort_buttons(self):
+        """정렬 버튼 스타일 / 방향 표시"""
+        for key, label in self.SORT_OPTIONS:
+            btn = self._sort_buttons[key]
+            if key == self._sort_key:
+                btn.setText(f"{label} {'▼' if self._sort_descending else '▲'}")
+                btn.setStyleSheet(get_distance_button_active_style())
+            else:
+                btn.setText(label)
+                btn.setStyleSheet(get_distance_button_style())
     
-    def _scan_directory(self, path: str):
-        """디렉토리 스캔 (DLP 프린터 파일 찾기)"""
+    def _restore_selection(self, selected: str):
+        """목록 변경 후 선택 파일 인덱스 다시 찾기 (사라졌으면 선택 해제)"""
         try:
-            for item in sorted(os.listdir(path)):
-                item_path = os.path.join(path, item)
-                if os.path.isfile(item_path):
-                    ext = os.path.splitext(item)[1].lower()
-                    # DLP 프린터 파일 확장자
-                    if ext in ['.zip', '.dlp', '.photon', '.ctb']:
-                        self._file_paths.append(item_path)
-        except PermissionError:
-            pass
+            self._selected_index = self._file_paths.index(selected) if selected else None
+        except ValueError:
+            self._selected_index = None
+        if self._selected_index is None:
+            self.btn_open.setEnabled(False)
+            self._update_open_button()
+    
+    def _refresh_grid(self):
+        """보이는 상태면 그리드 갱신, 숨김 상태면 표시할 때로 미룸"""
+        if self.isVisible():
+            self._update_file_grid()
+        else:
+            self._grid_dirty = True
     
     def _update_file_grid(self):
-        """파일 그리드 업데이트"""
+        """
+        파일 그리드 업데이트
+
+        바뀌지 않은 칸은 FileItem이 stat 1회로 건너뛰고,
+        바뀐 칸은 기본 아이콘을 먼저 표시한 뒤 썸네일을 비동기로 요청
+        """
+        self._grid_dirty = False
         start_idx = self._current_page * self._files_per_page
+        visible = self._file_paths[start_idx:start_idx + self._files_per_page]
+
+        # 페이지를 벗어난 대기 요청 취소
+        self._thumb_loader.cancel_pending(keep=set(visible))
         
         for i, item in enumerate(self._file_items):
             file_idx = start_idx + i
             
             if file_idx < len(self._file_paths):
-                item.set_file(self._file_paths[file_idx])
+                path = self._file_paths[file_idx]
+                if item.set_file(path):
+                    image = self._thumb_loader.cached(path, item.file_identity)
+                    if image is not None:
+                        item.set_thumbnail(image, item.file_identity)
+                    else:
+                        self._thumb_loader.request(path, ThumbnailLoader.PRIORITY_VISIBLE)
                 item.setEnabled(True)
                 item.set_selected(file_idx == self._selected_index)
             else:
                 item.set_file("")
                 item.setEnabled(False)
                 item.set_selected(False)
+
+        # 다음 페이지 프리페치 (낮은 우선순위)
+        next_start = start_idx + self._files_per_page
+        for path in self._file_paths[next_start:next_start + self._files_per_page]:
+            if not self._thumb_loader.has(path):
+                self._thumb_loader.request(path, ThumbnailLoader.PRIORITY_PREFETCH)
         
         # 네비게이션 버튼 상태
         total_pages = max(1, (len(self._file_paths) + self._files_per_page - 1) // self._files_per_page)
         self.btn_up.setEnabled(self._current_page > 0)
         self.btn_down.setEnabled(self._current_page < total_pages - 1)
     
+    def _on_thumbnail_ready(self, path: str, image: QImage, identity):
+        """썸네일 로드 완료 → 해당 파일이 표시 중인 칸에 반영"""
+        for item in self._file_items:
+            if item.get_filepath() == path:
+                item.set_thumbnail(image, identity)
+    
     def _on_file_clicked(self, grid_index: int):
         """파일 클릭 처리 - 선택만"""
         file_idx = self._current_page * self._files_per_page + grid_index
@@ -404,11 +499,22 @@ class PrintPage(BasePage):
         return None
     
     def showEvent(self, event):
-        """페이지 표시 시"""
+        """
+        페이지 표시 시 (숨김 동안 바뀐 목록 반영)
+
+        숨길 때 대기 중인 썸네일 요청을 모두 취소하므로, 목록이 그대로여도
+        썸네일이 없는 칸은 다시 요청 (이미 표시된 칸은 stat 1회로 건너뜀)
+        """
         super().showEvent(event)
-        self.start_polling()
+        self._update_file_grid()
     
     def hideEvent(self, event):
-        """페이지 숨김 시"""
+        """페이지 숨김 시 (대기 중인 썸네일 요청 취소)"""
         super().hideEvent(event)
-        self.stop_polling()
+        self._thumb_loader.cancel_pending()
+        get_metadata_cache().flush()
+    
+    def shutdown(self):
+        """앱 종료 시 썸네일 로드 작업 정리 (마지막 사용 시각 저장)"""
+        self._thumb_loader.shutdown()
+        get_metadata_cache().flush()
@@ -8,10 +8,12 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QFrame, QDialog, QProgressBar
 )
-from PySide6.QtCore import Signal, Qt, QTimer
-from PySide6.QtGui import QPixmap
+from PySide6.QtCore import Signal, Qt, QTimer, QRect
+from PySide6.QtGui import QPixmap, QImage, QPainter
 
 from pages.base_page import BasePage
+from utils.time_estimator import PrintTimeEstimator
+from utils.mask_engine import MaskEngine
 from styles.colors import Colors
 from styles.fonts import Fonts
 from styles.icons import Icons
@@ -332,6 +334,13 @@ class PrintProgressPage(BasePage):
         self._blade_speed = 1500
         self._led_power = 100
         self._total_estimated_time = 0
+        self._layer_time_sec = 0.0  # 직전 레이어 소요 시간 (profile_updated)
+
+        # 남은 시간 예측 (레이어 실측으로 보정)
+        self._estimator: PrintTimeEstimator = None
+        self._remaining_sec = 0.0        # 마지막 예측 시점의 남은 시간
+        self._remaining_at = 0           # 마지막 예측 시점의 경과 시간
+        self._eta_text = ""
         
         # 경과 시간 타이머
         self._elapsed_timer = QTimer()
@@ -382,7 +391,7 @@ class PrintProgressPage(BasePage):
         self.row_blade_speed = ProgressInfoRow(Icons.BLADE_SPEED)  # 블레이드 속도
         self.row_led_power = ProgressInfoRow(Icons.LED_POWER)  # LED 파워
         self.row_elapsed = ProgressInfoRow(Icons.CLOCK)  # 경과 시간
-        self.row_total_time = ProgressInfoRow(Icons.HOURGLASS)  # 총 예상 시간
+        self.row_total_time = ProgressInfoRow(Icons.HOURGLASS)  # 남은 시간 + ETA
 
         info_layout.addWidget(self.row_bottom_exposure)
         info_layout.addWidget(self.row_normal_exposure)
@@ -615,9 +624,21 @@ class PrintProgressPage(BasePage):
         self._update_time_display()
     
     def _update_time_display(self):
-        """시간 표시 업데이트 (경과 시간만 업데이트, 총 예상 시간은 고정)"""
-        # 경과 시간만 업데이트
+        """시간 표시 업데이트 (경과 시간 + 마지막 예측 이후 흐른 만큼 남은 시간 차감)"""
         self.row_elapsed.set_value(self._format_time(self._elapsed_sec))
+
+        if self._estimator is None:
+            return
+
+        remaining = max(0, int(self._remaining_sec - (self._elapsed_sec - self._remaining_at)))
+        self.row_total_time.set_value(f"{self._format_time(remaining)}  (ETA {self._eta_text})")
+
+    def _refresh_estimate(self):
+        """예측기에서 남은 시간 / ETA 다시 계산 (레이어 완료 시)"""
+        self._remaining_sec = self._estimator.remaining()
+        self._remaining_at = self._elapsed_sec
+        self._eta_text = self._estimator.eta(self._remaining_sec).strftime("%H:%M")
+        self._update_time_display()
     
     def _format_time(self, seconds: int) -> str:
         """초를 MM:SS 또는 HH:MM:SS 형식으로 변환"""
@@ -631,41 +652,14 @@ class PrintProgressPage(BasePage):
             secs = seconds % 60
             return f"{minutes:02d}:{secs:02d}"
 
-    def _calculate_total_time(self, gcode_time: int, total_layers: int,
-                               blade_speed: int) -> int:
-        """총 예상 시간 계산 (블레이드 시간 포함)
-
-        Args:
-            gcode_time: run.gcode의 예상 시간 (초)
-            total_layers: 총 레이어 수
-            blade_speed: 블레이드 속도 (Gcode값, GUI = blade_speed / 50)
-
-        Returns:
-            총 예상 시간 (초)
-        """
-        BLADE_ROUND_TRIP = 250.0  # mm (0→125→0 왕복)
-
-        # Gcode값을 GUI값(mm/s)으로 변환
-        blade_speed_mm_s = blade_speed / 50.0
-
-        if blade_speed_mm_s <= 0:
-            blade_speed_mm_s = 30.0  # 기본값
-
-        # 블레이드 1회 왕복 시간
-        blade_time_per_layer = BLADE_ROUND_TRIP / blade_speed_mm_s
-
-        # 총 블레이드 시간
-        total_blade_time = blade_time_per_layer * total_layers
-
-        return int(gcode_time + total_blade_time)
-
     # === Public API (Worker에서 호출) ===
     
     def set_print_info(self, file_path: str, thumbnail: QPixmap,
                        total_layers: int, blade_speed: int, led_power: int,
                        estimated_time: int = 0, layer_height: float = 0.0,
                        bottom_exposure: float = 0.0, normal_exposure: float = 0.0,
-                       bottom_layer_count: int = 0):
+                       bottom_layer_count: int = 0, params: dict = None,
+                       leveling_cycles: int = 0):
         """프린트 정보 설정 (시작 시 호출)
 
         Args:
@@ -674,11 +668,13 @@ class PrintProgressPage(BasePage):
             total_layers: 총 레이어 수
             blade_speed: 블레이드 속도 (mm/min)
             led_power: LED 파워 (%)
-            estimated_time: 예상 시간 (초)
+            estimated_time: 슬라이서 예상 시간 (초, 참고용 - 표시는 PrintTimeEstimator 사용)
             layer_height: 레이어 높이 (mm)
             bottom_exposure: 바닥 노출 시간 (초)
             normal_exposure: 일반 노출 시간 (초)
             bottom_layer_count: 바닥 레이어 개수
+            params: 전체 프린트 파라미터 (리프트/하강 속도 등, 남은 시간 예측용)
+            leveling_cycles: 레진 평탄화 횟수
         """
         self._file_path = file_path
         self._total_layers = total_layers
@@ -686,6 +682,7 @@ class PrintProgressPage(BasePage):
         self._led_power = led_power
         self._current_layer = 0
         self._elapsed_sec = 0
+        self._layer_time_sec = 0.0
         self._status = self.STATUS_PRINTING
 
         # UI 업데이트
@@ -699,16 +696,25 @@ class PrintProgressPage(BasePage):
         else:
             self.lbl_layer_image.setPixmap(Icons.get_pixmap(Icons.FILE, 64, Colors.TEXT_DISABLED))
 
-        # 총 예상 시간 계산 (블레이드 시간 포함)
-        total_estimated_time = self._calculate_total_time(
-            estimated_time, total_layers, blade_speed
-        )
-        self._total_estimated_time = total_estimated_time
+        # 남은 시간 예측기 (레이어 파라미터로 초기화, 실측으로 보정)
+        estimator_params = dict(params or {})
+        estimator_params.update({
+            'totalLayer': total_layers,
+            'layerHeight': layer_height or estimator_params.get('layerHeight', 0.05),
+            'bottomLayerCount': bottom_layer_count,
+            'bottomLayerExposureTime': bottom_exposure,
+            'normalExposureTime': normal_exposure,
+        })
+        self._estimator = PrintTimeEstimator(estimator_params, blade_speed, leveling_cycles)
+        self._total_estimated_time = int(self._estimator.total())
 
         # 왼쪽 열: 진행 정보
         self.row_layer.set_value(f"0 / {total_layers}")
         self.row_elapsed.set_value("00:00")
-        self.row_total_time.set_value(self._format_time(total_estimated_time) if total_estimated_time > 0 else "--:--")
+        if total_layers > 0:
+            self._refresh_estimate()
+        else:
+            self.row_total_time.set_value("--:--")
 
         # 중앙 열: 레이어 정보
         self.row_layer_height.set_value(f"{layer_height:.3f} mm" if layer_height > 0 else "-")
@@ -744,15 +750,82 @@ class PrintProgressPage(BasePage):
 
         self.progress_bar.setValue(percent)
         self.lbl_percent.setText(f"{percent}%")
-        self.row_layer.set_value(f"{current_layer} / {total_layers}")
+        self._update_layer_row()
 
         self._update_time_display()
 
-    def update_layer_image(self, pixmap: QPixmap):
-        """현재 레이어 이미지 업데이트 (Worker에서 호출)"""
-        if pixmap:
-            scaled = pixmap.scaled(270, 270, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.lbl_layer_image.setPixmap(scaled)
+    def update_profile(self, profile: dict):
+        """
+        레이어 단계별 시간 업데이트 (Worker profile_updated)
+
+        Args:
+            profile: {'layer': idx, 'layer_total': ms, ...}
+        """
+        layer_ms = profile.get('layer_total')
+        if layer_ms is None:
+            return
+
+        self._layer_time_sec = layer_ms / 1000
+        self._update_layer_row()
+
+        # 남은 시간 예측 보정
+        if self._estimator is not None:
+            self._estimator.update(profile.get('layer', 0), layer_ms / 1000,
+                                   profile.get('exposure', 0.0) / 1000)
+            self._refresh_estimate()
+
+    def _update_layer_row(self):
+        """현재/총 레이어 (+ 직전 레이어 소요 시간)"""
+        text = f"{self._current_layer} / {self._total_layers}"
+        if self._layer_time_sec > 0:
+            text += f"  ({self._layer_time_sec:.1f}s/L)"
+        self.row_layer.set_value(text)
+
+    def update_layer_image(self, image, layer_idx: int = -1):
+        """
+        현재 레이어 이미지 업데이트 (Worker에서 호출)
+
+        Args:
+            image: QImage (8비트 레이어) 또는 QPixmap
+            layer_idx: 레이어 인덱스 (show_image frame_id)
+        """
+        if image is None or image.isNull():
+            return
+
+        # 8비트 상태로 축소한 뒤 미리보기 크기만 QPixmap으로 변환
+        if isinstance(image, QImage):
+            scaled = QPixmap.fromImage(self._scale_layer_image(image, 270))
+        else:
+            scaled = image.scaled(270, 270, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.lbl_layer_image.setPixmap(scaled)
+
+    @staticmethod
+    def _scale_layer_image(image: QImage, size: int) -> QImage:
+        """
+        레이어 미리보기 축소
+
+        경계 상자(MaskEngine.tag_bbox)가 있으면 그 영역만 축소해 검정 바탕에 그림
+        (프레임 전체가 아닌 단면 크기만큼만 처리)
+        """
+        bbox = MaskEngine.image_bbox(image)
+        if bbox is None:
+            return image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        scale = min(size / image.width(), size / image.height())
+        result = QImage(max(1, round(image.width() * scale)), max(1, round(image.height() * scale)),
+                        QImage.Format_RGB32)
+        result.fill(Qt.black)
+
+        x0, y0, x1, y1 = bbox
+        if x1 > x0 and y1 > y0:
+            target = QRect(int(x0 * scale), int(y0 * scale),
+                           max(1, round((x1 - x0) * scale)), max(1, round((y1 - y0) * scale)))
+            region = image.copy(x0, y0, x1 - x0, y1 - y0).scaled(
+                target.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            painter = QPainter(result)
+            painter.drawImage(target.topLeft(), region)
+            painter.end()
+        return result
     
     def show_completed(self):
         """완료 - 다이얼로그 표시 후 종료 버튼으로 전환"""
@@ -0,0 +1,82 @@
+"""
+Moonraker HTTP 호출 지연 벤치마크
+
+로컬 스텁 서버를 대상으로 호출당 지연 비교
+- 이전 방식: 매 호출 requests.post/get (매번 새 TCP 연결)
+- 현재 방식: MotorController 세션 (keep-alive 연결 재사용)
+
+사용법:
+    python test/bench_moonraker_http.py [--calls 500] [--url http://host:7125]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from controllers.motor_controller import MotorController
+from moonraker_stub import MoonrakerStub
+
+
+def measure(label: str, call, calls: int):
+    """호출당 지연 측정 (밀리초)"""
+    # 워밍업
+    for _ in range(10):
+        call()
+
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    p50 = statistics.median(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<28} 평균 {statistics.mean(samples):6.3f}ms  "
+          f"p50 {p50:6.3f}ms  p95 {p95:6.3f}ms  최대 {samples[-1]:6.3f}ms")
+    return p50
+
+
+def run(url: str, calls: int):
+    script_url = f"{url}/printer/gcode/script"
+    query_url = f"{url}/printer/objects/query"
+    gcode = {"script": "G90\nG0 Z0.050 F300"}
+
+    motor = MotorController(url)
+
+    print(f"대상: {url}, 호출 {calls}회\n")
+
+    print("[G-code 전송: POST /printer/gcode/script]")
+    before = measure("requests.post (연결마다)",
+                     lambda: requests.post(script_url, json=gcode, timeout=5), calls)
+    after = measure("Session.post (keep-alive)",
+                    lambda: motor._session.post(script_url, json=gcode, timeout=5), calls)
+    print(f"→ p50 {before / after:.1f}배\n")
+
+    print("[위치 조회: GET /printer/objects/query]")
+    before = measure("requests.get (연결마다)",
+                     lambda: requests.get(query_url, params={"toolhead": "position"}, timeout=5), calls)
+    after = measure("Session.get (keep-alive)",
+                    lambda: motor._session.get(query_url, params={"toolhead": "position"}, timeout=5), calls)
+    print(f"→ p50 {before / after:.1f}배")
+
+    motor.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Moonraker HTTP 지연 벤치마크")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--url", default="", help="실제 Moonraker 주소 (생략 시 로컬 스텁 사용)")
+    args = parser.parse_args()
+
+    if args.url:
+        run(args.url.rstrip('/'), args.calls)
+    else:
+        with MoonrakerStub() as stub:
+            run(stub.url, args.calls)
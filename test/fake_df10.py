@@ -0,0 +1,132 @@
+"""
+가짜 DF10 (pty 기반)
+
+실제 DF10 드라이버 보드 대신 의사 터미널(pty)에서 명령에 응답
+DLPController의 config.port에 slave 경로를 지정해 하드웨어 없이 시리얼 경로 테스트
+
+응답 규칙 (WI-EL00069 V07 기반):
+- 문자열 명령 "CM+...\\r\\n" → "OK\\r\\n" (CM+VERS / CM+GTMP는 값)
+- HEX 명령 0x2A <cmd> 0x0D → 0x2A <cmd> 0x00 0x0D
+
+사용법:
+    python test/fake_df10.py            # slave 경로 출력 후 대기
+"""
+
+import os
+import pty
+import time
+import select
+import threading
+from collections import Counter
+
+
+class FakeDF10:
+    """pty 기반 DF10 에뮬레이터"""
+
+    def __init__(self, response_delay: float = 0.005):
+        """
+        Args:
+            response_delay: 명령 처리 지연 (초, 실제 보드 응답 시간 흉내)
+        """
+        self.response_delay = response_delay
+        self.commands = Counter()  # 수신 명령 횟수
+        self.brightness = 440
+        self.led_on = False
+
+        self._master, self._slave = pty.openpty()
+        self.port = os.ttyname(self._slave)
+
+        self._running = False
+        self._thread = None
+
+    def start(self) -> "FakeDF10":
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+        os.close(self._master)
+        os.close(self._slave)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _loop(self):
+        buffer = bytearray()
+        while self._running:
+            ready, _, _ = select.select([self._master], [], [], 0.1)
+            if not ready:
+                continue
+            try:
+                buffer.extend(os.read(self._master, 256))
+            except OSError:
+                break
+
+            while buffer:
+                if buffer[0] == 0x2A:
+                    # HEX 명령 (3바이트)
+                    if len(buffer) < 3:
+                        break
+                    frame = bytes(buffer[:3])
+                    del buffer[:3]
+                    self._reply(self._handle_hex(frame))
+                else:
+                    # 문자열 명령 (LF 종료)
+                    end = buffer.find(b"\n")
+                    if end < 0:
+                        break
+                    line = bytes(buffer[:end]).decode("ascii", "replace").strip()
+                    del buffer[:end + 1]
+                    if line:
+                        self._reply(self._handle_ascii(line))
+
+    def _reply(self, data: bytes):
+        if self.response_delay > 0:
+            time.sleep(self.response_delay)
+        os.write(self._master, data)
+
+    def _handle_ascii(self, line: str) -> bytes:
+        self.commands[line.split("=")[0]] += 1
+
+        if line.startswith("CM+LEDS="):
+            self.brightness = int(line.split("=")[1])
+        elif line == "CM+LEDE=1":
+            self.led_on = True
+        elif line == "CM+LEDE=0":
+            self.led_on = False
+        elif line == "CM+VERS":
+            return b"DF10-FAKE-V1.0\r\n"
+        elif line == "CM+GTMP":
+            return b"35\r\n"
+
+        return b"OK\r\n"
+
+    def _handle_hex(self, frame: bytes) -> bytes:
+        cmd = frame[1]
+        self.commands[f"HEX {cmd:02X}"] += 1
+
+        if cmd == 0x4B:
+            self.led_on = True
+        elif cmd in (0x47, 0xFA, 0xFB):
+            self.led_on = False
+
+        # 0x0D가 응답 중간에 오지 않도록 상태 바이트는 0x00
+        return bytes([0x2A, cmd, 0x00, 0x0D])
+
+
+if __name__ == "__main__":
+    with FakeDF10() as fake:
+        print(f"가짜 DF10 실행: {fake.port} (Ctrl+C 종료)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        print(dict(fake.commands))
@@ -0,0 +1,404 @@
+"""
+Moonraker 스텁 서버 (로컬 테스트/벤치마크용)
+
+실제 Moonraker HTTP API 중 MotorController가 사용하는 엔드포인트만 흉내냄
+- GET  /printer/info
+- POST /printer/gcode/script   (G90/G91, G0/G1 X/Z, G28, M400 위치 추적)
+- POST /printer/emergency_stop
+- GET  /printer/objects/query  (toolhead.position, print_stats.state)
+- GET  /websocket              (JSON-RPC: printer.objects.subscribe → notify_status_update)
+
+HTTP/1.1 keep-alive 지원 (세션 재사용 효과 측정용)
+이동 명령은 거리/속도로 소요 시간을 계산해 그동안 idle_timeout.state = "Printing"
+M400은 이동이 끝날 때까지 응답을 지연, 상태 알림은 250ms 단위로 묶어서 전송
+
+사용법:
+    python test/moonraker_stub.py [--port 7125]
+"""
+
+import json
+import re
+import time
+import base64
+import struct
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# Moonraker 상태 알림 묶음 주기
+NOTIFY_INTERVAL = 0.25
+
+
+class MoonrakerState:
+    """스텁 프린터 상태 (toolhead 위치 + 모션 시간 추적)"""
+
+    def __init__(self, time_scale: float = 1.0):
+        """
+        Args:
+            time_scale: 이동 소요 시간 배율 (0이면 즉시 완료)
+        """
+        self.lock = threading.Lock()
+        self.position = [0.0, 0.0, 0.0, 0.0]  # X, Y, Z, E (명령 위치)
+        self.relative = False
+        self.state = "standby"
+        self.scripts = []  # 수신한 G-code 기록
+        self.time_scale = time_scale
+        self.motion_until = 0.0  # 큐에 들어간 이동이 끝나는 시각 (monotonic)
+
+    @property
+    def idle_state(self) -> str:
+        """idle_timeout.state"""
+        return "Printing" if time.monotonic() < self.motion_until else "Ready"
+
+    def status(self) -> dict:
+        """구독 대상 상태"""
+        with self.lock:
+            return {
+                "toolhead": {"position": list(self.position)},
+                "idle_timeout": {"state": self.idle_state},
+            }
+
+    def run_script(self, script: str):
+        """G-code 스크립트 실행 (위치 갱신, M400은 이동 완료까지 대기)"""
+        for line in script.splitlines():
+            line = line.split(';')[0].strip().upper()
+            if line == "M400":
+                self.wait_motion()
+                continue
+            with self.lock:
+                self._run_line(line)
+
+        with self.lock:
+            self.scripts.append(script)
+
+    def wait_motion(self):
+        """큐에 들어간 이동 완료까지 대기"""
+        remaining = self.motion_until - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def _queue_motion(self, duration: float):
+        start = max(time.monotonic(), self.motion_until)
+        self.motion_until = start + duration * self.time_scale
+
+    def _run_line(self, line: str):
+        if not line:
+            return
+        words = line.split()
+        cmd = words[0]
+
+        if cmd == "G90":
+            self.relative = False
+        elif cmd == "G91":
+            self.relative = True
+        elif cmd == "G28":
+            axes = [w for w in words[1:] if w in ("X", "Y", "Z")] or ["X", "Y", "Z"]
+            for axis in axes:
+                self.position["XYZ".index(axis)] = 0.0
+            self._queue_motion(1.0)
+        elif cmd in ("G0", "G1"):
+            speed = 300.0
+            distance = 0.0
+            for word in words[1:]:
+                if word.startswith("F"):
+                    speed = float(word[1:]) or speed
+                    continue
+                match = re.match(r"([XYZ])(-?[\d.]+)", word)
+                if not match:
+                    continue
+                idx = "XYZ".index(match.group(1))
+                value = float(match.group(2))
+                target = self.position[idx] + value if self.relative else value
+                distance = max(distance, abs(target - self.position[idx]))
+                self.position[idx] = target
+            self._queue_motion(distance / (speed / 60.0))
+        elif cmd == "G4":
+            for word in words[1:]:
+                if word.startswith("P"):
+                    self._queue_motion(float(word[1:]) / 1000.0)
+
+
+class MoonrakerHandler(BaseHTTPRequestHandler):
+    """Moonraker HTTP 요청 처리"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    # 헤더/본문을 따로 쓰면 재사용 연결에서 Nagle + 지연 ACK로 ~40ms 멈춤 → TCP_NODELAY
+    disable_nagle_algorithm = True
+
+    @property
+    def printer(self) -> MoonrakerState:
+        return self.server.printer
+
+    def log_message(self, format, *args):
+        pass  # 요청 로그 생략
+
+    def _send_json(self, payload: dict, status: int = 200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        # 헤더와 본문을 한 번에 전송 (end_headers()는 헤더를 바로 flush)
+        self._headers_buffer.append(b"\r\n")
+        self._headers_buffer.append(body)
+        self.wfile.write(b"".join(self._headers_buffer))
+        self._headers_buffer = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+
+        if url.path == "/websocket" and self.headers.get("Upgrade", "").lower() == "websocket":
+            self._serve_websocket()
+
+        elif url.path == "/printer/info":
+            self._send_json({"result": {"state": "ready", "state_message": "Printer is ready"}})
+
+        elif url.path == "/printer/objects/query":
+            query = parse_qs(url.query)
+            status = {}
+            with self.printer.lock:
+                if "toolhead" in query:
+                    status["toolhead"] = {"position": list(self.printer.position)}
+                if "print_stats" in query:
+                    status["print_stats"] = {"state": self.printer.state}
+            self._send_json({"result": {"eventtime": 0.0, "status": status}})
+
+        else:
+            self._send_json({"error": {"code": 404, "message": "Not Found"}}, 404)
+
+    # ==================== 웹소켓 ====================
+
+    def _serve_websocket(self):
+        """웹소켓 핸드셰이크 후 JSON-RPC 처리"""
+        key = self.headers.get("Sec-WebSocket-Key", "")
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        self.send_response(101, "Switching Protocols")
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+
+        client = WebSocketClient(self.connection)
+        self.server.add_client(client)
+        try:
+            while True:
+                text = client.recv()
+                if text is None:
+                    break
+                self._handle_rpc(client, text)
+        finally:
+            self.server.remove_client(client)
+            self.close_connection = True
+
+    def _handle_rpc(self, client: "WebSocketClient", text: str):
+        try:
+            request = json.loads(text)
+        except ValueError:
+            return
+
+        method = request.get("method")
+        request_id = request.get("id")
+
+        if method == "printer.objects.subscribe":
+            client.subscribed = True
+            status = self.printer.status()
+            client.last_status = status
+            result = {"eventtime": time.monotonic(), "status": status}
+        elif method == "server.info":
+            result = {"klippy_connected": True, "klippy_state": "ready"}
+        else:
+            client.send({"jsonrpc": "2.0", "id": request_id,
+                         "error": {"code": -32601, "message": f"Method not found: {method}"}})
+            return
+
+        client.send({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+
+        if url.path == "/printer/gcode/script":
+            try:
+                script = json.loads(body or b"{}").get("script", "")
+            except ValueError:
+                script = parse_qs(url.query).get("script", [""])[0]
+            self.printer.run_script(script)
+            self._send_json({"result": "ok"})
+
+        elif url.path == "/printer/emergency_stop":
+            self._send_json({"result": "ok"})
+
+        else:
+            self._send_json({"error": {"code": 404, "message": "Not Found"}}, 404)
+
+
+class WebSocketClient:
+    """서버측 웹소켓 연결 (텍스트 프레임만 처리)"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.send_lock = threading.Lock()
+        self.subscribed = False
+        self.last_status = {}
+
+    def _read_exact(self, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("closed")
+            data += chunk
+        return data
+
+    def recv(self):
+        """텍스트 메시지 수신 (종료 시 None)"""
+        try:
+            while True:
+                head = self._read_exact(2)
+                opcode = head[0] & 0x0F
+                length = head[1] & 0x7F
+                if length == 126:
+                    length = struct.unpack(">H", self._read_exact(2))[0]
+                elif length == 127:
+                    length = struct.unpack(">Q", self._read_exact(8))[0]
+                mask = self._read_exact(4) if head[1] & 0x80 else b""
+                payload = self._read_exact(length)
+                if mask:
+                    payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+                if opcode == 0x8:  # close
+                    self._send_frame(0x8, b"")
+                    return None
+                if opcode == 0x9:  # ping
+                    self._send_frame(0xA, payload)
+                    continue
+                if opcode == 0x1:
+                    return payload.decode()
+        except (ConnectionError, OSError):
+            return None
+
+    def _send_frame(self, opcode: int, payload: bytes):
+        length = len(payload)
+        if length < 126:
+            head = struct.pack(">BB", 0x80 | opcode, length)
+        elif length < 65536:
+            head = struct.pack(">BBH", 0x80 | opcode, 126, length)
+        else:
+            head = struct.pack(">BBQ", 0x80 | opcode, 127, length)
+        with self.send_lock:
+            self.sock.sendall(head + payload)
+
+    def send(self, message: dict):
+        try:
+            self._send_frame(0x1, json.dumps(message).encode())
+        except OSError:
+            pass
+
+
+class MoonrakerServer(ThreadingHTTPServer):
+    """HTTP + 웹소켓 스텁 서버 (상태 알림 스레드 포함)"""
+
+    daemon_threads = True
+
+    def __init__(self, address, time_scale: float = 1.0):
+        super().__init__(address, MoonrakerHandler)
+        self.printer = MoonrakerState(time_scale)
+        self._clients = []
+        self._clients_lock = threading.Lock()
+        self._notify_stop = threading.Event()
+        self._notify_thread = threading.Thread(target=self._notify_loop, daemon=True)
+        self._notify_thread.start()
+
+    def add_client(self, client: WebSocketClient):
+        with self._clients_lock:
+            self._clients.append(client)
+
+    def remove_client(self, client: WebSocketClient):
+        with self._clients_lock:
+            if client in self._clients:
+                self._clients.remove(client)
+
+    def _notify_loop(self):
+        """250ms마다 변경된 상태만 notify_status_update로 전송"""
+        while not self._notify_stop.wait(NOTIFY_INTERVAL):
+            status = self.printer.status()
+            with self._clients_lock:
+                clients = list(self._clients)
+
+            for client in clients:
+                if not client.subscribed:
+                    continue
+                diff = {}
+                for name, fields in status.items():
+                    previous = client.last_status.get(name, {})
+                    changed = {k: v for k, v in fields.items() if previous.get(k) != v}
+                    if changed:
+                        diff[name] = changed
+                if diff:
+                    client.last_status = status
+                    client.send({"jsonrpc": "2.0", "method": "notify_status_update",
+                                 "params": [diff, time.monotonic()]})
+
+    def server_close(self):
+        self._notify_stop.set()
+        super().server_close()
+
+
+class MoonrakerStub:
+    """백그라운드 스레드에서 실행되는 스텁 서버"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, time_scale: float = 0.0):
+        """
+        Args:
+            host, port: 바인드 주소 (port 0이면 임의 포트)
+            time_scale: 이동 소요 시간 배율 (0이면 즉시 완료)
+        """
+        self.server = MoonrakerServer((host, port), time_scale)
+        self._thread = None
+
+    @property
+    def printer(self) -> MoonrakerState:
+        return self.server.printer
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MoonrakerStub":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Moonraker 스텁 서버")
+    parser.add_argument("--port", type=int, default=7125)
+    parser.add_argument("--time-scale", type=float, default=1.0, help="이동 소요 시간 배율")
+    args = parser.parse_args()
+
+    stub = MoonrakerStub(port=args.port, time_scale=args.time_scale)
+    print(f"Moonraker 스텁 실행: {stub.url} (Ctrl+C 종료)")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
@@ -0,0 +1,63 @@
+"""
+DF10 시리얼 명령 지연 테스트 (가짜 DF10 사용)
+
+pty 기반 가짜 DF10(test/fake_df10.py)에 DLPController를 연결해
+레이어당 LED ON/OFF 경로의 지연과 밝기 재전송 여부 확인
+
+사용법:
+    python test/test_dlp_serial.py [--layers 20]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controllers.dlp_controller import DLPController
+from fake_df10 import FakeDF10
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DF10 시리얼 명령 지연 테스트")
+    parser.add_argument("--layers", type=int, default=20)
+    parser.add_argument("--brightness", type=int, default=440)
+    args = parser.parse_args()
+
+    with FakeDF10() as fake:
+        dlp = DLPController()
+        dlp.config.port = fake.port
+
+        if not dlp.initialize():
+            print("초기화 실패")
+            return 1
+
+        dlp.projector_on(wait_time=0)
+
+        on_times, off_times = [], []
+        for _ in range(args.layers):
+            start = time.perf_counter()
+            dlp.led_on(args.brightness)
+            on_times.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            dlp.led_off()
+            off_times.append((time.perf_counter() - start) * 1000)
+
+        dlp.close()
+
+        print()
+        print(f"LED ON  : 평균 {statistics.mean(on_times):.1f}ms, 최대 {max(on_times):.1f}ms")
+        print(f"LED OFF : 평균 {statistics.mean(off_times):.1f}ms, 최대 {max(off_times):.1f}ms")
+        print(f"수신 명령: {dict(fake.commands)}")
+
+        brightness_count = fake.commands["CM+LEDS"]
+        ok = brightness_count == 1 and fake.brightness == args.brightness
+        print(f"밝기 전송 {brightness_count}회 (기대값 1) → {'OK' if ok else 'FAIL'}")
+        return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Moonraker 웹소켓 모션 완료 테스트
+
+로컬 스텁 서버(test/moonraker_stub.py, 웹소켓 + 이동 시간 시뮬레이션)를 대상으로
+HTTP M400 대기와 웹소켓 idle 알림 대기를 비교
+
+사용법:
+    python test/test_moonraker_ws.py [--time-scale 0.2]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controllers.motor_controller import MotorController
+from controllers.moonraker_ws import WEBSOCKET_AVAILABLE
+from moonraker_stub import MoonrakerStub
+
+
+def run_moves(motor: MotorController, label: str):
+    """블레이드 왕복 + Z 이동 시간 측정"""
+    start = time.perf_counter()
+    motor.x_move_absolute(125, 4500)
+    motor.z_move_absolute(5.0, 300)
+    motor.x_move_absolute(0, 4500)
+    motor.z_move_absolute(0.05, 300)
+    elapsed = time.perf_counter() - start
+    z, x = motor.get_position()
+    print(f"\n[{label}] 소요 {elapsed:.2f}초, 위치 Z={z:.3f} X={x:.1f}\n")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Moonraker 웹소켓 모션 완료 테스트")
+    parser.add_argument("--time-scale", type=float, default=0.2, help="스텁 이동 시간 배율")
+    args = parser.parse_args()
+
+    if not WEBSOCKET_AVAILABLE:
+        print("websocket-client가 설치되지 않았습니다: pip install websocket-client")
+        return 1
+
+    with MoonrakerStub(time_scale=args.time_scale) as stub:
+        # 1. HTTP M400 대기
+        motor = MotorController(stub.url)
+        motor.config.use_websocket = False
+        motor.connect()
+        http_time = run_moves(motor, "HTTP M400")
+        motor.close()
+
+        # 2. 웹소켓 idle 알림 대기
+        motor = MotorController(stub.url)
+        motor.connect()
+        if not motor.websocket_connected:
+            print("웹소켓 연결 실패")
+            return 1
+        ws_time = run_moves(motor, "WebSocket idle")
+
+        # 위치 캐시가 알림으로 갱신되는지 확인
+        stub.printer.run_script("G90\nG1 X42 F6000")
+        time.sleep(0.6)
+        print(f"알림 위치 캐시: X={motor._x_position:.1f} (기대값 42.0)")
+        motor.close()
+
+    print(f"HTTP M400 {http_time:.2f}초 → WebSocket {ws_time:.2f}초")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
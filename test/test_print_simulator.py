@@ -0,0 +1,84 @@
+"""
+프린트 시간 시뮬레이터 실행 테스트
+
+작은 작업 ZIP(5개 레이어)을 만들어 tools/print_simulator.py CLI를 별도 프로세스로 실행하고
+종료 코드 0, JSON 결과 저장, 레이어 수를 확인 (옵션별 비교까지 시뮬레이션 5회 실행)
+
+사용법:
+    python test/test_print_simulator.py [--layers 5]
+"""
+
+import io
+import os
+import sys
+import json
+import zipfile
+import tempfile
+import argparse
+import subprocess
+
+from PIL import Image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIMULATOR = os.path.join(ROOT, "tools", "print_simulator.py")
+
+
+def make_job(path: str, layers: int):
+    """테스트용 작업 ZIP (run.gcode + 흰 사각형 레이어 PNG)"""
+    buffer = io.BytesIO()
+    layer = Image.new('L', (192, 108), 0)
+    layer.paste(255, (48, 27, 144, 81))
+    layer.save(buffer, 'PNG')
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("run.gcode", "\n".join([
+            f";totalLayer:{layers}",
+            ";resolutionX:192",
+            ";resolutionY:108",
+            ";machineX:12.48",
+            ";machineY:7.02",
+            ";layerHeight:0.05",
+            ";bottomLayerCount:1",
+            ";bottomLayerExposureTime:5",
+            ";normalExposureTime:2",
+        ]) + "\n")
+        for index in range(1, layers + 1):
+            zf.writestr(f"{index}.png", buffer.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="프린트 시간 시뮬레이터 실행 테스트")
+    parser.add_argument("--layers", type=int, default=5, help="테스트 작업 레이어 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        job_zip = os.path.join(tmp, "job.zip")
+        result_json = os.path.join(tmp, "result.json")
+        make_job(job_zip, args.layers)
+
+        env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+        proc = subprocess.run([sys.executable, SIMULATOR, job_zip, "--json", result_json],
+                              capture_output=True, text=True, env=env, timeout=300)
+        print(proc.stdout)
+        if proc.returncode != 0:
+            print(proc.stderr)
+            print(f"실패: 종료 코드 {proc.returncode}")
+            return 1
+
+        if not os.path.isfile(result_json):
+            print("실패: JSON 결과 없음")
+            return 1
+        with open(result_json, "r", encoding="utf-8") as f:
+            result = json.load(f)
+
+    layers = result["result"]["layers"]
+    if layers != args.layers:
+        print(f"실패: 레이어 수 {layers} != {args.layers}")
+        return 1
+
+    print("통과: 종료 코드 0")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,8 +4,14 @@ MASK 적용 도구
 
 슬라이서에서 생성한 ZIP 파일의 레이어 이미지에 MASK를 적용합니다.
 
+레이어는 ZIP에서 바로 읽어 처리한 뒤 출력 ZIP에 원래 순서대로 기록합니다
+(임시 폴더에 압축을 풀지 않음). 여러 CPU 코어를 쓰는 병렬 모드(-j)를 지원합니다.
+레이어가 아닌 항목(run.gcode, 미리보기 등)은 압축을 풀지 않고 그대로 복사합니다.
+
 사용법:
     python mask_applier.py <input.zip> <mask.bmp> [output.zip]
+    python mask_applier.py <input.zip> <mask.bmp> -j 4  # 4개 프로세스
+    python mask_applier.py <input.zip> <mask.bmp> --png-level 1 --stored  # 빠른 처리 / 무압축 ZIP
     python mask_applier.py --gui  # GUI 모드
 
 예시:
@@ -15,10 +21,14 @@ MASK 적용 도구
 
 import sys
 import os
+import copy
+import struct
 import zipfile
-import tempfile
 import shutil
 import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
 from io import BytesIO
 
@@ -44,16 +54,25 @@ except ImportError:
 class MaskApplier:
     """MASK 적용 클래스"""
 
-    def __init__(self, mask_path: str):
+    def __init__(self, mask_path: str, png_compress_level: int = 6, png_optimize: bool = False,
+                 compression: int = zipfile.ZIP_DEFLATED, raw_copy: bool = True):
         """
         Args:
             mask_path: MASK BMP 파일 경로
+            png_compress_level: 레이어 PNG 압축 레벨 (0-9, 낮을수록 빠르고 파일이 큼)
+            png_optimize: PNG optimize 옵션 (가장 작지만 느림, 압축 레벨 9로 동작)
+            compression: 다시 쓴 항목의 ZIP 압축 방식 (ZIP_DEFLATED / ZIP_STORED)
+            raw_copy: True면 레이어가 아닌 항목은 압축 데이터를 그대로 복사 (바이트 동일)
         """
         if not PIL_AVAILABLE:
             raise ImportError("Pillow 라이브러리가 필요합니다: pip install Pillow")
 
         self.mask_path = mask_path
         self.mask_image = None
+        self.png_compress_level = max(0, min(9, png_compress_level))
+        self.png_optimize = png_optimize
+        self.compression = compression
+        self.raw_copy = raw_copy
         self._load_mask()
 
     def _load_mask(self):
@@ -113,15 +132,43 @@ class MaskApplier:
 
         return result
 
+    def mask_png_bytes(self, png_data: bytes) -> bytes:
+        """
+        레이어 PNG 바이트 → MASK 적용 → PNG 바이트
+
+        Args:
+            png_data: 원본 레이어 PNG
+
+        Returns:
+            MASK가 적용된 PNG
+        """
+        with Image.open(BytesIO(png_data)) as layer_img:
+            masked_img = self.apply_mask(layer_img)
+        output = BytesIO()
+        masked_img.save(output, 'PNG', compress_level=self.png_compress_level,
+                        optimize=self.png_optimize)
+        return output.getvalue()
+
+    @staticmethod
+    def is_layer_member(name: str) -> bool:
+        """ZIP 최상위의 숫자.png 레이어 이미지인지"""
+        if '/' in name or not name.endswith('.png'):
+            return False
+        return os.path.splitext(name)[0].isdigit()
+
     def process_zip(self, input_zip: str, output_zip: str = None,
-                    progress_callback=None) -> str:
+                    progress_callback=None, workers: int = 1) -> str:
         """
         ZIP 파일의 모든 레이어에 MASK 적용
 
+        입력 ZIP의 항목을 순서대로 읽어 레이어만 MASK를 적용하고 출력 ZIP에 바로 기록
+        (압축 해제용 임시 폴더 없음, 항목 순서/시각 유지)
+
         Args:
             input_zip: 입력 ZIP 파일 경로
             output_zip: 출력 ZIP 파일 경로 (None이면 자동 생성)
             progress_callback: 진행률 콜백 함수 (current, total)
+            workers: 레이어 처리 프로세스 수 (1 = 현재 프로세스, 0 = CPU 코어 수)
 
         Returns:
             출력 ZIP 파일 경로
@@ -134,57 +181,155 @@ class MaskApplier:
             base_name = os.path.splitext(input_zip)[0]
             output_zip = f"{base_name}_masked.zip"
 
-        # 임시 디렉토리에서 작업
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # ZIP 압축 해제
-            print(f"압축 해제 중: {input_zip}")
-            with zipfile.ZipFile(input_zip, 'r') as zf:
-                zf.extractall(temp_dir)
-
-            # 레이어 이미지 찾기 (숫자.png 형식)
-            layer_files = []
-            for f in os.listdir(temp_dir):
-                if f.endswith('.png'):
-                    name = os.path.splitext(f)[0]
-                    if name.isdigit():
-                        layer_files.append((int(name), f))
-
-            layer_files.sort(key=lambda x: x[0])
-            total_layers = len(layer_files)
-            print(f"레이어 수: {total_layers}")
-
-            # 각 레이어에 MASK 적용
-            for i, (layer_num, filename) in enumerate(layer_files):
-                layer_path = os.path.join(temp_dir, filename)
-
-                # 레이어 이미지 로드
-                layer_img = Image.open(layer_path)
-
-                # MASK 적용
-                masked_img = self.apply_mask(layer_img)
-
-                # 저장 (원본 덮어쓰기)
-                masked_img.save(layer_path, 'PNG')
-
-                # 진행률 콜백
-                if progress_callback:
-                    progress_callback(i + 1, total_layers)
-
-                if (i + 1) % 100 == 0 or (i + 1) == total_layers:
-                    print(f"  처리 중: {i + 1}/{total_layers}")
-
-            # 새 ZIP 파일 생성
-            print(f"압축 중: {output_zip}")
-            with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED) as zf:
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, temp_dir)
-                        zf.write(file_path, arcname)
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+
+        try:
+            self._stream_zip(input_zip, output_zip, progress_callback, workers)
+        except BaseException:
+            # 중간에 실패하면 불완전한 출력 파일 삭제
+            if os.path.exists(output_zip):
+                os.remove(output_zip)
+            raise
 
         print(f"완료: {output_zip}")
         return output_zip
 
+    def _stream_zip(self, input_zip: str, output_zip: str, progress_callback, workers: int):
+        """
+        입력 ZIP → 출력 ZIP 스트리밍 처리
+
+        병렬 모드에서는 레이어를 프로세스 풀에 넘기고, 결과는 입력 순서대로 기록
+        (처리 중인 레이어 수를 workers × 4개로 제한해 메모리 사용량 고정)
+        """
+        executor = None
+        if workers > 1:
+            # GUI(MaskWorker 스레드)에서 호출되므로 fork 대신 forkserver/spawn으로 워커 생성
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_pool_worker,
+                initargs=(self.mask_path, self.png_compress_level, self.png_optimize),
+                mp_context=_pool_context()
+            )
+
+        try:
+            with zipfile.ZipFile(input_zip, 'r') as zin, \
+                    open(input_zip, 'rb') as raw_in, \
+                    zipfile.ZipFile(output_zip, 'w', self.compression) as zout:
+                infos = zin.infolist()
+                total_layers = sum(1 for info in infos if self.is_layer_member(info.filename))
+                print(f"레이어 수: {total_layers} (프로세스 {workers}개)")
+
+                window = workers * 4
+                pending = deque()  # (ZipInfo, 레이어 여부, 데이터 / Future / None = 그대로 복사)
+                done = 0
+
+                def write_ready(limit: int):
+                    """맨 앞 항목이 준비됐거나 대기 항목이 limit를 넘으면 순서대로 기록"""
+                    nonlocal done
+                    while pending and (len(pending) > limit
+                                       or not isinstance(pending[0][2], Future)
+                                       or pending[0][2].done()):
+                        info, is_layer, item = pending.popleft()
+                        if item is None:
+                            self._copy_member_raw(raw_in, zout, info)
+                        else:
+                            data = item.result() if isinstance(item, Future) else item
+                            self._write_member(zout, info, data)
+
+                        if is_layer:
+                            done += 1
+                            if progress_callback:
+                                progress_callback(done, total_layers)
+                            if done % 100 == 0 or done == total_layers:
+                                print(f"  처리 중: {done}/{total_layers}")
+
+                for info in infos:
+                    is_layer = self.is_layer_member(info.filename)
+                    if not is_layer and self.raw_copy and self._can_copy_raw(info):
+                        pending.append((info, False, None))
+                        write_ready(window)
+                        continue
+
+                    data = zin.read(info)
+                    if is_layer:
+                        if executor is not None:
+                            data = executor.submit(_mask_png_in_worker, data)
+                        else:
+                            data = self.mask_png_bytes(data)
+                    pending.append((info, is_layer, data))
+                    write_ready(window)
+
+                write_ready(0)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    def _write_member(self, zout: zipfile.ZipFile, info: zipfile.ZipInfo, data: bytes):
+        """원본 항목 이름/시각/속성을 유지해 출력 ZIP에 기록"""
+        out_info = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+        out_info.external_attr = info.external_attr
+        out_info.compress_type = self.compression
+        zout.writestr(out_info, data)
+
+    @staticmethod
+    def _can_copy_raw(info: zipfile.ZipInfo) -> bool:
+        """그대로 복사할 수 있는 항목인지 (ZIP64 크기 항목은 다시 압축)"""
+        return max(info.file_size, info.compress_size) < zipfile.ZIP64_LIMIT
+
+    @staticmethod
+    def _copy_member_raw(raw_in, zout: zipfile.ZipFile, info: zipfile.ZipInfo):
+        """
+        압축된 데이터를 풀지 않고 출력 ZIP으로 복사
+
+        로컬 헤더는 중앙 디렉터리 정보(CRC, 크기)로 다시 만들고
+        데이터 디스크립터 플래그는 제거 (크기를 헤더에 기록하므로)
+        """
+        # 입력 로컬 헤더 → 데이터 시작 위치 (파일명/extra 길이는 중앙 디렉터리와 다를 수 있음)
+        raw_in.seek(info.header_offset)
+        header = raw_in.read(zipfile.sizeFileHeader)
+        name_len, extra_len = struct.unpack('<HH', header[26:30])
+        raw_in.seek(info.header_offset + zipfile.sizeFileHeader + name_len + extra_len)
+
+        out_info = copy.copy(info)
+        out_info.flag_bits &= ~0x08
+        out_info.header_offset = zout.fp.tell()
+        zout.fp.write(out_info.FileHeader(zip64=False))
+
+        remaining = info.compress_size
+        while remaining > 0:
+            chunk = raw_in.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                raise zipfile.BadZipFile(f"ZIP 항목 데이터가 잘렸습니다: {info.filename}")
+            zout.fp.write(chunk)
+            remaining -= len(chunk)
+
+        zout.filelist.append(out_info)
+        zout.NameToInfo[out_info.filename] = out_info
+        zout.start_dir = zout.fp.tell()
+
+
+# 병렬 모드 프로세스별 MaskApplier (프로세스 시작 시 MASK 1회 로드)
+_pool_applier = None
+
+
+def _pool_context():
+    """프로세스 풀 시작 방식 (forkserver 지원 시 사용, Windows 등은 spawn)"""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _init_pool_worker(mask_path: str, png_compress_level: int, png_optimize: bool):
+    """프로세스 풀 초기화 함수"""
+    global _pool_applier
+    _pool_applier = MaskApplier(mask_path, png_compress_level, png_optimize)
+
+
+def _mask_png_in_worker(png_data: bytes) -> bytes:
+    """프로세스 풀 작업 함수 (PNG 바이트만 주고받음)"""
+    return _pool_applier.mask_png_bytes(png_data)
+
 
 def apply_mask_to_single_image(layer_path: str, mask_path: str, output_path: str = None):
     """단일 이미지에 MASK 적용 (테스트용)"""
@@ -214,11 +359,13 @@ if PYSIDE6_AVAILABLE:
         finished = Signal(str)  # output path
         error = Signal(str)  # error message
 
-        def __init__(self, input_zip: str, mask_path: str, output_zip: str = None):
+        def __init__(self, input_zip: str, mask_path: str, output_zip: str = None,
+                     workers: int = 0):
             super().__init__()
             self.input_zip = input_zip
             self.mask_path = mask_path
             self.output_zip = output_zip
+            self.workers = workers  # 0 = CPU 코어 수
 
         def run(self):
             try:
@@ -226,7 +373,8 @@ if PYSIDE6_AVAILABLE:
                 output = applier.process_zip(
                     self.input_zip,
                     self.output_zip,
-                    progress_callback=lambda c, t: self.progress.emit(c, t)
+                    progress_callback=lambda c, t: self.progress.emit(c, t),
+                    workers=self.workers
                 )
                 self.finished.emit(output)
             except Exception as e:
@@ -383,6 +531,7 @@ def main():
 예시:
   %(prog)s print_file.zip read.bmp
   %(prog)s print_file.zip read.bmp output.zip
+  %(prog)s print_file.zip read.bmp -j 1
   %(prog)s --gui
   %(prog)s --single layer.png read.bmp
         """
@@ -392,6 +541,16 @@ def main():
     parser.add_argument('output_zip', nargs='?', help='출력 ZIP 파일 (선택사항)')
     parser.add_argument('--gui', action='store_true', help='GUI 모드로 실행')
     parser.add_argument('--single', metavar='IMAGE', help='단일 이미지에 MASK 적용')
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='레이어 처리 프로세스 수 (기본 0 = CPU 코어 수, 1 = 병렬 처리 안 함)')
+    parser.add_argument('--png-level', type=int, default=6,
+                        help='레이어 PNG 압축 레벨 0-9 (기본 6, 1이면 훨씬 빠름)')
+    parser.add_argument('--png-optimize', action='store_true',
+                        help='PNG optimize (가장 작은 파일, 느림)')
+    parser.add_argument('--stored', action='store_true',
+                        help='다시 쓴 항목을 ZIP 무압축(STORED)으로 저장 (빠른 로컬 저장소용)')
+    parser.add_argument('--recompress-all', action='store_true',
+                        help='레이어가 아닌 항목도 다시 압축 (기본: 그대로 복사)')
 
     args = parser.parse_args()
 
@@ -419,8 +578,14 @@ def main():
         parser.print_help()
         sys.exit(1)
 
-    applier = MaskApplier(args.mask_bmp)
-    applier.process_zip(args.input_zip, args.output_zip)
+    applier = MaskApplier(
+        args.mask_bmp,
+        png_compress_level=args.png_level,
+        png_optimize=args.png_optimize,
+        compression=zipfile.ZIP_STORED if args.stored else zipfile.ZIP_DEFLATED,
+        raw_copy=not args.recompress_all
+    )
+    applier.process_zip(args.input_zip, args.output_zip, workers=args.jobs)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,528 @@
+"""
+프린트 시간 시뮬레이터
+======================
+
+작업 ZIP과 장비 프로파일(모터 속도, DF10 명령 지연, 디코딩 처리량)로
+PrintWorker 시퀀스 전체를 가상 시간에서 실행해 예상 출력 시간을 계산합니다.
+실제 대기(time.sleep) 없이 즉시 끝나며, 옵션(프리페치 / 일괄 모션)별 절감 시간을 비교합니다.
+
+사용법:
+    python print_simulator.py <job.zip> [--profile machine.json] [--mask mask.bmp]
+
+예시:
+    python print_simulator.py print_file.zip
+    python print_simulator.py print_file.zip --profile machine.json --json result.json
+    python print_simulator.py print_file.zip --blade-speed 3000 --leveling 2 --verbose
+
+장비 프로파일 (JSON, 모든 항목 선택):
+    {
+        "motor": {"x_speed": 4500, "z_home_speed": 300, "use_websocket": true},
+        "http_rtt": 0.01,
+        "dlp_command_latency": 0.015,
+        "read_mb_per_s": 30.0,
+        "decode_mpx_per_s": 80.0
+    }
+"""
+
+import io
+import os
+import sys
+import json
+import math
+import argparse
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field, fields, asdict
+from typing import Optional, Dict, Any, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QCoreApplication, Qt
+
+from controllers.motor_controller import MotorConfig, MotionStep
+from controllers.job_info import load_job_info
+from workers.print_worker import PrintWorker, PrintJob
+from workers.print_profiler import PrintProfiler
+from utils.time_estimator import PrintTimeEstimator
+
+
+@dataclass
+class MachineProfile:
+    """장비 프로파일 (시뮬레이션 비용 모델)"""
+    motor: MotorConfig = field(default_factory=MotorConfig)  # 축 속도 / 웹소켓 사용 여부
+    accel: float = 0.0                  # 축 가속도 (mm/s², 0이면 등속 이동)
+    http_rtt: float = 0.01              # Moonraker HTTP 요청 왕복 (초)
+    m400_settle: float = 0.5            # M400 응답 후 고정 대기 (초, MotorController 기준)
+    homing_overhead: float = 2.0        # 홈잉 1회 추가 시간 (엔드스톱 재접근 등, 초)
+    leveling_settle: float = 0.2        # 평탄화 왕복 사이 안정화 대기 (초)
+    dlp_command_latency: float = 0.015  # DF10 명령 1회 왕복 (초)
+    read_mb_per_s: float = 30.0         # ZIP 레이어 읽기 처리량 (MB/s, 압축 크기 기준)
+    decode_mpx_per_s: float = 80.0      # PNG 디코딩 + QImage 변환 처리량 (Mpx/s)
+    mask_mpx_per_s: float = 300.0       # MASK 합성 처리량 (Mpx/s)
+    display_latency: float = 0.017      # 표시 요청 → 프로젝터 반영 (초, 약 1프레임)
+
+    @classmethod
+    def load(cls, path: str) -> "MachineProfile":
+        """JSON 파일에서 프로파일 읽기 (없는 항목은 기본값)"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        profile = cls()
+        motor_data = data.pop("motor", {})
+        for item in fields(MotorConfig):
+            if item.name in motor_data:
+                setattr(profile.motor, item.name, motor_data[item.name])
+        for item in fields(cls):
+            if item.name != "motor" and item.name in data:
+                setattr(profile, item.name, float(data[item.name]))
+        return profile
+
+    def travel_time(self, distance: float, speed: float) -> float:
+        """이동 시간 (초) - 가속도가 있으면 사다리꼴/삼각형 속도 프로파일"""
+        distance = abs(distance)
+        if distance <= 0 or speed <= 0:
+            return 0.0
+
+        velocity = speed / 60.0
+        if self.accel <= 0:
+            return distance / velocity
+
+        # 최고 속도 도달 여부
+        accel_distance = velocity * velocity / self.accel
+        if distance >= accel_distance:
+            return distance / velocity + velocity / self.accel
+        return 2 * math.sqrt(distance / self.accel)
+
+
+class VirtualClock:
+    """가상 시계 (초)"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def advance(self, seconds: float):
+        if seconds > 0:
+            self.now += seconds
+
+    def advance_to(self, deadline: float):
+        if deadline > self.now:
+            self.now = deadline
+
+
+class SimulatedMotor:
+    """
+    MotorController 대체 (가상 시간)
+
+    PrintWorker가 호출하는 메서드만 구현하고, 실제 경로와 같은 순서로 비용을 더함
+    - 개별 이동: HTTP 전송 + 이동 + 완료 대기 (웹소켓 idle 안정화 또는 M400 + 고정 대기)
+    - 모션 프로그램: HTTP 1회 + 이동 합계 (스크립트 끝 M400까지 응답 대기)
+    """
+
+    def __init__(self, clock: VirtualClock, profile: MachineProfile):
+        self.clock = clock
+        self.profile = profile
+        self.config = profile.motor
+        self._z_position = 0.0
+        self._x_position = 0.0
+        self.moves = 0      # HTTP 이동 명령 수
+        self.waits = 0      # 완료 대기 수
+
+    def connect(self) -> bool:
+        self.clock.advance(self.profile.http_rtt)
+        return True
+
+    def _send(self):
+        self.moves += 1
+        self.clock.advance(self.profile.http_rtt)
+
+    def _wait_complete(self):
+        self.waits += 1
+        if self.config.use_websocket:
+            self.clock.advance(self.config.ws_settle_time)
+        else:
+            self.clock.advance(self.profile.http_rtt + self.profile.m400_settle)
+
+    def _move(self, axis: str, position: float, speed: int):
+        if axis == 'Z':
+            position = max(self.config.z_min, min(position, self.config.z_max))
+            distance = position - self._z_position
+            self._z_position = position
+        else:
+            position = max(self.config.x_min, min(position, self.config.x_max))
+            distance = position - self._x_position
+            self._x_position = position
+        self.clock.advance(self.profile.travel_time(distance, speed))
+
+    def z_home(self) -> bool:
+        self._send()
+        self.clock.advance(self.profile.homing_overhead)
+        self._move('Z', 0.0, self.config.z_home_speed)
+        self._wait_complete()
+        return True
+
+    def x_home(self, force: bool = False) -> bool:
+        if not force and self._x_position == 0.0:
+            return True
+        self._send()
+        self.clock.advance(self.profile.homing_overhead)
+        self._move('X', 0.0, self.config.x_home_speed)
+        self._wait_complete()
+        return True
+
+    def z_move_absolute(self, position: float, speed: Optional[int] = None) -> bool:
+        self._send()
+        self._move('Z', position, speed or self.config.z_speed)
+        self._wait_complete()
+        return True
+
+    def x_move_absolute(self, position: float, speed: Optional[int] = None) -> bool:
+        self._send()
+        self._move('X', position, speed or self.config.x_speed)
+        self._wait_complete()
+        return True
+
+    def layer_motion_program(self, lift_z: float, lift_speed: int,
+                             blade_home: float, blade_speed: int,
+                             next_z: float, drop_speed: int) -> Tuple[bool, Optional[MotionStep]]:
+        self._send()
+        for step in (MotionStep("Z축 리프트", 'Z', lift_z, lift_speed),
+                     MotionStep("X축 복귀", 'X', blade_home, blade_speed),
+                     MotionStep("Z축 하강", 'Z', next_z, drop_speed)):
+            self._move(step.axis, step.position, step.speed)
+        return True, None
+
+    def leveling_cycle(self, cycles: int = 1, speed: Optional[int] = None) -> bool:
+        if cycles <= 0:
+            return True
+        speed = speed or self.config.x_speed
+        self.z_move_absolute(0.1, self.config.drop_speed)
+        for _ in range(cycles):
+            self.x_move_absolute(self.config.x_max, speed)
+            self.clock.advance(self.profile.leveling_settle)
+            self.x_move_absolute(0, speed)
+            self.clock.advance(self.profile.leveling_settle)
+        return self.z_home()
+
+
+class SimulatedDLP:
+    """DLPController 대체 (가상 시간, 명령 1회 = dlp_command_latency)"""
+
+    def __init__(self, clock: VirtualClock, profile: MachineProfile):
+        self.clock = clock
+        self.profile = profile
+        self._brightness = None
+        self.commands = 0
+
+    @property
+    def is_initialized(self) -> bool:
+        return True
+
+    def _command(self):
+        self.commands += 1
+        self.clock.advance(self.profile.dlp_command_latency)
+
+    def set_brightness(self, brightness: int, force: bool = False) -> bool:
+        if force or brightness != self._brightness:
+            self._command()
+            self._brightness = brightness
+        return True
+
+    def led_on(self, brightness: Optional[int] = None) -> bool:
+        if brightness is not None:
+            self.set_brightness(brightness)
+        self._command()
+        return True
+
+    def led_off(self) -> bool:
+        self._command()
+        return True
+
+    def projector_on(self, wait_time: float = 3.0) -> bool:
+        self._command()
+        return True
+
+    def projector_off(self) -> bool:
+        self._command()
+        return True
+
+
+class SimulatedPrintWorker(PrintWorker):
+    """
+    가상 시간에서 실행하는 PrintWorker
+
+    - _now / _wait_until: 가상 시계 사용 (노광 대기는 시계만 앞으로 이동)
+    - 레이어 이미지: 실제 디코딩 대신 ZIP 항목 크기와 해상도로 준비 시간 계산
+    - 프리페치: 백그라운드 준비 완료 시각을 버퍼 깊이 제약으로 계산해 대기 시간 산출
+    - start(): 실제 QThread로 실행하고 끝날 때까지 대기 (동기 호출)
+    """
+
+    def __init__(self, clock: VirtualClock, profile: MachineProfile):
+        super().__init__(SimulatedMotor(clock, profile), SimulatedDLP(clock, profile))
+        self.clock = clock
+        self.machine = profile
+        self.profiler: Optional[PrintProfiler] = None
+        self.setup_time = 0.0
+
+        # 프리페치 모델
+        self._sim_prefetch_depth = 0
+        self._sim_prefetch_start = 0.0
+        self._ready_at: List[float] = []    # 레이어별 준비 완료 시각
+        self._taken_at: List[float] = []    # 레이어별 버퍼에서 꺼낸 시각
+
+        # 워커 스레드에서 바로 호출 (이벤트 루프 없이 동작)
+        self.layer_started.connect(self._on_layer_started, Qt.DirectConnection)
+
+    def start(self):
+        """QThread로 실행 후 종료까지 대기 (CSV 저장 없이 프로파일만 기록)"""
+        self._job.profile = False
+        self.profiler = PrintProfiler(self._job.params.totalLayer, self._job.file_path, output_dir="")
+        self._profiler = self.profiler
+        super().start()
+        self.wait()
+
+    def _on_layer_started(self, layer_idx: int):
+        if layer_idx == 0:
+            self.setup_time = self.clock.now
+
+    # ==================== 가상 시간 ====================
+
+    def _now(self) -> float:
+        return self.clock.now
+
+    def _wait_until(self, deadline: float) -> str:
+        self.clock.advance_to(deadline)
+        return 'done'
+
+    # ==================== 레이어 이미지 모델 ====================
+
+    def _layer_costs(self, layer_idx: int) -> Dict[str, float]:
+        """레이어 준비 단계별 시간 (초)"""
+        params = self._job.params
+        megapixels = params.resolutionX * params.resolutionY / 1e6
+
+        info = self._archive.get_layer_info(layer_idx) if self._archive is not None else None
+        compressed = info.compress_size if info is not None else 0
+
+        costs = {
+            'image_fetch': compressed / (self.machine.read_mb_per_s * 1e6),
+            'decode': megapixels / self.machine.decode_mpx_per_s,
+        }
+        if self._use_mask and self._mask_engine.is_loaded:
+            costs['mask'] = megapixels / self.machine.mask_mpx_per_s
+        return costs
+
+    def _start_prefetch(self, job: PrintJob, total_layers: int):
+        self._sim_prefetch_depth = job.prefetch_depth if total_layers > 0 else 0
+        self._sim_prefetch_start = self.clock.now
+        self._ready_at = []
+        self._taken_at = []
+
+    def _stop_prefetch(self):
+        self._sim_prefetch_depth = 0
+
+    def _show_layer_image(self, zip_path: str, layer_idx: int) -> bool:
+        costs = self._layer_costs(layer_idx)
+        cost = sum(costs.values())
+
+        if self._sim_prefetch_depth > 0:
+            # 준비 시작 = 이전 레이어 준비 완료 + 버퍼에 자리가 생긴 시각 중 늦은 쪽
+            begin = self._ready_at[-1] if self._ready_at else self._sim_prefetch_start
+            freed = layer_idx - self._sim_prefetch_depth
+            if freed >= 0:
+                begin = max(begin, self._taken_at[freed])
+            self._ready_at.append(begin + cost)
+
+            t0 = self.clock.now
+            self.clock.advance_to(self._ready_at[-1])
+            self._profile('prefetch_wait', self.clock.now - t0)
+            self._taken_at.append(self.clock.now)
+        else:
+            self.clock.advance(cost)
+
+        for phase, seconds in costs.items():
+            self._profile(phase, seconds)
+
+        self.clock.advance(self.machine.display_latency)
+        self._profile('display', self.machine.display_latency)
+        return True
+
+
+@dataclass
+class SimulationResult:
+    """시뮬레이션 결과"""
+    name: str
+    prefetch_depth: int
+    batched_motion: bool
+    total: float = 0.0          # 전체 (초, 정리 포함)
+    setup: float = 0.0          # 홈 + 평탄화 (초)
+    layers: int = 0
+    motor_moves: int = 0
+    dlp_commands: int = 0
+    phases: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+def simulate(zip_path: str, params: Dict[str, Any], profile: MachineProfile,
+             prefetch_depth: int = 3, batched_motion: bool = True,
+             blade_speed: int = 1500, led_power: int = 440, leveling_cycles: int = 1,
+             mask_path: str = "", name: str = "", verbose: bool = False) -> SimulationResult:
+    """
+    작업 1회 시뮬레이션
+
+    Args:
+        zip_path: 작업 ZIP
+        params: 프린트 파라미터 dict
+        profile: 장비 프로파일
+        prefetch_depth: 프리페치 깊이 (0이면 끔)
+        batched_motion: 노광 후 모션 일괄 전송
+        verbose: 워커 로그 출력
+
+    Returns:
+        SimulationResult
+    """
+    clock = VirtualClock()
+    worker = SimulatedPrintWorker(clock, profile)
+    errors = []
+    worker.error_occurred.connect(errors.append, Qt.DirectConnection)
+
+    output = sys.stdout if verbose else io.StringIO()
+    with redirect_stdout(output):
+        worker.start_print(
+            zip_path, params,
+            blade_speed=blade_speed,
+            led_power=led_power,
+            leveling_cycles=leveling_cycles,
+            use_mask=bool(mask_path),
+            mask_path=mask_path,
+            prefetch_depth=prefetch_depth,
+            batched_motion=batched_motion,
+            use_layer_cache=False,  # 디스크 캐시 상태와 무관하게 같은 결과
+            stage_local=False
+        )
+
+    if errors:
+        raise RuntimeError(errors[0])
+
+    phases = worker.profiler.summary()
+    return SimulationResult(
+        name=name,
+        prefetch_depth=prefetch_depth,
+        batched_motion=batched_motion,
+        total=clock.now,
+        setup=worker.setup_time,
+        layers=phases.get('layer_total', {}).get('count', 0),
+        motor_moves=worker.motor.moves,
+        dlp_commands=worker.dlp.commands,
+        phases=phases,
+    )
+
+
+def format_duration(seconds: float) -> str:
+    """초 → H:MM:SS"""
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def print_report(result: SimulationResult, baseline: SimulationResult,
+                 others: List[SimulationResult], estimate: float):
+    """결과 출력"""
+    print(f"예상 출력 시간: {format_duration(result.total)} ({result.total:.1f}초)")
+    print(f"  - 준비 (홈 + 평탄화): {result.setup:.1f}초")
+    print(f"  - 레이어 {result.layers}개, 모터 명령 {result.motor_moves}회, DF10 명령 {result.dlp_commands}회")
+    print(f"  - 간이 예측 (PrintTimeEstimator): {format_duration(estimate)}")
+    print()
+
+    print("단계별 시간 (ms)")
+    print(f"  {'단계':<14}{'p50':>10}{'p95':>10}{'최대':>10}{'합계(s)':>10}")
+    for phase, stats in result.phases.items():
+        print(f"  {phase:<14}{stats['p50']:>10.1f}{stats['p95']:>10.1f}"
+              f"{stats['max']:>10.1f}{stats['total'] / 1000:>10.1f}")
+    print()
+
+    print("옵션별 비교")
+    for item in [baseline] + others:
+        saved = baseline.total - item.total
+        print(f"  {item.name:<24}{format_duration(item.total):>10}"
+              f"   절감 {saved:>8.1f}초 ({saved / baseline.total * 100 if baseline.total else 0:4.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='프린트 시간 시뮬레이터 - 작업 ZIP의 예상 출력 시간과 옵션별 절감 시간을 계산합니다.',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+예시:
+  %(prog)s print_file.zip
+  %(prog)s print_file.zip --profile machine.json
+  %(prog)s print_file.zip --prefetch 0 --no-batched --json result.json
+        """
+    )
+    parser.add_argument('job_zip', help='작업 ZIP 파일')
+    parser.add_argument('--profile', metavar='JSON', help='장비 프로파일 (JSON)')
+    parser.add_argument('--mask', metavar='BMP', default='', help='MASK 파일 (MASK 합성 시간 포함)')
+    parser.add_argument('--blade-speed', type=int, default=1500, help='블레이드 속도 (mm/min)')
+    parser.add_argument('--led-power', type=int, default=440, help='LED 밝기')
+    parser.add_argument('--leveling', type=int, default=1, help='평탄화 횟수')
+    parser.add_argument('--prefetch', type=int, default=3, help='프리페치 깊이 (0: 끔)')
+    parser.add_argument('--no-batched', action='store_true', help='노광 후 모션 개별 전송')
+    parser.add_argument('--json', metavar='PATH', help='결과를 JSON으로 저장 (회귀 비교용)')
+    parser.add_argument('--verbose', action='store_true', help='워커 로그 출력')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.job_zip):
+        print(f"오류: ZIP 파일을 찾을 수 없습니다: {args.job_zip}")
+        return 1
+
+    profile = MachineProfile.load(args.profile) if args.profile else MachineProfile()
+    params = load_job_info(args.job_zip).params.to_dict()
+
+    # 워커 시그널용 이벤트 루프 (PySide6가 인스턴스를 qApp으로 보관)
+    QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    options = dict(
+        blade_speed=args.blade_speed,
+        led_power=args.led_power,
+        leveling_cycles=args.leveling,
+        mask_path=args.mask,
+        verbose=args.verbose,
+    )
+
+    try:
+        result = simulate(args.job_zip, params, profile, args.prefetch, not args.no_batched,
+                          name="선택 옵션", **options)
+
+        # 옵션별 비교 (기준: 프리페치 끔 + 개별 이동)
+        options['verbose'] = False
+        baseline = simulate(args.job_zip, params, profile, 0, False, name="기준 (옵션 없음)", **options)
+        others = [
+            simulate(args.job_zip, params, profile, max(1, args.prefetch), False,
+                     name="프리페치", **options),
+            simulate(args.job_zip, params, profile, 0, True, name="일괄 모션", **options),
+            simulate(args.job_zip, params, profile, max(1, args.prefetch), True,
+                     name="프리페치 + 일괄 모션", **options),
+        ]
+    except Exception as e:
+        print(f"오류: 시뮬레이션 실패: {e}")
+        return 1
+
+    estimate = PrintTimeEstimator(params, args.blade_speed, args.leveling).total()
+
+    print(f"작업: {args.job_zip}")
+    print_report(result, baseline, others, estimate)
+
+    if args.json:
+        report = {
+            'job': args.job_zip,
+            'profile': asdict(profile),
+            'result': asdict(result),
+            'comparison': [asdict(item) for item in [baseline] + others],
+            'estimate': estimate,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,13 +4,34 @@ VERICOM DLP 3D Printer GUI - Utils Package
 """
 
 from .usb_monitor import USBMonitor
+from .usb_index import DirectoryIndex, FileRecord
 from .zip_handler import ZipHandler
+from .mask_engine import MaskEngine
 from .time_formatter import TimeFormatter, format_time, format_duration
+from .time_estimator import PrintTimeEstimator
+from .metadata_cache import MetadataCache, get_metadata_cache
+from .layer_cache import LayerCache, LayerFrame, get_layer_cache
+from .job_stager import JobStager, StagingTask, get_job_stager
+from .job_analyzer import JobAnalyzer, JobAnalysis
 
 __all__ = [
     'USBMonitor',
+    'DirectoryIndex',
+    'FileRecord',
     'ZipHandler',
+    'MaskEngine',
     'TimeFormatter',
     'format_time',
-    'format_duration'
+    'format_duration',
+    'PrintTimeEstimator',
+    'MetadataCache',
+    'get_metadata_cache',
+    'LayerCache',
+    'LayerFrame',
+    'get_layer_cache',
+    'JobStager',
+    'StagingTask',
+    'get_job_stager',
+    'JobAnalyzer',
+    'JobAnalysis'
 ]
@@ -0,0 +1,174 @@
+"""
+VERICOM DLP 3D Printer - Inotify
+리눅스 inotify 최소 래퍼 (ctypes, 추가 패키지 없음)
+
+파일 디스크립터(fd)를 QSocketNotifier 등 이벤트 루프에 등록하고
+읽기 가능할 때 read_events()로 이벤트를 꺼내는 방식
+리눅스가 아니거나 libc에 inotify가 없으면 INOTIFY_AVAILABLE = False
+"""
+
+import os
+import errno
+import struct
+import ctypes
+import ctypes.util
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+# 이벤트 마스크 (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_UNMOUNT = 0x00002000
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    _inotify_init1 = _libc.inotify_init1
+    _inotify_add_watch = _libc.inotify_add_watch
+    _inotify_rm_watch = _libc.inotify_rm_watch
+    _inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    _inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    INOTIFY_AVAILABLE = True
+except (OSError, AttributeError):
+    INOTIFY_AVAILABLE = False
+
+
+@dataclass
+class InotifyEvent:
+    """inotify 이벤트"""
+    path: str       # 감시 중인 디렉토리
+    name: str       # 디렉토리 내 항목 이름 (디렉토리 자체 이벤트면 "")
+    mask: int
+
+    @property
+    def is_dir(self) -> bool:
+        return bool(self.mask & IN_ISDIR)
+
+
+class Inotify:
+    """
+    inotify 인스턴스 (논블로킹 fd)
+
+    경로 → watch descriptor 매핑을 관리하고, 이벤트를 경로 기준으로 돌려줌
+    """
+
+    def __init__(self):
+        if not INOTIFY_AVAILABLE:
+            raise OSError(errno.ENOSYS, "inotify 사용 불가")
+
+        fd = _inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+        self.fd = fd
+        self._paths: Dict[int, str] = {}    # wd → path
+        self._watches: Dict[str, int] = {}  # path → wd
+
+    def add_watch(self, path: str, mask: int) -> bool:
+        """
+        디렉토리 감시 추가 (이미 감시 중이면 마스크 교체)
+
+        Returns:
+            성공 여부 (권한 없음, 감시 개수 제한 등은 False)
+        """
+        wd = _inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            print(f"[Inotify] 감시 추가 실패: {path} ({os.strerror(err)})")
+            return False
+
+        old = self._watches.get(path)
+        if old is not None and old != wd:
+            self._paths.pop(old, None)
+        self._paths[wd] = path
+        self._watches[path] = wd
+        return True
+
+    def remove_watch(self, path: str):
+        """디렉토리 감시 제거"""
+        wd = self._watches.pop(path, None)
+        if wd is None:
+            return
+        self._paths.pop(wd, None)
+        _inotify_rm_watch(self.fd, wd)  # 이미 사라진 경로면 실패해도 무시
+
+    def is_watching(self, path: str) -> bool:
+        return path in self._watches
+
+    @property
+    def watched_paths(self) -> List[str]:
+        return list(self._watches.keys())
+
+    def read_events(self) -> List[InotifyEvent]:
+        """
+        대기 중인 이벤트 모두 읽기 (없으면 빈 리스트, 블로킹 안 함)
+
+        IN_IGNORED (감시 자동 해제)는 내부 매핑만 정리하고 반환하지 않음
+        IN_Q_OVERFLOW는 path=""로 반환 (호출자가 전체 재스캔)
+        """
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                print(f"[Inotify] 읽기 오류: {e}")
+                break
+            if not data:
+                break
+
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    events.append(InotifyEvent("", "", mask))
+                    continue
+
+                path = self._paths.get(wd)
+                if mask & IN_IGNORED:
+                    if path is not None:
+                        self._paths.pop(wd, None)
+                        if self._watches.get(path) == wd:
+                            del self._watches[path]
+                    continue
+                if path is None:
+                    continue
+
+                events.append(InotifyEvent(path, os.fsdecode(name), mask))
+        return events
+
+    def close(self):
+        """fd 닫기 (모든 감시 해제)"""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+        self._paths.clear()
+        self._watches.clear()
+
+
+def create_inotify() -> Optional[Inotify]:
+    """Inotify 생성 (사용 불가 시 None)"""
+    try:
+        return Inotify()
+    except OSError as e:
+        print(f"[Inotify] 초기화 실패 - 폴링 사용: {e}")
+        return None
@@ -0,0 +1,223 @@
+"""
+VERICOM DLP 3D Printer - Job Analyzer
+작업 레이어 분석 (레이어별 경화 면적, 레진 사용량, 최대 단면 레이어)
+
+레이어 PNG를 디코딩해 경계 상자 영역만 히스토그램(PIL, C 구현)으로 밝기 합을 구함
+    면적(px)  = Σ 밝기 / 255  (안티에일리어싱 가장자리는 부분 경화로 계산)
+    면적(mm²) = 면적(px) × 픽셀 피치 X × 픽셀 피치 Y  (피치 = machineX / resolutionX)
+    부피(ml)  = Σ 면적(mm²) × layerHeight / 1000
+
+ZIP 읽기는 호출 스레드에서 순서대로, 디코딩/집계는 프로세스 풀에서 병렬로 (GIL 회피)
+결과는 MetadataCache에 저장 → 같은 파일은 다시 분석하지 않음
+"""
+
+import io
+import os
+import threading
+import traceback
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from controllers.gcode_parser import LayerArchive, PrintParameters
+
+# PIL for 레이어 디코딩
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+# 최대 단면 레이어로 보여줄 개수
+LARGEST_LAYER_COUNT = 3
+
+
+@dataclass
+class JobAnalysis:
+    """작업 분석 결과"""
+    layer_areas: List[float] = field(default_factory=list)  # 레이어별 경화 면적 (mm²)
+    layer_height: float = 0.05                               # mm
+    pixel_pitch: Tuple[float, float] = (0.065, 0.065)        # mm (X, Y)
+
+    @property
+    def volume_ml(self) -> float:
+        """예상 레진 사용량 (ml, 서포트 포함 / 흘러내림 제외)"""
+        return sum(self.layer_areas) * self.layer_height / 1000.0
+
+    @property
+    def max_area(self) -> float:
+        return max(self.layer_areas) if self.layer_areas else 0.0
+
+    @property
+    def mean_area(self) -> float:
+        return sum(self.layer_areas) / len(self.layer_areas) if self.layer_areas else 0.0
+
+    def largest_layers(self, count: int = LARGEST_LAYER_COUNT) -> List[int]:
+        """단면이 가장 큰 레이어 인덱스 (면적 내림차순)"""
+        order = sorted(range(len(self.layer_areas)), key=lambda i: self.layer_areas[i], reverse=True)
+        return order[:count]
+
+    def summary(self) -> Dict[str, Any]:
+        """메타데이터 캐시 / 화면 표시용 요약 (레이어별 면적 제외)"""
+        return {
+            'layer_count': len(self.layer_areas),
+            'volume_ml': round(self.volume_ml, 3),
+            'max_area_mm2': round(self.max_area, 2),
+            'mean_area_mm2': round(self.mean_area, 2),
+            'largest_layers': self.largest_layers(),
+            'layer_height': self.layer_height,
+            'pixel_pitch': list(self.pixel_pitch),
+        }
+
+
+def measure_layer(image_data: bytes) -> Tuple[float, Tuple[int, int, int, int]]:
+    """
+    레이어 1장 측정 (프로세스 풀 작업 함수)
+
+    Args:
+        image_data: 레이어 PNG 바이트
+
+    Returns:
+        (경화 면적 px, 경계 상자 (x0, y0, x1, y1) - 완전히 검정이면 (0, 0, 0, 0))
+    """
+    layer = Image.open(io.BytesIO(image_data))
+    if layer.mode != 'L':
+        layer = layer.convert('L')
+
+    bbox = layer.getbbox()
+    if bbox is None:
+        return 0.0, (0, 0, 0, 0)
+
+    # 경계 상자 영역만 집계 (바깥은 모두 검정)
+    histogram = layer.crop(bbox).histogram()
+    weighted = sum(level * count for level, count in enumerate(histogram))
+    return weighted / 255.0, bbox
+
+
+def _pool_context():
+    """프로세스 풀 시작 방식 (forkserver 지원 시 사용, Windows 등은 spawn)"""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _init_pool_worker():
+    """프로세스 풀 초기화 (GUI / 프린트보다 낮은 우선순위)"""
+    try:
+        os.nice(10)
+    except (OSError, AttributeError):
+        pass
+
+
+class AnalysisCancelled(Exception):
+    """분석 취소"""
+
+
+class JobAnalyzer:
+    """
+    작업 ZIP 레이어 분석
+
+    run()은 동기 함수 (JobAnalysisWorker 스레드에서 호출)
+    """
+
+    def __init__(self, zip_path: str, params: PrintParameters,
+                 layer_names: Optional[List[str]] = None, workers: int = 0):
+        """
+        Args:
+            zip_path: 작업 ZIP 경로
+            params: 프린트 파라미터 (layerHeight, 해상도, 출력 영역)
+            layer_names: 정렬된 레이어 파일명 (JobInfo 결과 재사용)
+            workers: 프로세스 수 (0 = CPU 코어 수 - 1, 1 = 풀 없이 현재 스레드에서)
+        """
+        self.zip_path = zip_path
+        self.params = params
+        self.layer_names = layer_names
+        self.workers = workers
+
+    def pixel_pitch(self) -> Tuple[float, float]:
+        """픽셀 피치 (mm)"""
+        p = self.params
+        return (p.machineX / max(1, p.resolutionX), p.machineY / max(1, p.resolutionY))
+
+    def run(self, cancel_event: Optional[threading.Event] = None,
+            progress_callback: Optional[Callable[[int, int], None]] = None) -> Optional[JobAnalysis]:
+        """
+        전체 레이어 분석
+
+        Args:
+            cancel_event: 설정되면 분석 중단
+            progress_callback: 진행률 콜백 (완료 레이어 수, 전체 레이어 수)
+
+        Returns:
+            JobAnalysis 또는 None (취소 / 실패)
+        """
+        if not PIL_AVAILABLE:
+            print("[JobAnalyzer] PIL 없음 - 분석 불가")
+            return None
+
+        archive = LayerArchive(self.zip_path, self.layer_names)
+        if not archive.open():
+            return None
+
+        workers = self.workers if self.workers > 0 else max(1, (os.cpu_count() or 2) - 1)
+        total = len(archive)
+        pixel_areas = [0.0] * total
+
+        def record(index: int, result):
+            area, bbox = result
+            pixel_areas[index] = area
+            archive.set_layer_bbox(index, bbox)  # 경계 상자 인덱스도 함께 채움
+            if progress_callback:
+                progress_callback(index + 1, total)
+
+        def check_cancel():
+            if cancel_event is not None and cancel_event.is_set():
+                raise AnalysisCancelled()
+
+        executor = None
+        try:
+            print(f"[JobAnalyzer] 시작: {os.path.basename(self.zip_path)} ({total}개 레이어, 프로세스 {workers}개)")
+            if workers == 1:
+                for index in range(total):
+                    check_cancel()
+                    record(index, measure_layer(archive.read_layer(index)))
+            else:
+                # GUI 프로세스(여러 QThread / 웹소켓 스레드)를 fork하지 않도록 forkserver/spawn 사용
+                executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_pool_worker,
+                                               mp_context=_pool_context())
+                window = workers * 4
+                pending = deque()  # (레이어 인덱스, Future)
+                for index in range(total):
+                    check_cancel()
+                    pending.append((index, executor.submit(measure_layer, archive.read_layer(index))))
+                    while len(pending) >= window:
+                        done_index, future = pending.popleft()
+                        record(done_index, future.result())
+                while pending:
+                    check_cancel()
+                    done_index, future = pending.popleft()
+                    record(done_index, future.result())
+        except AnalysisCancelled:
+            print("[JobAnalyzer] 취소")
+            return None
+        except Exception as e:
+            print(f"[JobAnalyzer] 분석 실패: {type(e).__name__}: {e}")
+            traceback.print_exc()
+            return None
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            archive.close()
+
+        pitch = self.pixel_pitch()
+        analysis = JobAnalysis(
+            layer_areas=[area * pitch[0] * pitch[1] for area in pixel_areas],
+            layer_height=self.params.layerHeight,
+            pixel_pitch=pitch,
+        )
+        print(f"[JobAnalyzer] 완료: 레진 {analysis.volume_ml:.2f}ml, "
+              f"최대 단면 {analysis.max_area:.1f}mm² (레이어 {analysis.largest_layers(1)})")
+        return analysis
@@ -0,0 +1,304 @@
+"""
+VERICOM DLP 3D Printer - Job Stager
+프린트 시작 시 작업 ZIP을 로컬 저장소(data/staging)로 복사
+
+USB에서 몇 시간 동안 레이어를 읽으면 느린 USB 지연, 분리 시 출력 중단 위험이 있음
+→ 홈/평탄화 동안 백그라운드로 복사하고, 끝나면 LayerArchive를 로컬 복사본으로 전환
+
+- 1MB 단위 복사 (진행률 콜백, 중간 취소 가능)
+- 검증: 복사본의 중앙 디렉터리(이름/CRC/크기)가 원본과 같고,
+        모든 항목을 풀어 CRC가 중앙 디렉터리 값과 맞을 때만 사용
+- 검증된 복사본만 최종 이름으로 교체 (.part → .zip), 같은 파일 재출력 시 복사 생략
+- 전체 크기가 max_bytes를 넘거나 디스크 여유가 부족하면 오래된 복사본부터 삭제
+"""
+
+import os
+import zlib
+import hashlib
+import zipfile
+import threading
+from typing import Callable, List, Optional, Tuple
+
+
+# 복사본 경로
+STAGING_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "staging")
+
+_STAGED_EXT = ".zip"
+_PART_EXT = ".part"
+
+# 진행률 콜백 (복사한 바이트, 전체 바이트)
+ProgressCallback = Callable[[int, int], None]
+
+
+class StagingCancelled(Exception):
+    """복사 취소"""
+
+
+class JobStager:
+    """
+    작업 ZIP 로컬 복사 / 복사본 관리
+
+    stage()는 동기 함수 (StagingTask 스레드에서 호출)
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, staging_dir: str = STAGING_DIR, max_bytes: int = 4 * 1024 * 1024 * 1024,
+                 min_free_bytes: int = 512 * 1024 * 1024):
+        """
+        Args:
+            staging_dir: 복사본 폴더
+            max_bytes: 복사본 전체 최대 크기 (초과 시 오래된 복사본 삭제)
+            min_free_bytes: 복사 후에도 남겨 둘 디스크 여유 공간
+        """
+        self.staging_dir = staging_dir
+        self.max_bytes = max_bytes
+        self.min_free_bytes = min_free_bytes
+        self._lock = threading.Lock()
+
+    # ==================== 경로 ====================
+
+    def staged_path(self, src_path: str, stat: Optional[os.stat_result] = None) -> str:
+        """
+        원본에 대응하는 복사본 경로 (원본 경로/크기/수정 시각이 같으면 같은 이름)
+        """
+        if stat is None:
+            stat = os.stat(src_path)
+        identity = f"{os.path.abspath(src_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        key = hashlib.sha1(identity.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.staging_dir, f"{key}_{os.path.basename(src_path)}")
+
+    def find(self, src_path: str) -> Optional[str]:
+        """이미 검증된 복사본 경로 (없으면 None)"""
+        try:
+            path = self.staged_path(src_path)
+        except OSError:
+            return None
+        return path if os.path.isfile(path) else None
+
+    def should_stage(self, src_path: str) -> bool:
+        """원본이 복사본 폴더와 다른 장치(USB 등)에 있을 때만 복사"""
+        try:
+            os.makedirs(self.staging_dir, exist_ok=True)
+            return os.stat(src_path).st_dev != os.stat(self.staging_dir).st_dev
+        except OSError as e:
+            print(f"[JobStager] 장치 확인 실패: {e}")
+            return False
+
+    # ==================== 복사 ====================
+
+    def stage(self, src_path: str, progress_callback: Optional[ProgressCallback] = None,
+              cancel_event: Optional[threading.Event] = None) -> Optional[str]:
+        """
+        작업 ZIP을 로컬로 복사 + 검증
+
+        Args:
+            src_path: 원본 ZIP 경로
+            progress_callback: 진행률 콜백 (복사한 바이트, 전체 바이트)
+            cancel_event: 설정되면 복사 중단
+
+        Returns:
+            검증된 복사본 경로 또는 None (실패/취소/공간 부족 → 원본 사용)
+        """
+        try:
+            stat = os.stat(src_path)
+            dest = self.staged_path(src_path, stat)
+        except OSError as e:
+            print(f"[JobStager] 원본 확인 실패: {e}")
+            return None
+
+        if os.path.isfile(dest):
+            os.utime(dest)  # LRU 시각 갱신
+            if progress_callback:
+                progress_callback(stat.st_size, stat.st_size)
+            print(f"[JobStager] 기존 복사본 사용: {dest}")
+            return dest
+
+        with self._lock:
+            if not self._make_room(stat.st_size, keep=dest):
+                print(f"[JobStager] 공간 부족, 원본 사용 ({stat.st_size / (1024 * 1024):.1f}MB)")
+                return None
+
+        part = dest + _PART_EXT
+        try:
+            self._copy(src_path, part, stat.st_size, progress_callback, cancel_event)
+            self._verify(src_path, part, cancel_event)
+            os.replace(part, dest)
+        except StagingCancelled:
+            print("[JobStager] 복사 취소")
+            self._remove(part)
+            return None
+        except (OSError, zipfile.BadZipFile, zlib.error, ValueError) as e:
+            print(f"[JobStager] 복사 실패, 원본 사용: {e}")
+            self._remove(part)
+            return None
+
+        print(f"[JobStager] 복사 완료: {dest} ({stat.st_size / (1024 * 1024):.1f}MB)")
+        return dest
+
+    def _copy(self, src_path: str, dest_path: str, total: int,
+              progress_callback: Optional[ProgressCallback],
+              cancel_event: Optional[threading.Event]):
+        """청크 단위 복사 (디스크에 기록될 때까지 fsync)"""
+        os.makedirs(self.staging_dir, exist_ok=True)
+        copied = 0
+        with open(src_path, 'rb') as src, open(dest_path, 'wb') as dst:
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise StagingCancelled()
+                chunk = src.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                dst.write(chunk)
+                copied += len(chunk)
+                if progress_callback:
+                    progress_callback(copied, total)
+            dst.flush()
+            os.fsync(dst.fileno())
+
+        if copied != total:
+            raise ValueError(f"복사 크기 불일치: {copied} / {total}")
+
+    def _verify(self, src_path: str, copy_path: str, cancel_event: Optional[threading.Event]):
+        """
+        복사본 검증
+
+        1. 복사본 중앙 디렉터리가 원본 중앙 디렉터리와 같은지 (이름/CRC/크기)
+        2. 복사본의 모든 항목을 풀어 CRC 확인 (zipfile이 끝까지 읽을 때 CRC 불일치면 BadZipFile)
+        """
+        with zipfile.ZipFile(src_path, 'r') as zsrc:
+            expected = self._directory(zsrc)
+
+        with zipfile.ZipFile(copy_path, 'r') as zcopy:
+            if self._directory(zcopy) != expected:
+                raise ValueError("중앙 디렉터리 불일치")
+            for info in zcopy.infolist():
+                if cancel_event is not None and cancel_event.is_set():
+                    raise StagingCancelled()
+                with zcopy.open(info) as f:
+                    while f.read(self.CHUNK_SIZE):
+                        pass
+
+    @staticmethod
+    def _directory(zf: zipfile.ZipFile) -> List[Tuple[str, int, int]]:
+        return [(info.filename, info.CRC, info.file_size) for info in zf.infolist()]
+
+    # ==================== 삭제 정책 ====================
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """복사본 목록 (수정 시각, 크기, 경로), 중단된 .part 파일은 삭제"""
+        entries = []
+        try:
+            with os.scandir(self.staging_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(_PART_EXT):
+                        self._remove(entry.path)
+                    elif entry.is_file():
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[JobStager] 폴더 확인 실패: {e}")
+        return entries
+
+    def _make_room(self, needed: int, keep: str = "") -> bool:
+        """
+        needed 바이트를 복사할 공간 확보 (오래된 복사본부터 삭제)
+
+        Returns:
+            확보 성공 여부
+        """
+        if needed > self.max_bytes:
+            return False
+
+        os.makedirs(self.staging_dir, exist_ok=True)
+        entries = sorted(self._entries())
+        total = sum(size for _mtime, size, _path in entries)
+
+        def fits() -> bool:
+            free = _free_bytes(self.staging_dir)
+            return total + needed <= self.max_bytes and free - needed >= self.min_free_bytes
+
+        removed = 0
+        for _mtime, size, path in entries:
+            if fits():
+                break
+            if path == keep:
+                continue
+            self._remove(path)
+            total -= size
+            removed += 1
+
+        if removed:
+            print(f"[JobStager] 오래된 복사본 {removed}개 삭제 (현재 {total / (1024 * 1024):.1f}MB)")
+        return fits()
+
+    def clear(self):
+        """모든 복사본 삭제"""
+        with self._lock:
+            for _mtime, _size, path in self._entries():
+                self._remove(path)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(size for _mtime, size, _path in self._entries())
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _free_bytes(path: str) -> int:
+    try:
+        st = os.statvfs(path)
+        return st.f_bavail * st.f_frsize
+    except (OSError, AttributeError):
+        return 0
+
+
+class StagingTask(threading.Thread):
+    """
+    백그라운드 복사 스레드 (프린트 워커가 홈/평탄화하는 동안 실행)
+
+    완료 시 done_callback(복사본 경로 또는 None)을 이 스레드에서 호출
+    """
+
+    def __init__(self, stager: JobStager, src_path: str,
+                 progress_callback: Optional[ProgressCallback] = None,
+                 done_callback: Optional[Callable[[Optional[str]], None]] = None):
+        super().__init__(name="JobStager", daemon=True)
+        self.stager = stager
+        self.src_path = src_path
+        self.progress_callback = progress_callback
+        self.done_callback = done_callback
+        self.result: Optional[str] = None
+        self._cancel = threading.Event()
+
+    def run(self):
+        self.result = self.stager.stage(self.src_path, self.progress_callback, self._cancel)
+        if self.done_callback and not self._cancel.is_set():
+            self.done_callback(self.result)
+
+    def cancel(self, timeout: float = 2.0):
+        """복사 중단 후 스레드 종료 대기"""
+        self._cancel.set()
+        if self.is_alive():
+            self.join(timeout)
+
+
+_stager: Optional[JobStager] = None
+_stager_lock = threading.Lock()
+
+
+def get_job_stager() -> JobStager:
+    """JobStager 싱글톤 인스턴스 반환 (크기 제한은 설정값 사용)"""
+    global _stager
+    with _stager_lock:
+        if _stager is None:
+            from controllers.settings_manager import get_settings
+            _stager = JobStager(max_bytes=get_settings().get_staging_mb() * 1024 * 1024)
+        return _stager
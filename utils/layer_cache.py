@@ -0,0 +1,264 @@
+"""
+VERICOM DLP 3D Printer - Layer Cache
+MASK 적용이 끝난 레이어 프레임 디스크 캐시 (data/layer_cache)
+
+같은 작업 ZIP + 같은 MASK로 반복 출력할 때 두 번째부터는
+PNG 디코딩 / MASK 합성 없이 압축된 raw 프레임만 풀어서 바로 표시
+
+키: (작업 내용 해시, MASK 해시, 레이어 인덱스)
+    - 작업 해시: 레이어 항목의 이름/CRC/크기 (ZIP 중앙 디렉터리, 파일 전체를 읽지 않음)
+    - MASK 해시: MASK 파일 내용 + 레이어 해상도
+프레임: 헤더 + zlib(레벨 1) 압축 8비트 버퍼 (검정 영역이 대부분이라 압축률이 높고 풀기 빠름)
+
+전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 프레임부터 한도의 90%까지 삭제 (LRU)
+LRU 시각은 파일 수정 시각으로 관리 (적중 시 os.utime, 별도 인덱스 파일 없음)
+"""
+
+import os
+import zlib
+import struct
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+# 캐시 경로
+LAYER_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "layer_cache")
+
+# MASK 미사용 시 키
+NO_MASK = "nomask"
+
+# 프레임 파일 헤더 (매직, 폭, 높이, 채널 수, 한 줄 바이트 수)
+_FRAME_MAGIC = b"VLF1"
+_FRAME_HEADER = struct.Struct("<4sHHBI")
+_FRAME_EXT = ".frm"
+
+# 채널 수 ↔ PIL 모드
+_MODES = {1: 'L', 3: 'RGB'}
+
+
+@dataclass
+class LayerFrame:
+    """표시 직전 레이어 버퍼"""
+    width: int
+    height: int
+    mode: str       # 'L' 또는 'RGB'
+    stride: int     # 한 줄 바이트 수 (QImage 정렬 포함)
+    data: bytes
+
+    @property
+    def channels(self) -> int:
+        return len(self.mode)
+
+
+def mask_key(mask_path: str, size: Tuple[int, int]) -> str:
+    """
+    MASK 키 (파일 내용 + 레이어 해상도)
+
+    Args:
+        mask_path: MASK 파일 경로 (빈 문자열이면 NO_MASK)
+        size: 레이어 크기 (width, height)
+    """
+    if not mask_path:
+        return NO_MASK
+    digest = hashlib.sha1(f"{size[0]}x{size[1]}".encode())
+    with open(mask_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+class LayerCache:
+    """
+    레이어 프레임 캐시
+
+    프리페치 스레드 / 캐시 워머 스레드에서 동시에 호출 가능
+    """
+
+    def __init__(self, cache_dir: str = LAYER_CACHE_DIR, max_bytes: int = 1024 * 1024 * 1024,
+                 compress_level: int = 1):
+        """
+        Args:
+            cache_dir: 캐시 폴더
+            max_bytes: 전체 최대 크기 (초과 시 LRU 삭제)
+            compress_level: zlib 압축 레벨 (1 = 가장 빠름)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+
+        self._sizes: Dict[str, int] = {}    # 파일명 → 크기
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        self._scan()
+
+    def _scan(self):
+        """캐시 폴더의 프레임 파일 크기 합산"""
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(_FRAME_EXT):
+                        size = entry.stat().st_size
+                        self._sizes[entry.name] = size
+                        self._total_bytes += size
+                    elif entry.name.endswith(".tmp"):
+                        os.remove(entry.path)  # 쓰다가 중단된 파일
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"[LayerCache] 캐시 폴더 확인 실패: {e}")
+            return
+
+        print(f"[LayerCache] {len(self._sizes)}개 프레임, {self._total_bytes / (1024 * 1024):.1f}MB")
+
+    @staticmethod
+    def _name(job_key: str, mask: str, index: int) -> str:
+        return f"{job_key}_{mask}_{index:05d}{_FRAME_EXT}"
+
+    # ==================== 조회 ====================
+
+    def has(self, job_key: str, mask: str, index: int) -> bool:
+        with self._lock:
+            return self._name(job_key, mask, index) in self._sizes
+
+    def missing(self, job_key: str, mask: str, count: int) -> List[int]:
+        """캐시에 없는 레이어 인덱스"""
+        with self._lock:
+            return [i for i in range(count) if self._name(job_key, mask, i) not in self._sizes]
+
+    def get(self, job_key: str, mask: str, index: int) -> Optional[LayerFrame]:
+        """
+        프레임 조회
+
+        Returns:
+            LayerFrame 또는 None (없음 / 손상 시 삭제 후 None)
+        """
+        name = self._name(job_key, mask, index)
+        with self._lock:
+            if name not in self._sizes:
+                return None
+
+        path = os.path.join(self.cache_dir, name)
+        try:
+            with open(path, 'rb') as f:
+                blob = f.read()
+            magic, width, height, channels, stride = _FRAME_HEADER.unpack_from(blob)
+            if magic != _FRAME_MAGIC or channels not in _MODES:
+                raise ValueError("잘못된 프레임 헤더")
+            data = zlib.decompress(blob[_FRAME_HEADER.size:])
+            if len(data) != stride * height:
+                raise ValueError("프레임 크기 불일치")
+            os.utime(path)  # LRU 시각 갱신
+        except (OSError, ValueError, struct.error, zlib.error) as e:
+            print(f"[LayerCache] 프레임 읽기 실패, 삭제: {name} ({e})")
+            self._remove(name)
+            return None
+
+        return LayerFrame(width, height, _MODES[channels], stride, data)
+
+    # ==================== 저장 ====================
+
+    def put(self, job_key: str, mask: str, index: int, frame: LayerFrame) -> bool:
+        """
+        프레임 저장 (임시 파일에 쓴 뒤 교체)
+
+        Returns:
+            저장 성공 여부
+        """
+        name = self._name(job_key, mask, index)
+        blob = (_FRAME_HEADER.pack(_FRAME_MAGIC, frame.width, frame.height, frame.channels, frame.stride)
+                + zlib.compress(frame.data, self.compress_level))
+
+        path = os.path.join(self.cache_dir, name)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[LayerCache] 프레임 저장 실패: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+
+        with self._lock:
+            self._total_bytes += len(blob) - self._sizes.get(name, 0)
+            self._sizes[name] = len(blob)
+            over = self._total_bytes > self.max_bytes
+
+        if over:
+            self._evict()
+        return True
+
+    def _evict(self):
+        """
+        오래된 프레임 삭제 (파일 수정 시각 기준)
+
+        한도를 넘을 때마다 전체 stat을 하지 않도록 한도의 90%까지 줄임
+        """
+        target = int(self.max_bytes * 0.9)
+        with self._lock:
+            names = list(self._sizes.keys())
+
+        entries = []
+        for name in names:
+            try:
+                entries.append((os.stat(os.path.join(self.cache_dir, name)).st_mtime, name))
+            except OSError:
+                entries.append((0.0, name))
+        entries.sort()
+
+        removed = 0
+        for _mtime, name in entries:
+            with self._lock:
+                if self._total_bytes <= target:
+                    break
+            self._remove(name)
+            removed += 1
+
+        if removed:
+            print(f"[LayerCache] LRU 삭제: {removed}개 프레임 "
+                  f"(현재 {self._total_bytes / (1024 * 1024):.1f}MB)")
+
+    def _remove(self, name: str):
+        with self._lock:
+            size = self._sizes.pop(name, None)
+            if size is not None:
+                self._total_bytes -= size
+        try:
+            os.remove(os.path.join(self.cache_dir, name))
+        except OSError:
+            pass
+
+    def clear(self):
+        """모든 프레임 삭제"""
+        with self._lock:
+            names = list(self._sizes.keys())
+        for name in names:
+            self._remove(name)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+
+_cache: Optional[LayerCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_layer_cache() -> LayerCache:
+    """LayerCache 싱글톤 인스턴스 반환 (크기 제한은 설정값 사용)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from controllers.settings_manager import get_settings
+            _cache = LayerCache(max_bytes=get_settings().get_layer_cache_mb() * 1024 * 1024)
+        return _cache
@@ -0,0 +1,322 @@
+"""
+VERICOM DLP 3D Printer - Mask Engine
+레이어 이미지 MASK 합성 (PNG 재인코딩 없는 raw 버퍼 경로)
+
+MASK를 레이어 크기(기본 1920x1080)의 8비트 버퍼로 미리 준비해 두고
+디코딩된 레이어와 곱(multiply) 합성한 뒤 raw 버퍼를 그대로 QImage로 넘김
+
+레이어는 기본적으로 단일 채널('L' / Format_Grayscale8)로 처리하며
+실제 컬러 데이터가 있는 입력만 RGB로 유지
+
+레이어 경계 상자(검정이 아닌 영역)를 알면 그 영역만 합성 (나머지는 곱해도 검정)
+"""
+
+import io
+import os
+from typing import Optional, Tuple, Dict
+
+from PySide6.QtGui import QImage
+
+from .layer_cache import LayerFrame
+
+# PIL for MASK 합성
+try:
+    from PIL import Image, ImageChops
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+    print("[MaskEngine] PIL 없음 - MASK 기능 비활성화")
+
+
+class MaskEngine:
+    """
+    MASK 합성 엔진
+
+    합성 규칙 (기존 Image.composite 방식과 동일):
+        결과 = 레이어 × MASK / 255
+        MASK 흰색(255) → 원본 표시, 검정(0) → 검정
+    """
+
+    # DF10 HDMI 입력 해상도
+    DEFAULT_SIZE = (1920, 1080)
+
+    # PIL 모드 → QImage 포맷
+    QIMAGE_FORMATS = {
+        'L': QImage.Format_Grayscale8,
+        'RGB': QImage.Format_RGB888,
+    }
+
+    # 경계 상자가 프레임의 이 비율보다 작을 때만 잘라서 합성 (크면 전체 곱셈이 더 빠름)
+    CROP_RATIO = 0.5
+
+    # QImage 텍스트 키 (경계 상자를 프레임과 함께 전달)
+    BBOX_TEXT_KEY = "bbox"
+
+    def __init__(self):
+        self.mask_path = ""
+        self._mask: Optional['Image.Image'] = None  # 원본 MASK ('L')
+        self._prepared: Dict[Tuple[Tuple[int, int], str], 'Image.Image'] = {}
+
+    # ==================== MASK 로드 ====================
+
+    def load(self, mask_path: str, size: Tuple[int, int] = DEFAULT_SIZE) -> bool:
+        """
+        MASK 로드 및 레이어 크기 버퍼 준비
+
+        Args:
+            mask_path: MASK 파일 경로 (BMP/PNG)
+            size: 레이어 이미지 크기 (width, height)
+
+        Returns:
+            성공 여부
+        """
+        self.unload()
+
+        if not PIL_AVAILABLE:
+            print("[MaskEngine] PIL 없음 - MASK 로드 불가")
+            return False
+
+        if not mask_path or not os.path.exists(mask_path):
+            print(f"[MaskEngine] MASK 파일 없음: {mask_path}")
+            return False
+
+        try:
+            mask = Image.open(mask_path)
+            # 그레이스케일로 변환 (곱셈 계수로 사용)
+            if mask.mode != 'L':
+                mask = mask.convert('L')
+            mask.load()
+
+            self._mask = mask
+            self.mask_path = mask_path
+
+            # 레이어 크기 8비트 버퍼 미리 준비
+            self._get_mask(tuple(size), 'L')
+            print(f"[MaskEngine] MASK 로드 완료: {mask_path} ({mask.size} → {tuple(size)})")
+            return True
+
+        except Exception as e:
+            print(f"[MaskEngine] MASK 로드 실패: {e}")
+            self.unload()
+            return False
+
+    def unload(self):
+        """MASK 해제"""
+        self._mask = None
+        self._prepared = {}
+        self.mask_path = ""
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._mask is not None
+
+    def _get_mask(self, size: Tuple[int, int], mode: str) -> 'Image.Image':
+        """
+        레이어 크기/모드에 맞춘 MASK 버퍼 (캐시)
+
+        Args:
+            size: 레이어 크기 (width, height)
+            mode: 레이어 PIL 모드 ('L' 또는 'RGB')
+        """
+        key = (size, mode)
+        mask = self._prepared.get(key)
+        if mask is None:
+            mask = self._mask
+            if mask.size != size:
+                mask = mask.resize(size, Image.Resampling.NEAREST)
+            if mode != 'L':
+                mask = Image.merge(mode, [mask] * len(mode))
+            self._prepared[key] = mask
+        return mask
+
+    # ==================== 디코딩 ====================
+
+    @staticmethod
+    def decode(image_data: bytes) -> 'Image.Image':
+        """
+        레이어 PNG 디코딩 ('L' 우선)
+
+        팔레트/RGB/RGBA 이미지라도 세 채널이 모두 같으면 'L'로 변환
+        (1080p 기준 프레임 메모리 약 8MB → 2MB)
+
+        Args:
+            image_data: 레이어 PNG 바이트
+
+        Returns:
+            'L' 또는 'RGB' 모드 PIL 이미지
+        """
+        layer = Image.open(io.BytesIO(image_data))
+
+        if layer.mode in ('1', 'L', 'LA', 'I', 'I;16', 'F'):
+            return layer.convert('L') if layer.mode != 'L' else layer
+
+        if layer.mode != 'RGB':
+            layer = layer.convert('RGB')
+
+        # 회색조 여부 확인 (R == G == B 이면 단일 채널로)
+        r, g, b = layer.split()
+        if (ImageChops.difference(r, g).getbbox() is None
+                and ImageChops.difference(g, b).getbbox() is None):
+            return r
+
+        return layer
+
+    @staticmethod
+    def decode_qimage(image_data: bytes) -> QImage:
+        """
+        PIL 없이 Qt로 디코딩 (회색조면 Format_Grayscale8로 변환)
+
+        Args:
+            image_data: 레이어 PNG 바이트
+
+        Returns:
+            QImage (실패 시 null QImage)
+        """
+        qimage = QImage.fromData(image_data)
+        if (not qimage.isNull()
+                and qimage.format() != QImage.Format_Grayscale8
+                and qimage.isGrayscale()):
+            qimage = qimage.convertToFormat(QImage.Format_Grayscale8)
+        return qimage
+
+    # ==================== 경계 상자 ====================
+
+    @staticmethod
+    def bbox(layer: 'Image.Image') -> Tuple[int, int, int, int]:
+        """
+        레이어 경계 상자 (검정이 아닌 영역)
+
+        Returns:
+            (x0, y0, x1, y1), 완전히 검정이면 (0, 0, 0, 0)
+        """
+        return layer.getbbox() or (0, 0, 0, 0)
+
+    @staticmethod
+    def tag_bbox(qimage: QImage, bbox: Optional[Tuple[int, int, int, int]]):
+        """QImage에 경계 상자 기록 (미리보기에서 해당 영역만 축소)"""
+        if bbox is not None and not qimage.isNull():
+            qimage.setText(MaskEngine.BBOX_TEXT_KEY, ",".join(str(v) for v in bbox))
+
+    @staticmethod
+    def image_bbox(qimage: QImage) -> Optional[Tuple[int, int, int, int]]:
+        """tag_bbox()로 기록한 경계 상자 (없으면 None)"""
+        text = qimage.text(MaskEngine.BBOX_TEXT_KEY)
+        if not text:
+            return None
+        try:
+            x0, y0, x1, y1 = (int(v) for v in text.split(","))
+        except ValueError:
+            return None
+        return x0, y0, x1, y1
+
+    # ==================== 합성 ====================
+
+    def apply(self, layer: 'Image.Image',
+              bbox: Optional[Tuple[int, int, int, int]] = None) -> 'Image.Image':
+        """
+        디코딩된 레이어에 MASK 적용
+
+        Args:
+            layer: 레이어 이미지 (PIL)
+            bbox: 레이어 경계 상자 (None이면 프레임 전체 합성)
+
+        Returns:
+            MASK가 적용된 이미지 ('L' 또는 'RGB')
+        """
+        if layer.mode not in self.QIMAGE_FORMATS:
+            layer = layer.convert('RGB')
+
+        if self._mask is None:
+            return layer
+
+        mask = self._get_mask(layer.size, layer.mode)
+        if bbox is None:
+            return ImageChops.multiply(layer, mask)
+
+        x0, y0, x1, y1 = bbox
+        if x1 <= x0 or y1 <= y0:
+            return layer  # 완전히 검정
+
+        width, height = layer.size
+        if (x1 - x0) * (y1 - y0) >= width * height * self.CROP_RATIO:
+            return ImageChops.multiply(layer, mask)
+
+        # 경계 상자 영역만 곱하고 검정 프레임에 붙여 넣기
+        result = Image.new(layer.mode, layer.size)
+        result.paste(ImageChops.multiply(layer.crop(bbox), mask.crop(bbox)), (x0, y0))
+        return result
+
+    def apply_to_qimage(self, image_data: bytes,
+                        bbox: Optional[Tuple[int, int, int, int]] = None) -> QImage:
+        """
+        PNG 데이터 디코딩 → MASK 적용 → QImage (PNG 재인코딩 없음)
+
+        MASK가 로드되지 않았으면 디코딩만 수행
+        경계 상자를 모르면(None) 디코딩한 레이어에서 계산해 QImage에 기록 (tag_bbox)
+
+        Args:
+            image_data: 레이어 PNG 바이트
+            bbox: 레이어 경계 상자 (LayerArchive.layer_bbox)
+
+        Returns:
+            QImage (Format_Grayscale8 또는 Format_RGB888)
+        """
+        if not PIL_AVAILABLE:
+            return self.decode_qimage(image_data)
+
+        layer = self.decode(image_data)
+        if bbox is None:
+            bbox = self.bbox(layer)
+        qimage = self.to_qimage(self.apply(layer, bbox))
+        self.tag_bbox(qimage, bbox)
+        return qimage
+
+    @staticmethod
+    def to_qimage(image: 'Image.Image') -> QImage:
+        """
+        PIL 이미지 raw 버퍼 → QImage
+
+        Args:
+            image: 'L' 또는 'RGB' 모드 PIL 이미지
+
+        Returns:
+            버퍼를 소유한 QImage (copy)
+        """
+        if image.mode not in MaskEngine.QIMAGE_FORMATS:
+            image = image.convert('RGB')
+
+        width, height = image.size
+        bytes_per_line = width * len(image.mode)
+        data = image.tobytes()
+
+        qimage = QImage(data, width, height, bytes_per_line, MaskEngine.QIMAGE_FORMATS[image.mode])
+        # data 수명과 분리 (QImage가 버퍼를 소유하도록 복사)
+        return qimage.copy()
+
+    # ==================== 레이어 캐시 프레임 ====================
+
+    @staticmethod
+    def frame_from_qimage(qimage: QImage) -> Optional[LayerFrame]:
+        """
+        QImage raw 버퍼 → LayerFrame (레이어 캐시 저장용)
+
+        Returns:
+            LayerFrame (Grayscale8 / RGB888 이외 포맷은 None)
+        """
+        for mode, fmt in MaskEngine.QIMAGE_FORMATS.items():
+            if qimage.format() == fmt:
+                data = bytes(qimage.constBits())[:qimage.sizeInBytes()]
+                return LayerFrame(qimage.width(), qimage.height(), mode, qimage.bytesPerLine(), data)
+        return None
+
+    @staticmethod
+    def frame_to_qimage(frame: LayerFrame) -> QImage:
+        """
+        LayerFrame → QImage (디코딩/MASK 없이 버퍼만 감쌈)
+
+        Returns:
+            버퍼를 소유한 QImage (copy)
+        """
+        qimage = QImage(frame.data, frame.width, frame.height, frame.stride,
+                        MaskEngine.QIMAGE_FORMATS[frame.mode])
+        return qimage.copy()
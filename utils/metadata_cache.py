@@ -0,0 +1,440 @@
+"""
+VERICOM DLP 3D Printer - Metadata Cache
+작업 ZIP 메타데이터 / 썸네일 디스크 캐시 (data/cache)
+
+파일 식별자 (경로, 크기, 수정 시각, 선택: 앞/뒤 블록 해시)가 같으면
+ZIP을 열지 않고 미리 축소해 둔 썸네일(96px / 260px)과 파라미터를 재사용
+→ 두 번째 방문부터 파일당 stat 1회
+
+레이어 분석 결과(JobAnalyzer)도 함께 보관: 요약은 인덱스에, 레이어별 면적은 별도 파일
+
+전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+"""
+
+import io
+import os
+import json
+import time
+import hashlib
+import threading
+from array import array
+from dataclasses import dataclass, field, asdict
+from typing import Optional, Dict, Any, List, Tuple
+
+# PIL for 썸네일 축소
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+# 캐시 경로
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "cache")
+INDEX_FILE = "index.json"
+
+# 미리 만들어 둘 썸네일 크기 (파일 목록 96px, 미리보기 260px)
+THUMBNAIL_SIZES = (96, 260)
+
+
+@dataclass
+class CacheEntry:
+    """캐시 항목"""
+    path: str
+    size: int
+    mtime: float
+    quick_hash: str = ""
+    params: Dict[str, Any] = field(default_factory=dict)  # PrintParameters.to_dict()
+    layer_count: int = 0
+    thumbnails: Dict[str, str] = field(default_factory=dict)  # 크기(str) → 캐시 파일명
+    analysis: Dict[str, Any] = field(default_factory=dict)    # 레이어 분석 요약 (JobAnalysis.summary())
+    analysis_file: str = ""  # 레이어별 면적 파일명 (float32 배열)
+    stored_bytes: int = 0   # 썸네일 / 분석 파일 크기 합계
+    last_used: float = 0.0
+
+    @property
+    def identity(self) -> Tuple[str, int, float]:
+        return (self.path, self.size, self.mtime)
+
+    @property
+    def files(self) -> List[str]:
+        """캐시 폴더에 저장한 파일명"""
+        names = list(self.thumbnails.values())
+        if self.analysis_file:
+            names.append(self.analysis_file)
+        return names
+
+
+class MetadataCache:
+    """
+    작업 파일 메타데이터 / 썸네일 캐시
+
+    get()은 stat 1회로 유효성 확인, put()은 JobInfo에서 썸네일을 축소 저장
+    여러 스레드(GUI, 썸네일 로더)에서 호출 가능
+    """
+
+    # get()의 사용 시각 갱신을 저장하는 최소 간격 (초, 썸네일마다 인덱스를 쓰지 않도록)
+    FLUSH_INTERVAL = 30.0
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = 50 * 1024 * 1024,
+                 quick_hash: bool = False):
+        """
+        Args:
+            cache_dir: 캐시 폴더
+            max_bytes: 썸네일 파일 전체 최대 크기 (초과 시 LRU 삭제)
+            quick_hash: True면 파일 앞/뒤 64KB 해시도 비교 (같은 크기/시각으로 덮어쓴 파일 대비)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.quick_hash = quick_hash
+
+        self._entries: Dict[str, CacheEntry] = {}
+        self._total_bytes = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # 인덱스 파일 쓰기 직렬화 (썸네일 스레드 동시 flush)
+        self._last_flush = time.monotonic()
+
+        self._load_index()
+
+    # ==================== 인덱스 ====================
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:20]
+
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, INDEX_FILE)
+
+    def _load_index(self):
+        """인덱스 로드 (썸네일 파일이 없어진 항목은 제외)"""
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"[MetadataCache] 인덱스 로드 실패, 초기화: {e}")
+            return
+
+        for key, item in data.get('entries', {}).items():
+            try:
+                entry = CacheEntry(**item)
+            except TypeError:
+                continue
+            if all(os.path.exists(os.path.join(self.cache_dir, name)) for name in entry.files):
+                self._entries[key] = entry
+                self._total_bytes += entry.stored_bytes
+
+        print(f"[MetadataCache] {len(self._entries)}개 항목, {self._total_bytes / 1024:.0f}KB")
+
+    def flush(self):
+        """
+        변경된 인덱스 저장 (임시 파일에 쓴 뒤 교체)
+
+        여러 스레드가 동시에 호출해도 한 번에 하나만 쓰고,
+        나중에 만든 스냅샷이 나중에 기록됨
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                data = {'entries': {key: asdict(entry) for key, entry in self._entries.items()}}
+                self._dirty = False
+                self._last_flush = time.monotonic()
+
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = self._index_path() + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self._index_path())
+            except OSError as e:
+                print(f"[MetadataCache] 인덱스 저장 실패: {e}")
+                with self._lock:
+                    self._dirty = True
+
+    # ==================== 조회 ====================
+
+    def _file_hash(self, path: str, size: int) -> str:
+        """파일 앞/뒤 64KB 해시"""
+        block = 64 * 1024
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            digest.update(f.read(block))
+            if size > block:
+                f.seek(max(block, size - block))
+                digest.update(f.read(block))
+        return digest.hexdigest()
+
+    def get(self, path: str) -> Optional[CacheEntry]:
+        """
+        캐시 항목 조회 (파일이 바뀌었으면 None)
+
+        Args:
+            path: 작업 파일 경로
+
+        Returns:
+            CacheEntry 또는 None
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        key = self._key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.identity != (path, stat.st_size, stat.st_mtime):
+                return None
+
+        if self.quick_hash and entry.quick_hash:
+            try:
+                if self._file_hash(path, stat.st_size) != entry.quick_hash:
+                    return None
+            except OSError:
+                return None
+
+        with self._lock:
+            entry.last_used = time.time()
+            self._dirty = True
+            stale = time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL
+        if stale:
+            self.flush()
+        return entry
+
+    def thumbnail_path(self, entry: CacheEntry, size: int) -> str:
+        """캐시된 썸네일 파일 경로 (없으면 빈 문자열)"""
+        name = entry.thumbnails.get(str(size))
+        return os.path.join(self.cache_dir, name) if name else ""
+
+    # ==================== 저장 ====================
+
+    def put(self, path: str, job_info) -> Optional[CacheEntry]:
+        """
+        JobInfo 결과 저장 (썸네일 크기별 축소 PNG + 파라미터)
+
+        Args:
+            path: 작업 파일 경로
+            job_info: controllers.job_info.JobInfo
+
+        Returns:
+            저장된 CacheEntry (검증 실패 파일은 저장하지 않고 None)
+        """
+        if not job_info.is_valid:
+            return None
+
+        key = self._key(path)
+        entry = CacheEntry(
+            path=path,
+            size=job_info.size,
+            mtime=job_info.mtime,
+            params=job_info.params.to_dict(),
+            layer_count=job_info.layer_count,
+            last_used=time.time(),
+        )
+
+        try:
+            if self.quick_hash:
+                entry.quick_hash = self._file_hash(path, job_info.size)
+
+            if job_info.preview:
+                scaled = {size: self._scale_thumbnail(job_info.preview, size) for size in THUMBNAIL_SIZES}
+                stored_bytes = sum(len(data) for data in scaled.values())
+                if stored_bytes > self.max_bytes:
+                    # 넣자마자 LRU로 지워질 항목은 저장하지 않음
+                    print(f"[MetadataCache] 썸네일이 캐시 한도보다 큼, 저장 안 함: {path}")
+                    return None
+
+                os.makedirs(self.cache_dir, exist_ok=True)
+                for size, data in scaled.items():
+                    name = f"{key}_{size}.png"
+                    with open(os.path.join(self.cache_dir, name), 'wb') as f:
+                        f.write(data)
+                    entry.thumbnails[str(size)] = name
+                    entry.stored_bytes += len(data)
+        except OSError as e:
+            print(f"[MetadataCache] 저장 실패: {e}")
+            return None
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous.stored_bytes
+            self._entries[key] = entry
+            self._total_bytes += entry.stored_bytes
+            self._dirty = True
+            evicted = self._evict_locked()
+            if previous is not None and previous.analysis_file:
+                evicted.append(previous.analysis_file)  # 내용이 바뀐 파일의 분석 결과
+
+        self._remove_files(evicted)
+        self.flush()
+        return entry
+
+    def put_analysis(self, path: str, summary: Dict[str, Any], layer_areas: List[float]) -> bool:
+        """
+        레이어 분석 결과 저장 (캐시 항목이 있고 파일이 바뀌지 않았을 때만)
+
+        분석하는 동안 다른 스레드의 put()이 항목을 LRU로 지웠으면 다시 넣은 뒤 저장
+
+        Args:
+            path: 작업 파일 경로
+            summary: JobAnalysis.summary()
+            layer_areas: 레이어별 경화 면적 (mm²)
+
+        Returns:
+            저장 성공 여부
+        """
+        entry = self.get(path)
+        if entry is None:
+            return False
+
+        key = self._key(path)
+        identity = entry.identity
+        name = f"{key}_areas.bin"
+        data = array('f', layer_areas).tobytes()
+
+        for attempt in range(2):
+            with self._lock:
+                # 분석 중 교체/삭제됐을 수 있으므로 잠금 안에서 현재 항목을 다시 가져옴
+                current = self._entries.get(key)
+                if current is not None and current.identity != identity:
+                    print(f"[MetadataCache] 분석 중 파일이 바뀜, 저장 안 함: {path}")
+                    return False
+                previous_bytes = self._file_size(current.analysis_file) \
+                    if current is not None and current.analysis_file else 0
+                if current is not None and current.stored_bytes - previous_bytes + len(data) > self.max_bytes:
+                    print(f"[MetadataCache] 분석 결과가 캐시 한도보다 큼, 저장 안 함: {path}")
+                    return False
+
+            if current is None:
+                # 다른 스레드의 put()이 LRU로 지운 항목 → 썸네일/파라미터부터 다시 저장
+                if attempt > 0 or self._reinsert(path) is None:
+                    print(f"[MetadataCache] 캐시 항목 없음, 분석 결과 저장 안 함: {path}")
+                    return False
+                continue
+
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(os.path.join(self.cache_dir, name), 'wb') as f:
+                    f.write(data)
+            except OSError as e:
+                print(f"[MetadataCache] 분석 결과 저장 실패: {e}")
+                return False
+
+            with self._lock:
+                if self._entries.get(key) is not current:
+                    continue  # 기록하는 사이 다시 교체됨 → 한 번 더 확인
+                current.stored_bytes -= previous_bytes
+                self._total_bytes -= previous_bytes
+                current.analysis = dict(summary)
+                current.analysis_file = name
+                current.stored_bytes += len(data)
+                self._total_bytes += len(data)
+                self._dirty = True
+                evicted = self._evict_locked()
+
+            self._remove_files(evicted)
+            self.flush()
+            return True
+
+        print(f"[MetadataCache] 캐시 항목이 계속 바뀜, 분석 결과 저장 안 함: {path}")
+        return False
+
+    def _reinsert(self, path: str) -> Optional[CacheEntry]:
+        """LRU로 지워진 항목 다시 저장 (JobInfo에서 썸네일/파라미터)"""
+        from controllers.job_info import load_job_info
+        return self.put(path, load_job_info(path))
+
+    def get_analysis(self, path: str) -> Optional[Dict[str, Any]]:
+        """레이어 분석 요약 (없거나 파일이 바뀌었으면 None)"""
+        entry = self.get(path)
+        return dict(entry.analysis) if entry is not None and entry.analysis else None
+
+    def layer_areas(self, path: str) -> Optional[List[float]]:
+        """레이어별 경화 면적 (mm², 없으면 None)"""
+        entry = self.get(path)
+        if entry is None or not entry.analysis_file:
+            return None
+        values = array('f')
+        try:
+            with open(os.path.join(self.cache_dir, entry.analysis_file), 'rb') as f:
+                values.frombytes(f.read())
+        except (OSError, ValueError) as e:
+            print(f"[MetadataCache] 분석 결과 읽기 실패: {e}")
+            return None
+        return values.tolist()
+
+    def _file_size(self, name: str) -> int:
+        try:
+            return os.path.getsize(os.path.join(self.cache_dir, name))
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _scale_thumbnail(data: bytes, size: int) -> bytes:
+        """미리보기 PNG를 size×size 안에 맞게 축소 (PIL 없으면 원본 유지)"""
+        if not PIL_AVAILABLE:
+            return data
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                img.thumbnail((size, size), Image.LANCZOS)
+                output = io.BytesIO()
+                img.save(output, format='PNG', optimize=False)
+                return output.getvalue()
+        except Exception as e:
+            print(f"[MetadataCache] 썸네일 축소 실패, 원본 저장: {e}")
+            return data
+
+    def _evict_locked(self) -> list:
+        """전체 크기 초과분 LRU 제거 (잠금 상태), 지울 파일 목록 반환"""
+        removed = []
+        if self._total_bytes <= self.max_bytes:
+            return removed
+
+        for key, entry in sorted(self._entries.items(), key=lambda item: item[1].last_used):
+            if self._total_bytes <= self.max_bytes:
+                break
+            del self._entries[key]
+            self._total_bytes -= entry.stored_bytes
+            removed.extend(entry.files)
+        return removed
+
+    def _remove_files(self, names: list):
+        for name in names:
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+
+    def remove(self, path: str):
+        """항목 삭제 (파일 삭제 시)"""
+        with self._lock:
+            entry = self._entries.pop(self._key(path), None)
+            if entry is None:
+                return
+            self._total_bytes -= entry.stored_bytes
+            self._dirty = True
+        self._remove_files(entry.files)
+        self.flush()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache: Optional[MetadataCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_metadata_cache() -> MetadataCache:
+    """MetadataCache 싱글톤 인스턴스 반환"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MetadataCache()
+        return _cache
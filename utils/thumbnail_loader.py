@@ -0,0 +1,178 @@
+"""
+VERICOM DLP 3D Printer - Thumbnail Loader
+파일 목록 썸네일 비동기 로드 (QThreadPool)
+
+GUI 스레드에서는 요청/결과 반영만 하고, ZIP 읽기·썸네일 디코딩은 풀 스레드에서 처리
+- 우선순위: 현재 페이지(HIGH) → 다음 페이지 프리페치(LOW)
+- 페이지를 넘기면 아직 시작하지 않은 요청은 취소, 실행 중인 요청은 결과만 버림
+- 결과는 QImage로 전달 (QPixmap 변환은 GUI 스레드에서)
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Qt
+from PySide6.QtGui import QImage
+
+from controllers.job_info import load_job_info
+from .metadata_cache import get_metadata_cache
+
+
+class _ThumbnailTask(QRunnable):
+    """썸네일 1개 로드 작업"""
+
+    def __init__(self, loader: "ThumbnailLoader", path: str, size: int):
+        super().__init__()
+        self.setAutoDelete(False)  # 취소(tryTake) 후에도 파이썬 쪽에서 관리
+        self.loader = loader
+        self.path = path
+        self.size = size
+        self.cancelled = False
+
+    def run(self):
+        if self.cancelled:
+            return
+        image, identity = ThumbnailLoader.load_image(self.path, self.size)
+        if not self.cancelled:
+            self.loader._deliver(self, image, identity)
+
+
+class ThumbnailLoader(QObject):
+    """
+    썸네일 비동기 로더
+
+    시그널:
+        thumbnail_ready(path, QImage, (size, mtime))  - 썸네일 없으면 null QImage
+    """
+
+    thumbnail_ready = Signal(str, QImage, object)
+
+    PRIORITY_VISIBLE = 10   # 현재 페이지
+    PRIORITY_PREFETCH = 0   # 다음 페이지
+
+    def __init__(self, size: int = 96, max_threads: int = 2, memory_items: int = 36, parent=None):
+        """
+        Args:
+            size: 썸네일 크기 (px, 정사각형 안에 맞춤)
+            max_threads: 동시 로드 수 (USB 읽기는 병렬 이득이 작아 2개)
+            memory_items: 메모리에 보관할 최근 썸네일 수 (페이지 왕복 시 즉시 표시)
+            parent: 부모 QObject
+        """
+        super().__init__(parent)
+        self.size = size
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+
+        self._pending: Dict[str, _ThumbnailTask] = {}
+        self._lock = threading.Lock()
+
+        self._memory: "OrderedDict[str, Tuple[QImage, Tuple[int, float]]]" = OrderedDict()
+        self._memory_items = memory_items
+
+    # ==================== 로드 (풀 스레드) ====================
+
+    @staticmethod
+    def load_image(path: str, size: int) -> Tuple[QImage, Optional[Tuple[int, float]]]:
+        """
+        썸네일 QImage 로드 (메타데이터 캐시 → 없으면 ZIP에서 읽어 캐시에 저장)
+
+        Returns:
+            (QImage 또는 null QImage, (크기, 수정 시각) 또는 None)
+        """
+        if os.path.splitext(path)[1].lower() != '.zip':
+            return QImage(), None
+
+        try:
+            cache = get_metadata_cache()
+            entry = cache.get(path)
+            if entry is None:
+                entry = cache.put(path, load_job_info(path))
+            if entry is None:
+                return QImage(), None
+
+            identity = (entry.size, entry.mtime)
+            thumb_path = cache.thumbnail_path(entry, size)
+            if not thumb_path:
+                return QImage(), identity
+
+            image = QImage(thumb_path)
+            if not image.isNull() and (image.width() > size or image.height() > size):
+                # 캐시가 원본을 저장한 경우 (PIL 없음)
+                image = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            return image, identity
+        except Exception as e:
+            print(f"[ThumbnailLoader] 썸네일 로드 오류: {e}")
+            return QImage(), None
+
+    def _deliver(self, task: _ThumbnailTask, image: QImage, identity):
+        """풀 스레드 → 결과 전달 (시그널은 GUI 스레드로 큐잉)"""
+        with self._lock:
+            if self._pending.get(task.path) is task:
+                del self._pending[task.path]
+            if identity is not None:
+                self._memory[task.path] = (image, identity)
+                self._memory.move_to_end(task.path)
+                while len(self._memory) > self._memory_items:
+                    self._memory.popitem(last=False)
+        self.thumbnail_ready.emit(task.path, image, identity)
+
+    # ==================== 요청 / 취소 (GUI 스레드) ====================
+
+    def cached(self, path: str, identity: Tuple[int, float]) -> Optional[QImage]:
+        """메모리에 있는 썸네일 (파일이 바뀌었으면 None)"""
+        with self._lock:
+            item = self._memory.get(path)
+        if item is not None and item[1] == identity:
+            return item[0]
+        return None
+
+    def request(self, path: str, priority: int = PRIORITY_VISIBLE):
+        """
+        썸네일 로드 요청 (이미 대기 중이면 우선순위만 올림)
+
+        Args:
+            path: 파일 경로
+            priority: PRIORITY_VISIBLE / PRIORITY_PREFETCH
+        """
+        with self._lock:
+            task = self._pending.get(path)
+            if task is not None:
+                if priority <= self.PRIORITY_PREFETCH or not self._pool.tryTake(task):
+                    return  # 이미 실행 중이거나 더 올릴 필요 없음
+            else:
+                task = _ThumbnailTask(self, path, self.size)
+                self._pending[path] = task
+        self._pool.start(task, priority)
+
+    def cancel_pending(self, keep: set = None):
+        """
+        대기 중인 요청 취소 (페이지 이동 시)
+
+        Args:
+            keep: 취소하지 않을 경로
+        """
+        with self._lock:
+            for path, task in list(self._pending.items()):
+                if keep and path in keep:
+                    continue
+                task.cancelled = True
+                self._pool.tryTake(task)
+                del self._pending[path]
+
+    def has(self, path: str) -> bool:
+        """메모리에 있거나 로드 대기 중인지 (프리페치 중복 방지)"""
+        with self._lock:
+            return path in self._memory or path in self._pending
+
+    def invalidate(self, path: str):
+        """메모리 썸네일 제거 (파일 삭제 시)"""
+        with self._lock:
+            self._memory.pop(path, None)
+
+    def shutdown(self, timeout_ms: int = 1000):
+        """모든 요청 취소 후 실행 중인 작업 종료 대기"""
+        self.cancel_pending()
+        self._pool.waitForDone(timeout_ms)
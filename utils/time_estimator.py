@@ -0,0 +1,130 @@
+"""
+VERICOM DLP 3D Printer GUI - Print Time Estimator
+레이어 파라미터로 초기 예측 후 실측 레이어 시간으로 계속 보정하는 남은 시간 예측기
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Any
+
+
+class PrintTimeEstimator:
+    """
+    남은 시간 / ETA 예측
+
+    레이어 시간 = 노광 × 노광 비율 + 모션 오버헤드 (바닥/일반 따로)
+
+    - 초기값: 노광 시간, 리프트 높이/속도, 하강 속도, 블레이드 속도로 계산
+    - 보정: 레이어가 끝날 때마다 실측 (레이어 전체 - 노광)을 지수 가중 평균(EWMA)으로 반영
+    - 갱신/조회 모두 O(1)
+    """
+
+    BLADE_STROKE = 125.0    # mm (0 → 125)
+    Z_SPEED = 300           # 레이어 높이 이동 속도 (mm/min)
+    MOVE_OVERHEAD = 0.5     # 이동 1회당 명령/완료 대기 오버헤드 (초)
+    HOMING_TIME = 20.0      # Z/X 홈 (초)
+    ALPHA = 0.2             # EWMA 가중치 (새 측정값 비중)
+
+    def __init__(self, params: Dict[str, Any], blade_speed: int = 1500, leveling_cycles: int = 0):
+        """
+        Args:
+            params: 프린트 파라미터 dict (PrintParameters 필드명)
+            blade_speed: 블레이드 속도 (mm/min)
+            leveling_cycles: 레진 평탄화 횟수
+        """
+        self.total_layers = int(params.get('totalLayer', 0))
+        self.bottom_layers = min(int(params.get('bottomLayerCount', 0)), self.total_layers)
+        self.bottom_exposure = float(params.get('bottomLayerExposureTime', 0.0))
+        self.normal_exposure = float(params.get('normalExposureTime', 0.0))
+
+        layer_height = float(params.get('layerHeight', 0.05))
+        drop_speed = float(params.get('normalDropSpeed', 150)) or 150
+
+        # 모션 오버헤드 초기값 (바닥/일반)
+        self._overhead = {
+            True: self._seed_overhead(
+                float(params.get('bottomLayerLiftHeight', 5.0)),
+                float(params.get('bottomLayerLiftSpeed', 65)) or 65,
+                drop_speed, layer_height, blade_speed),
+            False: self._seed_overhead(
+                float(params.get('normalLayerLiftHeight', 5.0)),
+                float(params.get('normalLayerLiftSpeed', 65)) or 65,
+                drop_speed, layer_height, blade_speed),
+        }
+
+        # 실제 노광 / 목표 노광 비율 (LED 명령 지연 등)
+        self._exposure_ratio = 1.0
+
+        # 시작 준비 (홈 + 평탄화)
+        blade_time = self.BLADE_STROKE / (blade_speed / 60.0) if blade_speed > 0 else 5.0
+        self.setup_time = self.HOMING_TIME + leveling_cycles * (2 * (blade_time + self.MOVE_OVERHEAD)) \
+            + (self.HOMING_TIME / 2 if leveling_cycles > 0 else 0)
+
+        self._completed = 0  # 완료된 레이어 수
+
+    def _seed_overhead(self, lift_height: float, lift_speed: float, drop_speed: float,
+                       layer_height: float, blade_speed: float) -> float:
+        """레이어당 모션 시간 초기값 (초)"""
+        blade_time = self.BLADE_STROKE / (blade_speed / 60.0) if blade_speed > 0 else 5.0
+        z_time = layer_height / (self.Z_SPEED / 60.0)
+        lift_time = lift_height / (lift_speed / 60.0)
+        drop_time = max(0.0, lift_height - layer_height) / (drop_speed / 60.0)
+
+        moves = 5  # Z, X, 리프트, X 복귀, 하강
+        return z_time + 2 * blade_time + lift_time + drop_time + moves * self.MOVE_OVERHEAD
+
+    # ==================== 보정 ====================
+
+    def update(self, layer_idx: int, layer_seconds: float, exposure_seconds: float):
+        """
+        레이어 실측값 반영
+
+        Args:
+            layer_idx: 완료된 레이어 인덱스
+            layer_seconds: 레이어 전체 소요 시간 (초)
+            exposure_seconds: 실제 노광 시간 (초)
+        """
+        is_bottom = layer_idx < self.bottom_layers
+        target = self.bottom_exposure if is_bottom else self.normal_exposure
+
+        overhead = max(0.0, layer_seconds - exposure_seconds)
+        self._overhead[is_bottom] += self.ALPHA * (overhead - self._overhead[is_bottom])
+
+        if target > 0 and exposure_seconds > 0:
+            self._exposure_ratio += self.ALPHA * (exposure_seconds / target - self._exposure_ratio)
+
+        self._completed = max(self._completed, layer_idx + 1)
+
+    # ==================== 조회 ====================
+
+    def layer_time(self, is_bottom: bool) -> float:
+        """현재 모델의 레이어 1개 시간 (초)"""
+        exposure = self.bottom_exposure if is_bottom else self.normal_exposure
+        return exposure * self._exposure_ratio + self._overhead[is_bottom]
+
+    def remaining(self, completed: int = None) -> float:
+        """
+        남은 시간 (초)
+
+        Args:
+            completed: 완료된 레이어 수 (None이면 update()로 받은 값)
+        """
+        done = self._completed if completed is None else completed
+        done = max(0, min(done, self.total_layers))
+
+        bottom_left = max(0, self.bottom_layers - done)
+        normal_left = self.total_layers - max(done, self.bottom_layers)
+
+        total = bottom_left * self.layer_time(True) + normal_left * self.layer_time(False)
+        if done == 0:
+            total += self.setup_time
+        return total
+
+    def total(self) -> float:
+        """전체 예상 시간 (초, 시작 준비 포함)"""
+        return self.remaining(0)
+
+    def eta(self, remaining: float = None) -> datetime:
+        """예상 완료 시각"""
+        if remaining is None:
+            remaining = self.remaining()
+        return datetime.now() + timedelta(seconds=remaining)
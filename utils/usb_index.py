@@ -0,0 +1,264 @@
+"""
+VERICOM DLP 3D Printer - USB File Index
+USB 장치 폴더 트리의 작업 파일 증분 인덱스
+
+- 하위 폴더까지 재귀 탐색 (최대 깊이 설정)
+- 폴더 수정 시각(mtime)이 바뀐 폴더만 다시 나열, 나머지는 폴더당 stat 1회
+- 이미 아는 파일은 다시 stat 하지 않음 (크기/수정 시각을 기록해 두고 정렬에 사용)
+  단, inotify가 없는 폴링 모드는 restat=True로 모든 폴더를 나열해 덮어쓴 파일을 찾음
+- inotify가 알려준 폴더만 다시 나열하는 refresh(dirs) 지원
+
+FAT 계열 파일시스템은 시각 해상도가 2초라서, 나열 직후 2초 이내에 바뀐 폴더는
+mtime이 같아 보일 수 있음 → 나열 시점과 mtime이 가까운 폴더는 다음 번에 다시 나열
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# 정렬 기준
+SORT_NAME = "name"
+SORT_DATE = "date"
+SORT_SIZE = "size"
+SORT_KEYS = (SORT_NAME, SORT_DATE, SORT_SIZE)
+
+
+@dataclass
+class FileRecord:
+    """인덱스의 파일 항목"""
+    path: str
+    size: int
+    mtime: float
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+
+@dataclass
+class _DirState:
+    """나열한 폴더 상태"""
+    mtime_ns: int
+    listed_at: float
+    depth: int
+    files: List[str] = field(default_factory=list)
+    subdirs: List[str] = field(default_factory=list)
+
+
+def sort_records(records: Iterable[FileRecord], sort_key: str = SORT_NAME,
+                 descending: bool = False) -> List[FileRecord]:
+    """
+    파일 항목 정렬 (기록된 크기/시각 사용, stat 없음)
+
+    Args:
+        records: FileRecord 목록
+        sort_key: SORT_NAME / SORT_DATE / SORT_SIZE
+        descending: 내림차순 여부
+
+    Returns:
+        정렬된 FileRecord 리스트 (같은 값이면 경로순)
+    """
+    if sort_key == SORT_DATE:
+        key = lambda r: (r.mtime, r.path)
+    elif sort_key == SORT_SIZE:
+        key = lambda r: (r.size, r.path)
+    else:
+        key = lambda r: (r.name.lower(), r.path)
+    return sorted(records, key=key, reverse=descending)
+
+
+class DirectoryIndex:
+    """
+    장치 폴더 하나의 증분 파일 인덱스
+
+    refresh() 결과로 추가/제거된 파일 경로를 돌려주므로
+    호출자는 전체 목록 비교 없이 변경분만 전달할 수 있음
+    """
+
+    # 탐색하지 않는 폴더 (OS가 만드는 시스템 폴더, 숨김 폴더는 별도로 제외)
+    SKIP_DIRS = {"System Volume Information", "$RECYCLE.BIN", "LOST.DIR", "lost+found"}
+
+    # FAT 시각 해상도 (초)
+    RACY_SECONDS = 2.0
+
+    def __init__(self, root: str, extensions: Tuple[str, ...], max_depth: int = 4):
+        """
+        Args:
+            root: 장치 폴더 경로
+            extensions: 지원 파일 확장자 (소문자, 예: ('.zip',))
+            max_depth: 하위 폴더 탐색 깊이 (0 = 장치 폴더 바로 아래만)
+        """
+        self.root = root
+        self.extensions = extensions
+        self.max_depth = max(0, max_depth)
+
+        self._dirs: Dict[str, _DirState] = {}
+        self._files: Dict[str, FileRecord] = {}
+        self._restat = False
+
+    # ==================== 조회 ====================
+
+    @property
+    def directories(self) -> List[str]:
+        """인덱스에 포함된 폴더 (inotify 감시 대상)"""
+        return list(self._dirs.keys())
+
+    def paths(self) -> List[str]:
+        """파일 경로 (경로순 정렬)"""
+        return sorted(self._files.keys())
+
+    def records(self) -> List[FileRecord]:
+        return list(self._files.values())
+
+    def get(self, path: str) -> Optional[FileRecord]:
+        return self._files.get(path)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    # ==================== 갱신 ====================
+
+    def refresh(self, dirs: Optional[Iterable[str]] = None, force: bool = False,
+                restat: bool = False) -> Tuple[List[str], List[str]]:
+        """
+        인덱스 갱신
+
+        Args:
+            dirs: 다시 나열할 폴더 (inotify 이벤트), None이면 전체 트리를 mtime 비교로 확인
+            force: True면 mtime과 관계없이 모든 폴더 다시 나열 (다시 마운트된 경우)
+            restat: True면 모든 폴더를 다시 나열하고 이미 아는 파일도 크기/수정 시각 비교
+                    (덮어쓰기는 폴더 mtime을 바꾸지 않으므로 inotify가 없을 때 사용)
+
+        Returns:
+            (추가되거나 내용이 바뀐 파일 경로, 제거된 파일 경로)
+        """
+        added, removed = [], []
+        self._restat = restat
+
+        if dirs is None:
+            self._visit(self.root, 0, added, removed, force=force or restat, recursive=True)
+        else:
+            # 상위 폴더부터 처리 (상위에서 지운 폴더는 다시 나열하지 않음)
+            for path in sorted(set(dirs), key=len):
+                state = self._dirs.get(path)
+                if state is not None:
+                    self._visit(path, state.depth, added, removed, force=True, recursive=False)
+
+        return added, removed
+
+    def update_file(self, path: str) -> bool:
+        """
+        파일 하나의 크기/수정 시각 갱신 (같은 경로 덮어쓰기)
+
+        Returns:
+            인덱스에 있는 파일이면 True
+        """
+        record = self._files.get(path)
+        if record is None:
+            return False
+        try:
+            info = os.stat(path)
+        except OSError:
+            return False
+        record.size = info.st_size
+        record.mtime = info.st_mtime
+        return True
+
+    def _visit(self, path: str, depth: int, added: list, removed: list,
+               force: bool, recursive: bool):
+        """
+        폴더 확인 → 바뀌었으면 다시 나열
+
+        recursive=False면 새로 생긴 하위 폴더만 따라 내려감 (inotify 이벤트 처리)
+        """
+        try:
+            info = os.stat(path)
+        except OSError:
+            self._drop(path, removed)
+            return
+
+        state = self._dirs.get(path)
+        if state is not None and not force and not self._is_racy(state, info):
+            new_subdirs = []
+        else:
+            state, new_subdirs = self._list(path, depth, info, state, added, removed)
+            if state is None:
+                return
+
+        for sub in (state.subdirs if recursive else new_subdirs):
+            self._visit(sub, depth + 1, added, removed, force=force, recursive=True)
+
+    def _is_racy(self, state: _DirState, info: os.stat_result) -> bool:
+        """mtime이 바뀌었거나, 나열 시점과 너무 가까워 믿을 수 없으면 True"""
+        if state.mtime_ns != info.st_mtime_ns:
+            return True
+        return state.listed_at - info.st_mtime < self.RACY_SECONDS
+
+    def _list(self, path: str, depth: int, info: os.stat_result, old: Optional[_DirState],
+              added: list, removed: list):
+        """폴더 나열 → 파일/하위 폴더 변경분 반영"""
+        listed_at = time.time()
+        files, subdirs = [], []
+
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    name = entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if (depth < self.max_depth and not name.startswith('.')
+                                    and name not in self.SKIP_DIRS):
+                                subdirs.append(entry.path)
+                        elif name.lower().endswith(self.extensions) and entry.is_file():
+                            files.append(entry.path)
+                            record = self._files.get(entry.path)
+                            if record is None:
+                                # 새 파일만 stat (이미 아는 파일은 기록 재사용)
+                                st = entry.stat()
+                                self._files[entry.path] = FileRecord(entry.path, st.st_size, st.st_mtime)
+                                added.append(entry.path)
+                            elif self._restat:
+                                # 폴링 모드: 덮어쓴 파일은 기록 갱신 후 변경으로 전달
+                                st = entry.stat()
+                                if (st.st_size, st.st_mtime) != (record.size, record.mtime):
+                                    record.size = st.st_size
+                                    record.mtime = st.st_mtime
+                                    added.append(entry.path)
+                    except OSError:
+                        continue
+        except PermissionError:
+            pass
+        except OSError as e:
+            print(f"[USB] 폴더 나열 오류: {path} ({e})")
+            self._drop(path, removed)
+            return None, []
+
+        if old is not None:
+            current = set(files)
+            for gone in old.files:
+                if gone not in current and self._files.pop(gone, None) is not None:
+                    removed.append(gone)
+            current_dirs = set(subdirs)
+            for gone in old.subdirs:
+                if gone not in current_dirs:
+                    self._drop(gone, removed)
+
+        known = set(old.subdirs) if old is not None else set()
+        new_subdirs = [sub for sub in subdirs if sub not in known or sub not in self._dirs]
+
+        state = _DirState(info.st_mtime_ns, listed_at, depth, files, subdirs)
+        self._dirs[path] = state
+        return state, new_subdirs
+
+    def _drop(self, path: str, removed: list):
+        """폴더와 그 아래 항목 제거"""
+        state = self._dirs.pop(path, None)
+        if state is None:
+            return
+        for file_path in state.files:
+            if self._files.pop(file_path, None) is not None:
+                removed.append(file_path)
+        for sub in state.subdirs:
+            self._drop(sub, removed)
@@ -1,14 +1,28 @@
 """
 VERICOM DLP 3D Printer - USB Monitor
 USB 장치 감지 및 파일 스캔
+
+inotify(/media, 사용자 폴더, 장치 폴더) + 마운트 테이블(/proc/self/mounts) 변경 알림으로
+이벤트가 있을 때만 해당 폴더를 다시 스캔 (대기 중 CPU 사용 없음)
+inotify를 쓸 수 없는 환경(Windows 개발 등)에서는 기존 주기 폴링으로 동작
+
+장치마다 DirectoryIndex로 하위 폴더까지 탐색 (깊이 설정 가능),
+바뀐 폴더만 다시 나열하고 파일 목록 변경은 files_added / files_removed로 증분 전달
 """
 
 import os
+import stat
 import time
-from typing import List, Optional, Callable
+from typing import List, Optional, Callable, Dict, Set
 from dataclasses import dataclass
 
-from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtCore import QObject, QTimer, Signal, QSocketNotifier
+
+from .inotify import (
+    create_inotify, IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE,
+    IN_DELETE_SELF, IN_MOVE_SELF, IN_UNMOUNT, IN_ONLYDIR
+)
+from .usb_index import DirectoryIndex, FileRecord, SORT_NAME, sort_records
 
 
 @dataclass
@@ -23,7 +37,8 @@ class USBMonitor(QObject):
     """
     USB 장치 모니터링 클래스
 
-    /media 디렉토리를 폴링하여 USB 장치 감지
+    /media/{user}/{device} 구조의 USB 장치 감지 (inotify, 없으면 폴링)
+    장치 폴더 아래 scan_depth 단계의 하위 폴더까지 작업 파일 탐색
     지원 파일 형식: .zip, .dlp, .photon, .ctb
     """
 
@@ -31,41 +46,90 @@ class USBMonitor(QObject):
     devices_changed = Signal(list)  # List[USBDevice]
     device_connected = Signal(str)  # device path
     device_disconnected = Signal(str)  # device path
+    files_added = Signal(list)  # 추가(또는 덮어쓴) 파일 경로 (정렬됨)
+    files_removed = Signal(list)  # 제거된 파일 경로
 
     # 지원 파일 확장자
     SUPPORTED_EXTENSIONS = ('.zip', '.dlp', '.photon', '.ctb')
 
     # Linux USB 마운트 경로
     MEDIA_PATH = "/media"
+    MOUNTS_PATH = "/proc/self/mounts"
+
+    # inotify 감시 마스크
+    DIR_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+    DEVICE_MASK = (IN_CLOSE_WRITE | IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+                   | IN_DELETE_SELF | IN_MOVE_SELF | IN_UNMOUNT | IN_ONLYDIR)
+
+    # 이벤트 묶음 처리 지연 (파일 복사 중 연속 이벤트를 한 번에 처리)
+    DEBOUNCE_MS = 300
 
-    def __init__(self, poll_interval: int = 2000, parent=None):
+    # 기본 하위 폴더 탐색 깊이 (0 = 장치 폴더 바로 아래만)
+    DEFAULT_SCAN_DEPTH = 4
+
+    def __init__(self, poll_interval: int = 2000, use_inotify: bool = True,
+                 scan_depth: int = DEFAULT_SCAN_DEPTH, parent=None):
         """
         Args:
-            poll_interval: 폴링 간격 (밀리초)
+            poll_interval: 폴링 간격 (밀리초, inotify를 쓸 수 없을 때만 사용)
+            use_inotify: False면 항상 폴링
+            scan_depth: 하위 폴더 탐색 깊이
             parent: 부모 QObject
         """
         super().__init__(parent)
 
         self._poll_interval = poll_interval
+        self._use_inotify = use_inotify
+        self._scan_depth = scan_depth
         self._timer = QTimer(self)
         self._timer.timeout.connect(self._poll)
 
-        self._current_devices: dict = {}  # path -> USBDevice
+        # 이벤트 묶음 처리
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(self.DEBOUNCE_MS)
+        self._debounce_timer.timeout.connect(self._process_pending)
+
+        # inotify / 마운트 테이블 알림
+        self._inotify = None
+        self._inotify_notifier: Optional[QSocketNotifier] = None
+        self._mounts_fd = -1
+        self._mounts_notifier: Optional[QSocketNotifier] = None
+
+        self._indexes: Dict[str, DirectoryIndex] = {}  # 장치 경로 → 파일 인덱스 (파일 없는 장치 포함)
+        self._device_ids: Dict[str, int] = {}  # 장치 경로 → st_dev (다시 마운트되면 변경)
+        self._watch_owner: Dict[str, str] = {}  # 감시 중인 장치 내 폴더 → 장치 경로
+        self._current_devices: dict = {}  # path -> USBDevice (지원 파일이 있는 장치)
+
+        self._dirty_dirs: Set[str] = set()
+        self._touched_files: Set[str] = set()  # 다시 쓰여진 파일 (같은 경로 덮어쓰기)
+        self._resync_pending = False
+        self._full_rescan_pending = False
 
         # Windows 테스트용 경로
         self._test_paths = []
 
     def start(self):
         """모니터링 시작"""
-        self._timer.start(self._poll_interval)
+        if self._use_inotify and self._start_inotify():
+            print("[USB] 모니터링 시작 (inotify)")
+        else:
+            self._timer.start(self._poll_interval)
+            print(f"[USB] 모니터링 시작 (폴링 간격: {self._poll_interval}ms)")
         self._poll()  # 즉시 한 번 실행
-        print(f"[USB] 모니터링 시작 (간격: {self._poll_interval}ms)")
 
     def stop(self):
         """모니터링 중지"""
         self._timer.stop()
+        self._debounce_timer.stop()
+        self._stop_inotify()
         print("[USB] 모니터링 중지")
 
+    @property
+    def is_event_driven(self) -> bool:
+        """inotify로 동작 중인지"""
+        return self._inotify is not None
+
     def add_test_path(self, path: str):
         """테스트용 경로 추가 (Windows 개발용)"""
         if os.path.exists(path):
@@ -76,125 +140,297 @@ class USBMonitor(QObject):
         return list(self._current_devices.values())
 
     def get_all_files(self) -> List[str]:
-        """모든 장치의 파일 목록"""
+        """모든 장치의 파일 목록 (경로순 정렬)"""
         files = []
         for device in self._current_devices.values():
             files.extend(device.files)
+        files.sort()
         return files
 
-    def _poll(self):
-        """USB 장치 폴링"""
-        new_devices = self._scan_devices()
+    def get_file_records(self) -> List[FileRecord]:
+        """모든 장치의 파일 항목 (크기/수정 시각 포함, stat 없음)"""
+        records = []
+        for index in self._indexes.values():
+            records.extend(index.records())
+        return records
 
-        # 변경 감지
-        new_paths = set(new_devices.keys())
-        old_paths = set(self._current_devices.keys())
+    def get_sorted_files(self, sort_key: str = SORT_NAME, descending: bool = False) -> List[str]:
+        """
+        정렬된 파일 목록 (인덱스에 기록된 값으로 정렬, 파일을 다시 stat 하지 않음)
 
-        # 연결된 장치
-        for path in new_paths - old_paths:
-            print(f"[USB] 장치 연결됨: {path}")
-            self.device_connected.emit(path)
+        Args:
+            sort_key: "name" / "date" / "size"
+            descending: 내림차순 여부
+        """
+        return [record.path for record in sort_records(self.get_file_records(), sort_key, descending)]
 
-        # 해제된 장치
-        for path in old_paths - new_paths:
-            print(f"[USB] 장치 해제됨: {path}")
-            self.device_disconnected.emit(path)
+    # ==================== inotify ====================
 
-        # 업데이트
-        if new_devices != self._current_devices:
-            self._current_devices = new_devices
-            self.devices_changed.emit(list(new_devices.values()))
+    def _start_inotify(self) -> bool:
+        """inotify + 마운트 테이블 알림 설정 (실패 시 False → 폴링)"""
+        self._inotify = create_inotify()
+        if self._inotify is None:
+            return False
 
-    def _scan_devices(self) -> dict:
-        """USB 장치 스캔"""
-        devices = {}
+        self._inotify_notifier = QSocketNotifier(self._inotify.fd, QSocketNotifier.Read, self)
+        self._inotify_notifier.activated.connect(self._on_inotify_ready)
 
-        # Linux /media 스캔
-        if os.path.exists(self.MEDIA_PATH):
-            devices.update(self._scan_media_path())
+        # 마운트/언마운트는 폴더 이벤트 없이 일어날 수 있으므로 마운트 테이블도 감시
+        try:
+            self._mounts_fd = os.open(self.MOUNTS_PATH, os.O_RDONLY | os.O_CLOEXEC)
+            self._drain_mounts()
+            self._mounts_notifier = QSocketNotifier(self._mounts_fd, QSocketNotifier.Exception, self)
+            self._mounts_notifier.activated.connect(self._on_mounts_changed)
+        except OSError as e:
+            print(f"[USB] 마운트 테이블 감시 불가: {e}")
+            self._mounts_fd = -1
+
+        return True
+
+    def _stop_inotify(self):
+        for notifier in (self._inotify_notifier, self._mounts_notifier):
+            if notifier is not None:
+                notifier.setEnabled(False)
+                notifier.deleteLater()
+        self._inotify_notifier = None
+        self._mounts_notifier = None
+
+        if self._mounts_fd >= 0:
+            os.close(self._mounts_fd)
+            self._mounts_fd = -1
+
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _drain_mounts(self):
+        """마운트 테이블 끝까지 읽기 (다음 변경 알림을 다시 받기 위해 필요)"""
+        os.lseek(self._mounts_fd, 0, os.SEEK_SET)
+        while os.read(self._mounts_fd, 65536):
+            pass
 
-        # 테스트 경로 스캔
-        for path in self._test_paths:
-            if os.path.exists(path):
-                files = self._scan_files(path)
-                if files:
-                    devices[path] = USBDevice(
-                        path=path,
-                        name=os.path.basename(path),
-                        files=files
-                    )
+    def _on_mounts_changed(self):
+        try:
+            self._drain_mounts()
+        except OSError:
+            pass
+        self._resync_pending = True
+        self._debounce_timer.start()
+
+    def _on_inotify_ready(self):
+        for event in self._inotify.read_events():
+            if not event.path:
+                # 이벤트 큐 넘침 → 전체 재스캔
+                self._full_rescan_pending = True
+            elif event.path in self._watch_owner:
+                root = self._watch_owner[event.path]
+                if event.mask & IN_UNMOUNT or (
+                        event.path == root and event.mask & (IN_DELETE_SELF | IN_MOVE_SELF)):
+                    self._resync_pending = True
+                elif event.mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    # 하위 폴더 삭제/이동: 상위 폴더 이벤트로 목록에서 빠지고,
+                    # 같은 이름으로 다시 만들어졌으면 다시 나열되도록 표시
+                    self._dirty_dirs.add(event.path)
+                else:
+                    self._dirty_dirs.add(event.path)
+                    if not event.is_dir and event.mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                        self._touched_files.add(os.path.join(event.path, event.name))
+            else:
+                # /media 또는 사용자 폴더 변경 → 장치 목록 다시 확인
+                self._resync_pending = True
+        self._debounce_timer.start()
+
+    def _process_pending(self):
+        """묶인 이벤트 처리"""
+        added, removed = [], []
+
+        if self._full_rescan_pending:
+            self._sync_devices(added, removed, rescan_all=True)
+        elif self._resync_pending:
+            self._sync_devices(added, removed)
+
+        # 바뀐 폴더만 장치별로 다시 나열
+        dirty_by_device: Dict[str, List[str]] = {}
+        for path in self._dirty_dirs:
+            root = self._watch_owner.get(path)
+            if root is not None and root in self._indexes:
+                dirty_by_device.setdefault(root, []).append(path)
+        for root, dirs in dirty_by_device.items():
+            self._rescan_device(root, added, removed, dirs=dirs)
+
+        # 덮어쓴 파일은 목록에 계속 있어도 변경으로 전달 (크기/시각 갱신)
+        for path in self._touched_files:
+            index = self._indexes.get(self._watch_owner.get(os.path.dirname(path), ""))
+            if index is not None and index.update_file(path) and path not in added:
+                added.append(path)
+
+        self._full_rescan_pending = False
+        self._resync_pending = False
+        self._dirty_dirs.clear()
+        self._touched_files.clear()
+        self._emit_changes(added, removed)
+
+    # ==================== 스캔 ====================
 
-        return devices
+    def _poll(self):
+        """USB 장치 폴링 (시작 시 1회 + inotify가 없을 때 주기적으로)"""
+        added, removed = [], []
+        self._sync_devices(added, removed, rescan_all=True)
+        self._emit_changes(added, removed)
 
-    def _scan_media_path(self) -> dict:
+    def _sync_devices(self, added: list, removed: list, rescan_all: bool = False):
         """
-        /media 경로 스캔
+        장치 폴더 목록 동기화
 
-        구조: /media/{user}/{device}/
+        새 장치 / 다시 마운트된 장치(st_dev 변경)는 감시 추가 후 스캔,
+        사라진 장치는 파일 제거 처리
         """
-        devices = {}
-
-        try:
-            # /media 내 사용자 폴더
-            for user in os.listdir(self.MEDIA_PATH):
-                user_path = os.path.join(self.MEDIA_PATH, user)
-
-                if not os.path.isdir(user_path):
-                    continue
+        found = self._list_device_paths()
+
+        for path in list(self._indexes.keys()):
+            if path not in found:
+                self._unwatch_device(path)
+                removed.extend(self._indexes.pop(path).paths())
+                self._device_ids.pop(path, None)
+
+        for path, device_id in found.items():
+            remounted = self._device_ids.get(path) != device_id
+            if remounted:
+                # 마운트 전 폴더에 걸린 감시는 의미가 없으므로 다시 추가
+                self._unwatch_device(path)
+            self._device_ids[path] = device_id
+            if path not in self._indexes:
+                self._indexes[path] = self._new_index(path)
+                self._rescan_device(path, added, removed)
+            elif remounted:
+                self._rescan_device(path, added, removed, force=True)
+            elif rescan_all:
+                self._rescan_device(path, added, removed)
+
+    def _list_device_paths(self) -> Dict[str, int]:
+        """
+        장치 폴더 경로 → st_dev
 
-                # 사용자 폴더 내 장치 폴더
-                for device in os.listdir(user_path):
-                    device_path = os.path.join(user_path, device)
+        구조: /media/{user}/{device}/ (+ 테스트 경로)
+        /media와 사용자 폴더에는 inotify 감시 추가
+        """
+        devices = {}
 
-                    if not os.path.isdir(device_path):
+        if os.path.isdir(self.MEDIA_PATH):
+            self._watch_dir(self.MEDIA_PATH)
+            try:
+                # /media 내 사용자 폴더
+                for user in os.listdir(self.MEDIA_PATH):
+                    user_path = os.path.join(self.MEDIA_PATH, user)
+                    if not os.path.isdir(user_path):
+                        continue
+                    self._watch_dir(user_path)
+
+                    # 사용자 폴더 내 장치 폴더
+                    try:
+                        for device in os.listdir(user_path):
+                            device_path = os.path.join(user_path, device)
+                            try:
+                                info = os.stat(device_path)
+                            except OSError:
+                                continue
+                            if stat.S_ISDIR(info.st_mode):
+                                devices[device_path] = info.st_dev
+                    except PermissionError:
                         continue
 
-                    # 파일 스캔
-                    files = self._scan_files(device_path)
-
-                    if files:
-                        devices[device_path] = USBDevice(
-                            path=device_path,
-                            name=device,
-                            files=files
-                        )
+            except PermissionError:
+                print("[USB] /media 접근 권한 없음")
+            except Exception as e:
+                print(f"[USB] 스캔 오류: {e}")
 
-        except PermissionError:
-            print("[USB] /media 접근 권한 없음")
-        except Exception as e:
-            print(f"[USB] 스캔 오류: {e}")
+        # 테스트 경로
+        for path in self._test_paths:
+            try:
+                devices[path] = os.stat(path).st_dev
+            except OSError:
+                continue
 
         return devices
 
-    def _scan_files(self, directory: str) -> List[str]:
-        """
-        디렉토리 내 지원 파일 스캔
+    def _watch_dir(self, path: str):
+        if self._inotify is not None and not self._inotify.is_watching(path):
+            self._inotify.add_watch(path, self.DIR_MASK)
 
-        Args:
-            directory: 스캔할 디렉토리 경로
+    def _new_index(self, path: str) -> DirectoryIndex:
+        return DirectoryIndex(path, self.SUPPORTED_EXTENSIONS, self._scan_depth)
 
-        Returns:
-            파일 경로 리스트
+    def _rescan_device(self, path: str, added: list, removed: list,
+                       dirs: Optional[List[str]] = None, force: bool = False):
         """
-        files = []
+        장치 인덱스 갱신 (dirs가 있으면 해당 폴더만 다시 나열) 후 폴더 감시 동기화
 
-        try:
-            for entry in os.listdir(directory):
-                entry_path = os.path.join(directory, entry)
+        inotify 없이 폴링할 때는 덮어쓴 파일도 찾도록 아는 파일까지 다시 비교 (restat)
+        """
+        index = self._indexes[path]
+        new_files, gone_files = index.refresh(dirs, force=force, restat=self._inotify is None)
+        added.extend(new_files)
+        removed.extend(gone_files)
+        self._sync_watches(path)
+
+    def _sync_watches(self, root: str):
+        """인덱스의 폴더 목록에 맞춰 inotify 감시 추가/제거"""
+        if self._inotify is None:
+            return
+
+        wanted = set(self._indexes[root].directories)
+        current = set()
+        for path, owner in list(self._watch_owner.items()):
+            if owner != root:
+                continue
+            if self._inotify.is_watching(path):
+                current.add(path)
+            else:
+                del self._watch_owner[path]  # 폴더 삭제로 자동 해제된 감시
+
+        for path in current - wanted:
+            self._inotify.remove_watch(path)
+            del self._watch_owner[path]
+        for path in wanted - current:
+            if self._inotify.add_watch(path, self.DEVICE_MASK):
+                self._watch_owner[path] = root
+
+    def _unwatch_device(self, root: str):
+        """장치 폴더와 하위 폴더 감시 제거"""
+        for path in [path for path, owner in self._watch_owner.items() if owner == root]:
+            if self._inotify is not None:
+                self._inotify.remove_watch(path)
+            del self._watch_owner[path]
+
+    def _emit_changes(self, added: list, removed: list):
+        """장치 / 파일 변경 시그널"""
+        new_devices = {
+            path: USBDevice(path=path, name=os.path.basename(path), files=index.paths())
+            for path, index in self._indexes.items() if len(index)
+        }
 
-                if os.path.isfile(entry_path):
-                    # 확장자 확인
-                    if entry.lower().endswith(self.SUPPORTED_EXTENSIONS):
-                        files.append(entry_path)
+        new_paths = set(new_devices.keys())
+        old_paths = set(self._current_devices.keys())
 
-        except PermissionError:
-            pass
-        except Exception as e:
-            print(f"[USB] 파일 스캔 오류: {e}")
+        # 연결된 장치
+        for path in new_paths - old_paths:
+            print(f"[USB] 장치 연결됨: {path}")
+            self.device_connected.emit(path)
 
-        # 이름순 정렬
-        files.sort()
-        return files
+        # 해제된 장치
+        for path in old_paths - new_paths:
+            print(f"[USB] 장치 해제됨: {path}")
+            self.device_disconnected.emit(path)
+
+        changed = new_devices != self._current_devices
+        self._current_devices = new_devices
+
+        if removed:
+            self.files_removed.emit(sorted(set(removed)))
+        if added:
+            self.files_added.emit(sorted(set(added)))
+        if changed:
+            self.devices_changed.emit(list(new_devices.values()))
 
 
 # 테스트용
@@ -10,6 +10,8 @@ from dataclasses import dataclass
 
 from PySide6.QtGui import QPixmap, QImage
 
+from controllers.gcode_parser import LayerArchive
+
 
 @dataclass
 class ZipFileInfo:
@@ -149,40 +151,72 @@ class ZipHandler:
 
         return None
 
+    # 레이어 조회용 아카이브 캐시 (같은 파일 반복 조회 시 ZIP 재오픈/재스캔 방지)
+    _archive: Optional[LayerArchive] = None
+    _archive_stamp: Optional[Tuple[int, float]] = None
+
     @staticmethod
-    def get_layer_image(zip_path: str, layer_index: int) -> Optional[QPixmap]:
+    def open_archive(zip_path: str) -> Optional[LayerArchive]:
         """
-        특정 레이어 이미지 추출
+        레이어 아카이브 가져오기 (파일 단위 캐시)
+
+        같은 파일(경로/크기/수정시간 동일)이면 열려 있는 아카이브 재사용
 
         Args:
             zip_path: ZIP 파일 경로
-            layer_index: 레이어 인덱스 (0부터 시작)
 
         Returns:
-            QPixmap 또는 None
+            LayerArchive 또는 None
         """
         try:
-            with zipfile.ZipFile(zip_path, 'r') as z:
-                namelist = z.namelist()
+            stat = os.stat(zip_path)
+        except OSError as e:
+            print(f"[ZipHandler] 파일 정보 확인 오류: {e}")
+            return None
+
+        stamp = (stat.st_size, stat.st_mtime)
+        archive = ZipHandler._archive
+        if (archive is not None and archive.is_open
+                and archive.zip_path == zip_path
+                and ZipHandler._archive_stamp == stamp):
+            return archive
 
-                # 다양한 파일명 형식 시도
-                patterns = [
-                    f"{layer_index:04d}.png",   # 0001.png
-                    f"{layer_index:05d}.png",   # 00001.png
-                    f"{layer_index + 1:04d}.png",  # 1-based
-                    f"{layer_index}.png",        # 0.png
-                ]
+        ZipHandler.close_archive()
 
-                for pattern in patterns:
-                    if pattern in namelist:
-                        data = z.read(pattern)
-                        qimage = QImage.fromData(data)
+        archive = LayerArchive(zip_path)
+        if not archive.open():
+            return None
 
-                        if not qimage.isNull():
-                            return QPixmap.fromImage(qimage)
+        ZipHandler._archive = archive
+        ZipHandler._archive_stamp = stamp
+        return archive
 
-        except Exception as e:
-            print(f"[ZipHandler] 레이어 이미지 추출 오류: {e}")
+    @staticmethod
+    def close_archive():
+        """캐시된 레이어 아카이브 닫기"""
+        if ZipHandler._archive is not None:
+            ZipHandler._archive.close()
+        ZipHandler._archive = None
+        ZipHandler._archive_stamp = None
+
+    @staticmethod
+    def get_layer_image(zip_path: str, layer_index: int) -> Optional[QPixmap]:
+        """
+        특정 레이어 이미지 추출
+
+        Args:
+            zip_path: ZIP 파일 경로
+            layer_index: 레이어 인덱스 (0부터 시작)
+
+        Returns:
+            QPixmap 또는 None
+        """
+        data = ZipHandler.get_layer_image_bytes(zip_path, layer_index)
+        if data:
+            qimage = QImage.fromData(data)
+
+            if not qimage.isNull():
+                return QPixmap.fromImage(qimage)
 
         return None
 
@@ -193,28 +227,20 @@ class ZipHandler:
 
         Args:
             zip_path: ZIP 파일 경로
-            layer_index: 레이어 인덱스
+            layer_index: 레이어 인덱스 (0부터 시작)
 
         Returns:
             이미지 바이트 데이터 또는 None
         """
-        try:
-            with zipfile.ZipFile(zip_path, 'r') as z:
-                namelist = z.namelist()
-
-                patterns = [
-                    f"{layer_index:04d}.png",
-                    f"{layer_index:05d}.png",
-                    f"{layer_index + 1:04d}.png",
-                    f"{layer_index}.png",
-                ]
-
-                for pattern in patterns:
-                    if pattern in namelist:
-                        return z.read(pattern)
+        archive = ZipHandler.open_archive(zip_path)
+        if archive is None:
+            return None
 
+        try:
+            return archive.read_layer(layer_index)
         except Exception as e:
             print(f"[ZipHandler] 레이어 이미지 추출 오류: {e}")
+            ZipHandler.close_archive()
 
         return None
 
@@ -229,22 +255,11 @@ class ZipHandler:
         Returns:
             레이어 파일명 리스트 (정렬됨)
         """
-        layers = []
-
-        try:
-            with zipfile.ZipFile(zip_path, 'r') as z:
-                for name in z.namelist():
-                    # 숫자.png 패턴 확인
-                    base = name.replace('.png', '').replace('.PNG', '')
-                    if name.lower().endswith('.png') and base.isdigit():
-                        layers.append(name)
-
-        except Exception as e:
-            print(f"[ZipHandler] 레이어 목록 추출 오류: {e}")
+        archive = ZipHandler.open_archive(zip_path)
+        if archive is None:
+            return []
 
-        # 숫자순 정렬
-        layers.sort(key=lambda x: int(x.replace('.png', '').replace('.PNG', '')))
-        return layers
+        return archive.layer_names
 
     @staticmethod
     def extract_gcode(zip_path: str) -> Optional[str]:
@@ -6,8 +6,10 @@ Note: DF10 광원용 - HDMI 입력 해상도 1920x1080 @ 60Hz
 """
 
 import os
-from PySide6.QtWidgets import QMainWindow, QLabel, QApplication
-from PySide6.QtCore import Qt, QTimer
+from typing import Optional
+
+from PySide6.QtWidgets import QMainWindow, QWidget, QApplication
+from PySide6.QtCore import Qt, QTimer, QRect, QSize, Signal
 from PySide6.QtGui import QPixmap, QImage, QPainter, QColor
 
 # 로고 이미지 경로
@@ -16,6 +18,114 @@ LOGO_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "
 TEST_IMAGE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "1.png")
 
 
+class ProjectorCanvas(QWidget):
+    """
+    프로젝터 이미지 표시 위젯 (QLabel 대체)
+
+    - 미리 업로드한 QPixmap을 paintEvent에서 바로 blit
+    - 이미지 크기 == 위젯 크기: 스케일 없이 1:1 복사 (픽셀 정확)
+    - 크기가 다르면 레터박스 대상 영역을 한 번만 계산해 재사용 (보간 없음)
+    """
+
+    # 프레임이 paintEvent에서 그려진 직후 (frame_id)
+    frame_painted = Signal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self._pixmap: Optional[QPixmap] = None
+        self._pending_frame = -1
+
+        # 대상 영역 캐시: (원본 크기, 위젯 크기) → QRect (None이면 1:1)
+        self._target_key = None
+        self._target_rect: Optional[QRect] = None
+
+        # 매 프레임 배경 지우기 생략 (paintEvent에서 전체를 직접 그림)
+        self.setAttribute(Qt.WA_OpaquePaintEvent, True)
+        self.setAttribute(Qt.WA_NoSystemBackground, True)
+
+    @property
+    def pixmap(self) -> Optional[QPixmap]:
+        return self._pixmap
+
+    def set_image(self, image, frame_id: int = -1):
+        """
+        표시할 이미지 설정
+
+        Args:
+            image: QImage 또는 QPixmap (QImage는 여기서 한 번만 QPixmap으로 업로드)
+            frame_id: 그려진 뒤 frame_painted로 알릴 ID (-1이면 알리지 않음)
+        """
+        if isinstance(image, QImage):
+            image = QPixmap.fromImage(image)
+
+        self._pixmap = image
+        self._pending_frame = frame_id
+        self._update_target()
+        self.update()
+
+    def clear(self):
+        """이미지 제거 (검은 화면)"""
+        self._pixmap = None
+        self._pending_frame = -1
+        self.update()
+
+    def _update_target(self):
+        """대상 영역 계산 (원본/위젯 크기가 바뀐 경우에만)"""
+        if self._pixmap is None:
+            return
+
+        src = self._pixmap.size()
+        dst = self.size()
+        key = (src.width(), src.height(), dst.width(), dst.height())
+        if key == self._target_key:
+            return
+
+        self._target_key = key
+
+        if src == dst:
+            # 네이티브 해상도: 1:1 blit
+            self._target_rect = None
+            print(f"[Projector] 1:1 출력 ({src.width()}x{src.height()})")
+        else:
+            # 비율 유지 + 중앙 배치 (레터박스)
+            scaled = QSize(src)
+            scaled.scale(dst, Qt.KeepAspectRatio)
+            x = (dst.width() - scaled.width()) // 2
+            y = (dst.height() - scaled.height()) // 2
+            self._target_rect = QRect(x, y, scaled.width(), scaled.height())
+            print(f"[Projector] 스케일 출력: {src.width()}x{src.height()} → "
+                  f"{scaled.width()}x{scaled.height()} @ ({x}, {y})")
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+
+        pixmap = self._pixmap
+        if pixmap is None or pixmap.isNull():
+            painter.fillRect(self.rect(), Qt.black)
+        elif self._target_rect is None:
+            # 1:1 (위젯 전체를 덮으므로 배경 칠하기 불필요)
+            painter.drawPixmap(0, 0, pixmap)
+        else:
+            target = self._target_rect
+            if target != self.rect():
+                painter.fillRect(self.rect(), Qt.black)
+            painter.drawPixmap(target, pixmap)
+
+        painter.end()
+
+        # 표시 확인 대기 중인 프레임 알림
+        if self._pending_frame >= 0 and pixmap is not None:
+            frame_id = self._pending_frame
+            self._pending_frame = -1
+            self.frame_painted.emit(frame_id)
+
+    def resizeEvent(self, event):
+        """리사이즈 시 대상 영역 재계산"""
+        super().resizeEvent(event)
+        self._update_target()
+
+
 class ProjectorWindow(QMainWindow):
     """
     프로젝터 출력용 전체화면 윈도우
@@ -27,6 +137,12 @@ class ProjectorWindow(QMainWindow):
     PROJECTOR_WIDTH = 1920
     PROJECTOR_HEIGHT = 1080
 
+    # 60Hz 1프레임 (paint 후 HDMI 스캔아웃 완료까지 여유)
+    VSYNC_INTERVAL_MS = 17
+
+    # 프레임 표시 완료 (frame_id) - paint 후 (vsync 대기 시 1프레임 뒤)
+    frame_presented = Signal(int)
+
     def __init__(self, screen_index: int = 1, parent=None):
         """
         Args:
@@ -36,19 +152,20 @@ class ProjectorWindow(QMainWindow):
         super().__init__(parent)
 
         self.screen_index = screen_index
-        self._current_pixmap: QPixmap = None
+
+        # paint 후 1 vsync 기다렸다가 frame_presented 발생
+        self.wait_vsync = True
 
         self._setup_ui()
         self._setup_window()
 
     def _setup_ui(self):
         """UI 설정"""
-        # 이미지 표시용 라벨
-        self.image_label = QLabel()
-        self.image_label.setAlignment(Qt.AlignCenter)
-        self.image_label.setStyleSheet("background-color: black;")
+        # 이미지 표시용 캔버스
+        self.canvas = ProjectorCanvas()
+        self.canvas.frame_painted.connect(self._on_frame_painted)
 
-        self.setCentralWidget(self.image_label)
+        self.setCentralWidget(self.canvas)
 
     def _setup_window(self):
         """윈도우 설정"""
@@ -92,27 +209,27 @@ class ProjectorWindow(QMainWindow):
             print(f"[Projector] 스크린 {self.screen_index} 없음, 기본 스크린 사용")
             self.showFullScreen()
 
-    def show_image(self, pixmap: QPixmap):
+    def show_image(self, image, frame_id: int = -1):
         """
         이미지 표시
 
         Args:
-            pixmap: 표시할 QPixmap
+            image: 표시할 QImage (워커의 8비트 레이어) 또는 QPixmap
+            frame_id: 표시 완료 시 frame_presented로 알릴 ID (-1이면 알리지 않음)
         """
-        if pixmap is None or pixmap.isNull():
+        if image is None or image.isNull():
             self.clear_screen()
             return
 
-        self._current_pixmap = pixmap
-
-        # 윈도우 크기에 맞게 스케일링
-        scaled_pixmap = pixmap.scaled(
-            self.image_label.size(),
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        )
+        # QImage → QPixmap 업로드는 GUI 스레드에서, 스케일링은 캔버스가 담당
+        self.canvas.set_image(image, frame_id)
 
-        self.image_label.setPixmap(scaled_pixmap)
+    def _on_frame_painted(self, frame_id: int):
+        """캔버스 paint 완료 → frame_presented (필요 시 1 vsync 후)"""
+        if self.wait_vsync:
+            QTimer.singleShot(self.VSYNC_INTERVAL_MS, lambda: self.frame_presented.emit(frame_id))
+        else:
+            self.frame_presented.emit(frame_id)
 
     def show_image_data(self, image_data: bytes):
         """
@@ -123,14 +240,11 @@ class ProjectorWindow(QMainWindow):
         """
         qimage = QImage.fromData(image_data)
         if not qimage.isNull():
-            pixmap = QPixmap.fromImage(qimage)
-            self.show_image(pixmap)
+            self.show_image(qimage)
 
     def clear_screen(self):
         """화면 클리어 (검은색)"""
-        self._current_pixmap = None
-        self.image_label.clear()
-        self.image_label.setStyleSheet("background-color: black;")
+        self.canvas.clear()
 
     def show_white_screen(self):
         """흰색 화면 표시 (트레이 청소용)"""
@@ -228,13 +342,6 @@ class ProjectorWindow(QMainWindow):
         painter.end()
         return pixmap
 
-    def resizeEvent(self, event):
-        """리사이즈 시 이미지 재스케일링"""
-        super().resizeEvent(event)
-
-        if self._current_pixmap and not self._current_pixmap.isNull():
-            self.show_image(self._current_pixmap)
-
     def keyPressEvent(self, event):
         """ESC 키로 닫기"""
         if event.key() == Qt.Key_Escape:
@@ -4,8 +4,17 @@ VERICOM DLP 3D Printer GUI - Workers Package
 """
 
 from .print_worker import PrintWorker, PrintStatus
+from .layer_prefetcher import LayerPrefetcher, PreparedLayer
+from .print_profiler import PrintProfiler
+from .layer_cache_warmer import LayerCacheWarmer
+from .job_analysis_worker import JobAnalysisWorker
 
 __all__ = [
     'PrintWorker',
-    'PrintStatus'
+    'PrintStatus',
+    'LayerPrefetcher',
+    'PreparedLayer',
+    'PrintProfiler',
+    'LayerCacheWarmer',
+    'JobAnalysisWorker'
 ]
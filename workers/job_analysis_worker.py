@@ -0,0 +1,70 @@
+"""
+VERICOM DLP 3D Printer - Job Analysis Worker
+파일 미리보기 동안 작업 레이어를 분석하는 백그라운드 스레드 (JobAnalyzer + 프로세스 풀)
+
+결과는 메타데이터 캐시에 저장되므로 같은 파일은 한 번만 분석
+프린트 시작 / 다른 화면 이동 / 파일 삭제 시 정지 (출력 중에는 실행하지 않음)
+"""
+
+import threading
+from typing import List, Optional
+
+from PySide6.QtCore import QThread, Signal
+
+try:
+    from controllers.gcode_parser import PrintParameters
+    from utils.job_analyzer import JobAnalyzer
+    from utils.metadata_cache import get_metadata_cache
+except ImportError:
+    from ..controllers.gcode_parser import PrintParameters
+    from ..utils.job_analyzer import JobAnalyzer
+    from ..utils.metadata_cache import get_metadata_cache
+
+
+class JobAnalysisWorker(QThread):
+    """
+    작업 분석 스레드
+
+    시그널:
+        progress: (분석한 레이어 수, 전체 레이어 수) - 1% 단위
+        analysis_ready: (파일 경로, 분석 요약 dict)
+    """
+
+    progress = Signal(int, int)
+    analysis_ready = Signal(str, object)
+
+    def __init__(self, zip_path: str, params: PrintParameters,
+                 layer_names: Optional[List[str]] = None, workers: int = 0, parent=None):
+        """
+        Args:
+            zip_path: 작업 ZIP 경로
+            params: 프린트 파라미터
+            layer_names: 정렬된 레이어 파일명 (JobInfo 결과 재사용)
+            workers: 프로세스 수 (0 = CPU 코어 수 - 1)
+            parent: 부모 QObject
+        """
+        super().__init__(parent)
+        self.zip_path = zip_path
+        self.analyzer = JobAnalyzer(zip_path, params, layer_names, workers)
+        self._cancel = threading.Event()
+        self._percent = -1
+
+    def stop(self, wait_ms: int = 3000):
+        """취소 요청 후 진행 중인 레이어가 끝날 때까지 대기"""
+        self._cancel.set()
+        self.wait(wait_ms)
+
+    def _on_progress(self, done: int, total: int):
+        percent = done * 100 // total if total > 0 else 100
+        if percent != self._percent:
+            self._percent = percent
+            self.progress.emit(done, total)
+
+    def run(self):
+        analysis = self.analyzer.run(self._cancel, self._on_progress)
+        if analysis is None or self._cancel.is_set():
+            return
+
+        summary = analysis.summary()
+        get_metadata_cache().put_analysis(self.zip_path, summary, analysis.layer_areas)
+        self.analysis_ready.emit(self.zip_path, summary)
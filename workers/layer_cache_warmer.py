@@ -0,0 +1,107 @@
+"""
+VERICOM DLP 3D Printer - Layer Cache Warmer
+유휴 시간에 작업 레이어를 미리 MASK 적용해 레이어 캐시에 채우는 백그라운드 스레드
+
+파일 미리보기 화면에 머무는 동안 작업 분석이 끝난 뒤 실행하고, 프린트 시작 / 다른 화면 이동 시 정지
+(프린트 중에는 PrintWorker가 남은 레이어를 직접 채움)
+resume_only이면 한 번 이상 프린트를 시작한 작업(캐시된 레이어가 있는 작업)만 채움
+"""
+
+import time
+from typing import List, Optional
+
+from PySide6.QtCore import QThread, Signal
+
+try:
+    from controllers.gcode_parser import LayerArchive
+    from utils.mask_engine import MaskEngine
+    from utils.layer_cache import get_layer_cache, mask_key, NO_MASK
+except ImportError:
+    from ..controllers.gcode_parser import LayerArchive
+    from ..utils.mask_engine import MaskEngine
+    from ..utils.layer_cache import get_layer_cache, mask_key, NO_MASK
+
+
+class LayerCacheWarmer(QThread):
+    """
+    레이어 캐시 채우기 스레드
+
+    시그널:
+        progress: (캐시된 레이어 수, 전체 레이어 수)
+    """
+
+    progress = Signal(int, int)
+
+    # 레이어 사이 쉬는 시간 (GUI / USB 읽기에 양보)
+    IDLE_SLEEP = 0.02
+
+    def __init__(self, zip_path: str, resolution: tuple, mask_path: str = "",
+                 layer_names: Optional[List[str]] = None, resume_only: bool = False, parent=None):
+        """
+        Args:
+            zip_path: 작업 ZIP 경로
+            resolution: 레이어 해상도 (width, height) - MASK 버퍼 크기
+            mask_path: MASK 파일 경로 (빈 문자열이면 MASK 없이 디코딩만 캐시)
+            layer_names: 정렬된 레이어 파일명 (JobInfo 결과 재사용)
+            resume_only: 캐시된 레이어가 하나도 없으면 (프린트한 적 없는 작업) 채우지 않음
+            parent: 부모 QObject
+        """
+        super().__init__(parent)
+        self.zip_path = zip_path
+        self.resolution = tuple(resolution)
+        self.mask_path = mask_path
+        self.layer_names = layer_names
+        self.resume_only = resume_only
+        self._stopped = False
+
+    def stop(self, wait_ms: int = 2000):
+        """정지 요청 후 현재 레이어가 끝날 때까지 대기"""
+        self._stopped = True
+        self.wait(wait_ms)
+
+    def run(self):
+        engine = MaskEngine()
+        if self.mask_path and not engine.load(self.mask_path, self.resolution):
+            print(f"[CacheWarmer] MASK 로드 실패, 중단: {self.mask_path}")
+            return
+
+        archive = LayerArchive(self.zip_path, self.layer_names)
+        if not archive.open():
+            return
+
+        try:
+            cache = get_layer_cache()
+            key = (archive.content_key(), mask_key(self.mask_path, self.resolution) if self.mask_path else NO_MASK)
+            total = len(archive)
+            missing = cache.missing(*key, total)
+            if self.resume_only and len(missing) == total:
+                print("[CacheWarmer] 프린트한 적 없는 작업, 생략")
+                return
+            print(f"[CacheWarmer] 시작: {total - len(missing)}/{total} 캐시됨, {len(missing)}개 준비")
+
+            done = total - len(missing)
+            for index in missing:
+                if self._stopped:
+                    break
+                # 프린트 워커가 이미 채웠으면 건너뜀
+                if cache.has(*key, index):
+                    done += 1
+                    continue
+
+                image_data = archive.read_layer(index)
+                if not image_data:
+                    continue
+                qimage = engine.apply_to_qimage(image_data, archive.layer_bbox(index))
+                archive.set_layer_bbox(index, MaskEngine.image_bbox(qimage))
+                frame = MaskEngine.frame_from_qimage(qimage) if not qimage.isNull() else None
+                if frame is not None and cache.put(*key, index, frame):
+                    done += 1
+                    self.progress.emit(done, total)
+
+                time.sleep(self.IDLE_SLEEP)
+
+            print(f"[CacheWarmer] {'정지' if self._stopped else '완료'}: {done}/{total} 캐시됨")
+        except Exception as e:
+            print(f"[CacheWarmer] 오류: {e}")
+        finally:
+            archive.close()
@@ -0,0 +1,153 @@
+"""
+VERICOM DLP 3D Printer - Layer Prefetcher
+다음 레이어 이미지를 미리 준비하는 백그라운드 스레드
+
+블레이드/Z축 이동 중에 다음 레이어의 읽기 + MASK + 디코딩을 끝내 두어
+노광 단계에서는 준비된 버퍼만 교체하도록 함
+"""
+
+import time
+from typing import Optional, Callable, Dict, Any
+from dataclasses import dataclass, field
+
+from PySide6.QtCore import QThread, QMutex, QWaitCondition
+
+
+@dataclass
+class PreparedLayer:
+    """준비된 레이어 (표시 직전 상태)"""
+    index: int
+    image: Any = None           # QImage (실패 시 None)
+    error: str = ""             # 준비 실패 메시지
+    timings: Dict[str, float] = field(default_factory=dict)  # 단계별 준비 시간 (초)
+
+    @property
+    def ok(self) -> bool:
+        return self.image is not None and not self.error
+
+
+class LayerPrefetcher(QThread):
+    """
+    레이어 프리페치 스레드
+
+    prepare_fn(layer_index, timings)로 레이어를 순서대로 준비하여
+    최대 depth개까지 버퍼에 보관한다. 버퍼가 가득 차면 소비될 때까지 대기.
+    """
+
+    def __init__(self,
+                 prepare_fn: Callable[[int, Dict[str, float]], Any],
+                 total_layers: int,
+                 depth: int = 3,
+                 start_index: int = 0,
+                 parent=None):
+        """
+        Args:
+            prepare_fn: (레이어 인덱스, 단계별 시간 dict) → 표시 가능한 이미지 (실패 시 예외)
+            total_layers: 총 레이어 수
+            depth: 미리 준비할 최대 레이어 수
+            start_index: 시작 레이어 인덱스
+            parent: 부모 QObject
+        """
+        super().__init__(parent)
+
+        self._prepare_fn = prepare_fn
+        self._total_layers = total_layers
+        self._depth = max(1, depth)
+        self._next_index = start_index
+
+        self._buffer: Dict[int, PreparedLayer] = {}
+        self._stopped = False
+        self._finished = False
+
+        # 동기화
+        self._mutex = QMutex()
+        self._condition = QWaitCondition()
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    def run(self):
+        """레이어 순서대로 준비"""
+        print(f"[Prefetch] 시작 (depth={self._depth}, 레이어 {self._next_index}~{self._total_layers - 1})")
+
+        while True:
+            # 버퍼 여유 대기
+            self._mutex.lock()
+            while len(self._buffer) >= self._depth and not self._stopped:
+                self._condition.wait(self._mutex)
+            index = self._next_index
+            done = self._stopped or index >= self._total_layers
+            self._mutex.unlock()
+
+            if done:
+                break
+
+            # 레이어 준비 (잠금 밖에서 실행)
+            timings: Dict[str, float] = {}
+            try:
+                item = PreparedLayer(index=index, image=self._prepare_fn(index, timings), timings=timings)
+            except Exception as e:
+                item = PreparedLayer(index=index, error=str(e), timings=timings)
+                print(f"[Prefetch] 레이어 {index} 준비 실패: {e}")
+
+            self._mutex.lock()
+            if not self._stopped:
+                self._buffer[index] = item
+                self._next_index = index + 1
+            self._condition.wakeAll()
+            self._mutex.unlock()
+
+        self._mutex.lock()
+        self._finished = True
+        self._condition.wakeAll()
+        self._mutex.unlock()
+        print("[Prefetch] 종료")
+
+    def take(self, layer_index: int, timeout_ms: int = 10000) -> Optional[PreparedLayer]:
+        """
+        준비된 레이어 꺼내기 (준비될 때까지 대기)
+
+        Args:
+            layer_index: 레이어 인덱스
+            timeout_ms: 최대 대기 시간 (밀리초)
+
+        Returns:
+            PreparedLayer 또는 None (타임아웃/정지/범위 밖)
+        """
+        deadline = time.monotonic() + timeout_ms / 1000.0
+
+        self._mutex.lock()
+        try:
+            while True:
+                # 건너뛴 레이어 버림 (버퍼 자리 확보)
+                stale = [i for i in self._buffer if i < layer_index]
+                for i in stale:
+                    del self._buffer[i]
+                if stale:
+                    self._condition.wakeAll()
+
+                # 준비됨 / 정지 / 이미 지나간 레이어(다시 오지 않음)
+                if (layer_index in self._buffer or self._stopped or self._finished
+                        or layer_index < self._next_index):
+                    break
+
+                remaining_ms = int((deadline - time.monotonic()) * 1000)
+                if remaining_ms <= 0 or not self._condition.wait(self._mutex, remaining_ms):
+                    print(f"[Prefetch] 레이어 {layer_index} 대기 타임아웃")
+                    break
+
+            item = self._buffer.pop(layer_index, None)
+            self._condition.wakeAll()
+            return item
+        finally:
+            self._mutex.unlock()
+
+    def stop(self):
+        """프리페치 정지 및 버퍼 비우기"""
+        self._mutex.lock()
+        self._stopped = True
+        self._buffer.clear()
+        self._condition.wakeAll()
+        self._mutex.unlock()
+        self.wait()
@@ -0,0 +1,211 @@
+"""
+VERICOM DLP 3D Printer - Print Profiler
+레이어 단계별 소요 시간 기록 및 작업 프로파일 저장
+
+레이어마다 각 단계(Z 이동, 블레이드, 이미지 준비, 노광 등)의 시간을
+단계별 고정 크기 배열에 기록하고 작업별 CSV로 스트리밍
+작업 종료 시 단계별 p50/p95/최대 요약
+"""
+
+import os
+import csv
+import math
+from array import array
+from datetime import datetime
+from typing import Optional, Dict, List
+
+
+# 프로파일 저장 경로
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "profiles")
+
+# 보관할 최근 프로파일 개수 (초과분은 오래된 것부터 삭제)
+MAX_PROFILES = 20
+
+
+class PrintProfiler:
+    """
+    레이어 단계별 시간 기록기
+
+    단계 (초 단위):
+        z_move        레이어 높이로 Z 이동
+        blade_sweep   X 0 → 125 (블레이드)
+        prefetch_wait 프리페치 버퍼에서 꺼낼 때 대기한 시간
+        layer_cache   캐시된 프레임 읽기 (적중) / 준비한 프레임 저장 (미스)
+        image_fetch   ZIP에서 레이어 읽기
+        mask          MASK 합성
+        decode        PNG 디코딩 (+ QImage 변환)
+        display       표시 요청 → 프로젝터 paint 확인
+        led_on        LED ON 명령 지연
+        exposure      실제 LED ON 시간
+        led_off       LED OFF 명령 지연
+        lift / return / drop   개별 이동 (batched_motion 끔)
+        post_motion   리프트 + 복귀 + 하강 일괄 스크립트 (batched_motion 켬)
+        layer_total   레이어 전체
+    """
+
+    PHASES = (
+        'z_move', 'blade_sweep', 'prefetch_wait', 'layer_cache', 'image_fetch', 'mask', 'decode',
+        'display', 'led_on', 'exposure', 'led_off', 'lift', 'return', 'drop',
+        'post_motion', 'layer_total',
+    )
+
+    def __init__(self, total_layers: int, job_name: str = "", output_dir: str = PROFILE_DIR):
+        """
+        Args:
+            total_layers: 총 레이어 수 (배열 크기)
+            job_name: 작업 이름 (CSV 파일명에 사용)
+            output_dir: CSV 저장 폴더 (빈 문자열이면 저장 안 함)
+        """
+        self.total_layers = max(1, total_layers)
+
+        # 단계별 고정 크기 배열 (미기록 = NaN)
+        self._data: Dict[str, array] = {
+            phase: array('d', [math.nan]) * self.total_layers for phase in self.PHASES
+        }
+        self._current = -1
+        self._count = 0
+
+        # CSV 스트리밍
+        self.path = ""
+        self._file = None
+        self._writer = None
+        if output_dir:
+            self._open_csv(output_dir, job_name)
+
+    def _open_csv(self, output_dir: str, job_name: str):
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            self._prune(output_dir, MAX_PROFILES - 1)
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            name = os.path.splitext(os.path.basename(job_name))[0] or "print"
+            self.path = os.path.join(output_dir, f"{stamp}_{name}.csv")
+
+            self._file = open(self.path, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(("layer",) + tuple(f"{phase}_ms" for phase in self.PHASES))
+            print(f"[Profiler] 프로파일 기록: {self.path}")
+        except OSError as e:
+            print(f"[Profiler] CSV 생성 실패: {e}")
+            self._file = None
+            self._writer = None
+
+    @staticmethod
+    def _prune(output_dir: str, keep: int):
+        """오래된 CSV 삭제 (최근 keep개만 남김)"""
+        try:
+            with os.scandir(output_dir) as it:
+                files = [(entry.stat().st_mtime, entry.path) for entry in it
+                         if entry.is_file() and entry.name.endswith(".csv")]
+        except OSError:
+            return
+
+        files.sort(reverse=True)
+        for _mtime, path in files[max(0, keep):]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    # ==================== 기록 ====================
+
+    def begin_layer(self, layer_idx: int):
+        """레이어 기록 시작"""
+        self._current = layer_idx if 0 <= layer_idx < self.total_layers else -1
+
+    def record(self, phase: str, seconds: float, layer_idx: Optional[int] = None):
+        """
+        단계 시간 기록 (같은 단계가 여러 번이면 합산)
+
+        Args:
+            phase: PHASES 중 하나
+            seconds: 소요 시간 (초)
+            layer_idx: 레이어 인덱스 (None이면 현재 레이어)
+        """
+        idx = self._current if layer_idx is None else layer_idx
+        if idx < 0 or idx >= self.total_layers or phase not in self._data:
+            return
+
+        values = self._data[phase]
+        previous = values[idx]
+        values[idx] = seconds if math.isnan(previous) else previous + seconds
+
+    def end_layer(self) -> Dict[str, float]:
+        """
+        레이어 기록 종료 → CSV 한 줄 기록
+
+        Returns:
+            {'layer': idx, 단계: 밀리초, ...} (기록된 단계만)
+        """
+        idx = self._current
+        self._current = -1
+        if idx < 0:
+            return {}
+
+        self._count += 1
+        row = {'layer': idx}
+        for phase in self.PHASES:
+            value = self._data[phase][idx]
+            if not math.isnan(value):
+                row[phase] = value * 1000
+
+        if self._writer:
+            self._writer.writerow([idx] + [
+                "" if math.isnan(self._data[phase][idx]) else f"{self._data[phase][idx] * 1000:.2f}"
+                for phase in self.PHASES
+            ])
+            self._file.flush()
+
+        return row
+
+    # ==================== 요약 ====================
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        단계별 요약 (밀리초)
+
+        Returns:
+            {단계: {'count', 'p50', 'p95', 'max', 'total'}} (기록된 단계만)
+        """
+        result = {}
+        for phase in self.PHASES:
+            values = sorted(v for v in self._data[phase] if not math.isnan(v))
+            if not values:
+                continue
+            result[phase] = {
+                'count': len(values),
+                'p50': self._percentile(values, 0.50) * 1000,
+                'p95': self._percentile(values, 0.95) * 1000,
+                'max': values[-1] * 1000,
+                'total': sum(values) * 1000,
+            }
+        return result
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], q: float) -> float:
+        """선형 보간 백분위수"""
+        if len(sorted_values) == 1:
+            return sorted_values[0]
+        pos = (len(sorted_values) - 1) * q
+        low = int(pos)
+        high = min(low + 1, len(sorted_values) - 1)
+        return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (pos - low)
+
+    def print_summary(self):
+        """요약 출력"""
+        summary = self.summary()
+        if not summary:
+            return
+
+        print(f"[Profiler] 레이어 {self._count}개 단계별 시간 (ms)")
+        print(f"  {'단계':<14}{'p50':>10}{'p95':>10}{'최대':>10}{'합계(s)':>10}")
+        for phase, stats in summary.items():
+            print(f"  {phase:<14}{stats['p50']:>10.1f}{stats['p95']:>10.1f}"
+                  f"{stats['max']:>10.1f}{stats['total'] / 1000:>10.1f}")
+
+    def close(self):
+        """CSV 닫기 (요약 출력)"""
+        self.print_summary()
+        if self._file:
+            self._file.close()
+            self._file = None
+            self._writer = None
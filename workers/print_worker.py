@@ -3,23 +3,14 @@ VERICOM DLP 3D Printer - Print Worker
 QThread 기반 프린팅 시퀀스 실행
 """
 
+import math
 import time
-import zipfile
-import io
 from enum import Enum, auto
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 
 from PySide6.QtCore import QThread, Signal, QMutex, QWaitCondition
-from PySide6.QtGui import QPixmap, QImage
-
-# PIL for MASK 적용
-try:
-    from PIL import Image
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
-    print("[PrintWorker] PIL 없음 - MASK 기능 비활성화")
+from PySide6.QtGui import QImage
 
 # 컨트롤러 임포트
 import sys
@@ -29,12 +20,22 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 try:
     from controllers.motor_controller import MotorController
     from controllers.dlp_controller import DLPController
-    from controllers.gcode_parser import GCodeParser, PrintParameters
+    from controllers.gcode_parser import GCodeParser, PrintParameters, LayerArchive
+    from workers.layer_prefetcher import LayerPrefetcher
+    from workers.print_profiler import PrintProfiler
+    from utils.mask_engine import MaskEngine, PIL_AVAILABLE
+    from utils.layer_cache import get_layer_cache, mask_key, NO_MASK
+    from utils.job_stager import StagingTask, get_job_stager
 except ImportError:
     # 상대 임포트 시도
     from ..controllers.motor_controller import MotorController
     from ..controllers.dlp_controller import DLPController
-    from ..controllers.gcode_parser import GCodeParser, PrintParameters
+    from ..controllers.gcode_parser import GCodeParser, PrintParameters, LayerArchive
+    from .layer_prefetcher import LayerPrefetcher
+    from .print_profiler import PrintProfiler
+    from ..utils.mask_engine import MaskEngine, PIL_AVAILABLE
+    from ..utils.layer_cache import get_layer_cache, mask_key, NO_MASK
+    from ..utils.job_stager import StagingTask, get_job_stager
 
 
 class PrintStatus(Enum):
@@ -59,6 +60,11 @@ class PrintJob:
     leveling_cycles: int = 1
     use_mask: bool = False  # MASK 적용 여부
     mask_path: str = ""  # MASK 파일 경로
+    prefetch_depth: int = 3  # 미리 준비할 레이어 수 (0: 프리페치 사용 안 함)
+    batched_motion: bool = True  # 노광 후 모션(리프트/복귀/하강)을 스크립트 1회로 전송
+    profile: bool = True  # 레이어 단계별 시간 기록 (data/profiles/*.csv)
+    layer_cache: bool = True  # MASK 적용 프레임 캐시 사용 (data/layer_cache)
+    stage_local: bool = True  # 작업 ZIP을 로컬로 복사해 읽기 (data/staging)
 
 
 class PrintWorker(QThread):
@@ -70,6 +76,7 @@ class PrintWorker(QThread):
         progress_updated: 레이어 진행 시 (current, total)
         layer_started: 레이어 시작 시 (layer_index)
         error_occurred: 에러 발생 시 (message)
+        staging_progress: 로컬 복사 진행 시 (percent, 100이면 전환 완료)
         print_completed: 프린트 완료 시
         print_stopped: 프린트 중지 시
     """
@@ -79,11 +86,14 @@ class PrintWorker(QThread):
     progress_updated = Signal(int, int)  # current, total
     layer_started = Signal(int)  # layer_index
     error_occurred = Signal(str)  # error message
+    exposure_measured = Signal(int, float, float)  # layer_index, 목표(초), 실제 LED ON 시간(초)
+    profile_updated = Signal(object)  # 레이어 단계별 시간 dict ({'layer': idx, 단계: ms})
+    staging_progress = Signal(int)  # 작업 ZIP 로컬 복사 진행률 (%)
     print_completed = Signal()
     print_stopped = Signal()
 
     # 이미지 표시 요청 시그널 (ProjectorWindow로 전달)
-    show_image = Signal(object)  # QPixmap
+    show_image = Signal(object, int)  # QImage (Format_Grayscale8 / RGB888), frame_id(layer_index)
     clear_image = Signal()
 
     def __init__(self,
@@ -96,8 +106,8 @@ class PrintWorker(QThread):
         self.motor = motor
         self.dlp = dlp
 
-        # MASK 설정
-        self._mask_image: Optional[Image.Image] = None
+        # MASK 설정 (레이어 크기 8비트 버퍼로 미리 준비)
+        self._mask_engine = MaskEngine()
         self._use_mask = False
         self._mask_path = ""
 
@@ -113,35 +123,50 @@ class PrintWorker(QThread):
         # 현재 작업
         self._job: Optional[PrintJob] = None
 
+        # 레이어 아카이브 (작업 동안 ZIP 1회 오픈 + 레이어 인덱스 유지)
+        self._archive: Optional[LayerArchive] = None
+
+        # 레이어 프리페치 (모터 이동 중 다음 레이어 준비)
+        self._prefetcher: Optional[LayerPrefetcher] = None
+
+        # 레이어 프레임 캐시 키 (작업 내용 해시, MASK 해시), None이면 캐시 사용 안 함
+        self._cache_key: Optional[tuple] = None
+
+        # 작업 ZIP 로컬 복사 (홈/평탄화 동안 백그라운드, 완료 시 아카이브 전환)
+        self._staging: Optional[StagingTask] = None
+        self._staging_percent = -1
+
+        # 프레임 표시 확인 (ProjectorWindow.frame_presented → LED ON 전 대기)
+        self._frame_ack_enabled = False
+        self._frame_ack_timeout_ms = 500
+        self._frame_mutex = QMutex()
+        self._frame_condition = QWaitCondition()
+        self._pending_frame = -1
+        self._presented_frame = -1
+        self._frame_emit_time = 0.0
+        self._frame_latencies: List[float] = []  # emit → painted (초)
+
+        # 노광 기록 (layer_index, 목표, 실제 LED ON 시간)
+        self._exposure_log: List[tuple] = []
+        self._led_off_latency = 0.0  # LED OFF 명령 반응 지연 추정 (초, 왕복의 절반)
+
+        # 레이어 단계별 시간 기록
+        self._profiler: Optional[PrintProfiler] = None
+
         # 시뮬레이션 모드
         self.simulation = False
 
     # ==================== MASK 관리 ====================
 
-    def _load_mask(self, mask_path: str = ""):
+    def _load_mask(self, mask_path: str = "", size: tuple = MaskEngine.DEFAULT_SIZE):
         """MASK 이미지 로드
 
         Args:
             mask_path: MASK 파일 경로 (Setting 페이지에서 설정)
+            size: 레이어 이미지 크기 (MASK 버퍼를 이 크기로 미리 준비)
         """
-        if not PIL_AVAILABLE:
-            print("[PrintWorker] PIL 없음 - MASK 로드 불가")
-            return
-
-        if not mask_path or not os.path.exists(mask_path):
-            print(f"[PrintWorker] MASK 파일 없음: {mask_path}")
-            self._mask_image = None
-            return
-
-        try:
-            self._mask_image = Image.open(mask_path)
-            # 그레이스케일로 변환 (알파 채널로 사용)
-            if self._mask_image.mode != 'L':
-                self._mask_image = self._mask_image.convert('L')
-            print(f"[PrintWorker] MASK 로드 완료: {mask_path} ({self._mask_image.size})")
-        except Exception as e:
-            print(f"[PrintWorker] MASK 로드 실패: {e}")
-            self._mask_image = None
+        if not self._mask_engine.load(mask_path, size):
+            print(f"[PrintWorker] MASK 사용 불가: {mask_path}")
 
     def set_use_mask(self, enabled: bool):
         """MASK 사용 여부 설정"""
@@ -151,49 +176,153 @@ class PrintWorker(QThread):
     @property
     def mask_available(self) -> bool:
         """MASK 사용 가능 여부"""
-        return PIL_AVAILABLE and self._mask_image is not None
+        return self._mask_engine.is_loaded
 
-    def _apply_mask(self, image_data: bytes) -> bytes:
+    def _decode_layer(self, image_data: bytes, timings: Optional[Dict[str, float]] = None,
+                      layer_idx: int = -1) -> QImage:
         """
-        이미지에 MASK 적용
+        레이어 PNG 디코딩 (MASK 적용 포함)
+
+        단일 채널(Format_Grayscale8)로 디코딩 → 8비트 MASK 곱셈 → raw 버퍼를 바로 QImage로 전달
+        (PNG 재인코딩/재디코딩 없음, 컬러 데이터가 있는 입력만 RGB888)
+        MASK 곱셈은 레이어 경계 상자 영역만 (처음 디코딩할 때 계산해 아카이브 인덱스에 기록)
+        MASK 없이도 경계 상자를 아직 모르는 레이어는 PIL로 디코딩해 계산 (미리보기 영역 축소용)
 
         Args:
             image_data: 원본 PNG 이미지 데이터
+            timings: 단계별 시간 기록용 dict ('decode', 'mask')
+            layer_idx: 레이어 인덱스 (경계 상자 조회/기록용)
 
         Returns:
-            MASK가 적용된 PNG 이미지 데이터
+            QImage (디코딩 실패 시 null QImage)
         """
-        if not self._use_mask or self._mask_image is None:
-            return image_data
+        timings = timings if timings is not None else {}
 
-        try:
-            # PIL 이미지로 변환
-            layer_img = Image.open(io.BytesIO(image_data))
+        if self._use_mask and self._mask_engine.is_loaded:
+            try:
+                t0 = self._now()
+                layer = MaskEngine.decode(image_data)
+                bbox = self._layer_bbox(layer_idx, layer)
+                t1 = self._now()
+                masked = self._mask_engine.apply(layer, bbox)
+                t2 = self._now()
+                qimage = MaskEngine.to_qimage(masked)
+                MaskEngine.tag_bbox(qimage, bbox)
+                timings['decode'] = (t1 - t0) + (self._now() - t2)
+                timings['mask'] = t2 - t1
+                return qimage
+            except Exception as e:
+                print(f"[PrintWorker] MASK 적용 실패: {e}")
 
-            # RGB로 변환
-            if layer_img.mode != 'RGB':
-                layer_img = layer_img.convert('RGB')
+        t0 = self._now()
+        bbox = self._layer_bbox(layer_idx)
+        if bbox is None and layer_idx >= 0 and PIL_AVAILABLE:
+            try:
+                layer = MaskEngine.decode(image_data)
+                bbox = self._layer_bbox(layer_idx, layer)
+                qimage = MaskEngine.to_qimage(layer)
+                MaskEngine.tag_bbox(qimage, bbox)
+                timings['decode'] = self._now() - t0
+                return qimage
+            except Exception as e:
+                print(f"[PrintWorker] PIL 디코딩 실패, Qt로 디코딩: {e}")
 
-            # MASK 크기 조정 (필요시)
-            mask = self._mask_image
-            if mask.size != layer_img.size:
-                mask = mask.resize(layer_img.size, Image.Resampling.NEAREST)
+        qimage = MaskEngine.decode_qimage(image_data)
+        MaskEngine.tag_bbox(qimage, bbox)
+        timings['decode'] = self._now() - t0
+        return qimage
 
-            # 검정 배경 생성
-            result = Image.new('RGB', layer_img.size, (0, 0, 0))
+    def _layer_bbox(self, layer_idx: int, layer=None) -> Optional[tuple]:
+        """
+        레이어 경계 상자 (아카이브 인덱스 → 없으면 디코딩한 PIL 레이어에서 계산해 기록)
 
-            # MASK를 알파로 사용하여 합성
-            # MASK 흰색(255) → 원본 표시, 검정(0) → 배경(검정)
-            result = Image.composite(layer_img, result, mask)
+        Returns:
+            (x0, y0, x1, y1) 또는 None (모름)
+        """
+        archive = self._archive
+        if archive is None or layer_idx < 0:
+            return None
+        bbox = archive.layer_bbox(layer_idx)
+        if bbox is None and layer is not None:
+            bbox = MaskEngine.bbox(layer)
+            archive.set_layer_bbox(layer_idx, bbox)
+        return bbox
+
+    # ==================== 프레임 표시 확인 ====================
+
+    def set_frame_ack(self, enabled: bool, timeout_ms: int = 500):
+        """
+        프레임 표시 확인 사용 설정
 
-            # PNG로 변환
-            output = io.BytesIO()
-            result.save(output, format='PNG')
-            return output.getvalue()
+        프로젝터 윈도우가 실제로 화면에 떠 있을 때만 켜야 함
+        (숨겨진 윈도우는 paint가 일어나지 않아 매 레이어 타임아웃)
 
-        except Exception as e:
-            print(f"[PrintWorker] MASK 적용 실패: {e}")
-            return image_data
+        Args:
+            enabled: LED ON 전에 frame_presented를 기다릴지 여부
+            timeout_ms: 최대 대기 시간 (밀리초)
+        """
+        self._frame_ack_enabled = enabled
+        self._frame_ack_timeout_ms = timeout_ms
+        print(f"[PrintWorker] 프레임 표시 확인: {enabled} (타임아웃 {timeout_ms}ms)")
+
+    def on_frame_presented(self, frame_id: int):
+        """ProjectorWindow.frame_presented 슬롯 (GUI 스레드)"""
+        self._frame_mutex.lock()
+        if frame_id == self._pending_frame:
+            self._presented_frame = frame_id
+            self._frame_latencies.append(time.monotonic() - self._frame_emit_time)
+            self._frame_condition.wakeAll()
+        self._frame_mutex.unlock()
+
+    def _emit_frame(self, qimage: QImage, frame_id: int):
+        """프레임 표시 요청 (대기 상태 초기화 후 emit)"""
+        self._frame_mutex.lock()
+        self._pending_frame = frame_id
+        self._presented_frame = -1
+        self._frame_emit_time = time.monotonic()
+        self._frame_mutex.unlock()
+
+        self.show_image.emit(qimage, frame_id)
+
+    def _wait_frame_presented(self, frame_id: int) -> bool:
+        """
+        프레임이 프로젝터에 그려질 때까지 대기
+
+        Returns:
+            bool: 표시 확인 시 True, 타임아웃 시 False
+        """
+        deadline = time.monotonic() + self._frame_ack_timeout_ms / 1000.0
+
+        self._frame_mutex.lock()
+        try:
+            while self._presented_frame != frame_id:
+                remaining_ms = int((deadline - time.monotonic()) * 1000)
+                if remaining_ms <= 0 or not self._frame_condition.wait(self._frame_mutex, remaining_ms):
+                    return self._presented_frame == frame_id
+            return True
+        finally:
+            self._frame_mutex.unlock()
+
+    def frame_latency_stats(self) -> Dict[str, float]:
+        """
+        emit → painted 지연 통계 (밀리초)
+
+        Returns:
+            {'count', 'min', 'avg', 'max'}
+        """
+        self._frame_mutex.lock()
+        latencies = list(self._frame_latencies)
+        self._frame_mutex.unlock()
+
+        if not latencies:
+            return {'count': 0, 'min': 0.0, 'avg': 0.0, 'max': 0.0}
+
+        return {
+            'count': len(latencies),
+            'min': min(latencies) * 1000,
+            'avg': sum(latencies) / len(latencies) * 1000,
+            'max': max(latencies) * 1000,
+        }
 
     # ==================== 상태 관리 ====================
 
@@ -211,7 +340,9 @@ class PrintWorker(QThread):
     def start_print(self, file_path: str, params: Dict[str, Any],
                    blade_speed: int = 1500, led_power: int = 440,
                    leveling_cycles: int = 1, use_mask: bool = False,
-                   mask_path: str = ""):
+                   mask_path: str = "", prefetch_depth: int = 3,
+                   batched_motion: bool = True, layer_names: Optional[List[str]] = None,
+                   use_layer_cache: bool = True, stage_local: bool = True):
         """
         프린트 시작
 
@@ -223,24 +354,50 @@ class PrintWorker(QThread):
             leveling_cycles: 레진 평탄화 횟수
             use_mask: MASK 적용 여부
             mask_path: MASK 파일 경로
+            prefetch_depth: 미리 준비할 레이어 수 (0이면 프리페치 끔)
+            batched_motion: 노광 후 모션을 하나의 G-code 스크립트로 전송
+            layer_names: 정렬된 레이어 파일명 (JobInfo 결과 재사용, None이면 ZIP에서 분류)
+            use_layer_cache: MASK 적용 프레임 캐시 사용 (같은 작업 반복 출력 시 디코딩/MASK 생략)
+            stage_local: 작업 ZIP을 로컬로 복사한 뒤 복사본에서 읽기 (USB 지연/분리 대비)
         """
         if self.isRunning():
             print("[PrintWorker] 이미 실행 중")
             return
 
-        # MASK 설정
-        self._use_mask = use_mask
-        self._mask_path = mask_path
-        if use_mask and mask_path:
-            self._load_mask(mask_path)
-        print(f"[PrintWorker] MASK 적용: {use_mask}, 경로: {mask_path}")
-
         # PrintParameters 객체 생성
         print_params = PrintParameters()
         for key, value in params.items():
             if hasattr(print_params, key):
                 setattr(print_params, key, value)
 
+        # MASK 설정 (레이어 해상도 크기로 미리 준비)
+        self._use_mask = use_mask
+        self._mask_path = mask_path
+        if use_mask and mask_path:
+            self._load_mask(mask_path, (print_params.resolutionX, print_params.resolutionY))
+        else:
+            self._mask_engine.unload()
+        print(f"[PrintWorker] MASK 적용: {use_mask}, 경로: {mask_path}")
+
+        # 레이어 아카이브 열기 (작업 동안 유지, 레이어 인덱스 1회 생성)
+        self._archive = LayerArchive(file_path, layer_names)
+        if self._archive.open() and len(self._archive) > 0:
+            if print_params.totalLayer != len(self._archive):
+                print(f"[PrintWorker] totalLayer 보정: {print_params.totalLayer} → {len(self._archive)} (레이어 이미지 기준)")
+                print_params.totalLayer = len(self._archive)
+
+        # 레이어 프레임 캐시 키 (실제로 MASK가 로드된 경우에만 MASK 해시 사용)
+        self._cache_key = None
+        if use_layer_cache and self._archive.is_open:
+            try:
+                mask = (mask_key(mask_path, (print_params.resolutionX, print_params.resolutionY))
+                        if self._use_mask and self._mask_engine.is_loaded else NO_MASK)
+                self._cache_key = (self._archive.content_key(), mask)
+                missing = len(get_layer_cache().missing(*self._cache_key, len(self._archive)))
+                print(f"[PrintWorker] 레이어 캐시: {len(self._archive) - missing}/{len(self._archive)} 적중 예정")
+            except OSError as e:
+                print(f"[PrintWorker] 레이어 캐시 사용 불가: {e}")
+
         # 작업 생성
         self._job = PrintJob(
             file_path=file_path,
@@ -249,20 +406,27 @@ class PrintWorker(QThread):
             led_power=led_power,
             leveling_cycles=leveling_cycles,
             use_mask=use_mask,
-            mask_path=mask_path
+            mask_path=mask_path,
+            prefetch_depth=max(0, prefetch_depth),
+            batched_motion=batched_motion,
+            layer_cache=self._cache_key is not None,
+            stage_local=stage_local and self._archive.is_open
         )
 
         # 플래그 초기화
         self._is_paused = False
         self._is_stopped = False
+        self._frame_latencies = []
+        self._exposure_log = []
 
         # 스레드 시작
         self.start()
 
     def pause(self):
-        """일시정지"""
+        """일시정지 (노광 중이면 노광 대기를 깨워 LED OFF)"""
         self._mutex.lock()
         self._is_paused = True
+        self._pause_condition.wakeAll()
         self._mutex.unlock()
         self._set_status(PrintStatus.PAUSED)
         print("[PrintWorker] 일시정지")
@@ -324,6 +488,16 @@ class PrintWorker(QThread):
             if self.motor:
                 self.motor.connect()
 
+        # 레이어 단계별 시간 기록
+        if job.profile:
+            self._profiler = PrintProfiler(params.totalLayer, job.file_path)
+
+        # 작업 ZIP 로컬 복사 시작 (홈/평탄화와 동시에 진행, 끝나면 복사본에서 읽기)
+        self._start_staging(job)
+
+        # 레이어 프리페치 시작 (홈/평탄화 동안 첫 레이어들 미리 준비)
+        self._start_prefetch(job, params.totalLayer)
+
         # Z축 홈
         if self._check_stopped():
             return
@@ -368,7 +542,17 @@ class PrintWorker(QThread):
             self.progress_updated.emit(layer_idx + 1, total_layers)
 
             # 레이어 처리 (실패 시 루프 종료)
-            if not self._process_layer(layer_idx, job):
+            if self._profiler is not None:
+                self._profiler.begin_layer(layer_idx)
+            layer_start = self._now()
+
+            ok = self._process_layer(layer_idx, job)
+
+            if self._profiler is not None:
+                self._profiler.record('layer_total', self._now() - layer_start)
+                self.profile_updated.emit(self._profiler.end_layer())
+
+            if not ok:
                 break
 
         # 5. 완료 또는 정지
@@ -386,7 +570,7 @@ class PrintWorker(QThread):
         Flow:
         1. Z축 레이어 높이로 이동
         2. X축 0 → 125mm 이동 (블레이드)
-        3. 이미지 투영
+        3. 이미지 투영 (프로젝터 표시 확인까지 대기)
         4. LED ON + 노광 대기
         5. LED OFF
         6. Z축 리프트
@@ -413,13 +597,19 @@ class PrintWorker(QThread):
         z_position = (layer_idx + 1) * params.layerHeight
 
         # 1. Z축 레이어 높이로 이동
-        if not self._motor_z_move(z_position):
+        t0 = self._now()
+        moved = self._motor_z_move(z_position)
+        self._profile('z_move', self._now() - t0)
+        if not moved:
             self.error_occurred.emit(f"레이어 {layer_idx}: Z축 이동 실패")
             self._is_stopped = True
             return False
 
         # 2. X축 이동 (0 → 125mm)
-        if not self._motor_x_move(125, job.blade_speed):
+        t0 = self._now()
+        moved = self._motor_x_move(125, job.blade_speed)
+        self._profile('blade_sweep', self._now() - t0)
+        if not moved:
             self.error_occurred.emit(f"레이어 {layer_idx}: X축 이동 실패")
             self._is_stopped = True
             return False
@@ -439,33 +629,51 @@ class PrintWorker(QThread):
             self._mutex.unlock()
             return False
 
-        # 4. LED ON + 노광
-        self._dlp_led_on(job.led_power)
-
-        # 노광 대기 (일시정지/정지 체크하면서)
-        self._wait_exposure(exposure_time)
-
-        # 5. LED OFF
-        self._dlp_led_off()
+        # 4~5. LED ON → 노광 → LED OFF
+        self._run_exposure(layer_idx, exposure_time, job.led_power)
 
         # 이미지 클리어
         self.clear_image.emit()
 
+        # 6~8. 리프트 → 블레이드 복귀 → 다음 레이어 하강
+        next_z = (layer_idx + 2) * params.layerHeight
+        if job.batched_motion:
+            t0 = self._now()
+            failed_step = self._motor_layer_program(
+                z_position + lift_height, lift_speed,
+                job.blade_speed,
+                next_z, params.normalDropSpeed
+            )
+            self._profile('post_motion', self._now() - t0)
+            if failed_step:
+                self.error_occurred.emit(f"레이어 {layer_idx}: {failed_step} 실패")
+                self._is_stopped = True
+                return False
+            return True
+
         # 6. Z축 리프트
-        if not self._motor_z_move(z_position + lift_height, lift_speed):
+        t0 = self._now()
+        moved = self._motor_z_move(z_position + lift_height, lift_speed)
+        self._profile('lift', self._now() - t0)
+        if not moved:
             self.error_occurred.emit(f"레이어 {layer_idx}: Z축 리프트 실패")
             self._is_stopped = True
             return False
 
         # 7. X축 복귀 (125 → 0mm)
-        if not self._motor_x_move(0, job.blade_speed):
+        t0 = self._now()
+        moved = self._motor_x_move(0, job.blade_speed)
+        self._profile('return', self._now() - t0)
+        if not moved:
             self.error_occurred.emit(f"레이어 {layer_idx}: X축 복귀 실패")
             self._is_stopped = True
             return False
 
         # 8. Z축 다음 레이어 높이로 하강
-        next_z = (layer_idx + 2) * params.layerHeight
-        if not self._motor_z_move(next_z, params.normalDropSpeed):
+        t0 = self._now()
+        moved = self._motor_z_move(next_z, params.normalDropSpeed)
+        self._profile('drop', self._now() - t0)
+        if not moved:
             self.error_occurred.emit(f"레이어 {layer_idx}: Z축 하강 실패")
             self._is_stopped = True
             return False
@@ -513,6 +721,25 @@ class PrintWorker(QThread):
             time.sleep(0.2)
             return True
 
+    def _motor_layer_program(self, lift_z: float, lift_speed: int, blade_speed: int,
+                             next_z: float, drop_speed: int) -> Optional[str]:
+        """
+        노광 후 모션 일괄 실행 (Z 리프트 → X 복귀 → Z 하강, 완료 대기 1회)
+
+        Returns:
+            실패한 단계 이름 (성공 시 None)
+        """
+        if self.motor and not self.simulation:
+            success, failed = self.motor.layer_motion_program(
+                lift_z, lift_speed, 0, blade_speed, next_z, drop_speed
+            )
+            if not success:
+                return failed.name if failed else "레이어 모션"
+            return None
+        else:
+            time.sleep(0.4)  # 시뮬레이션 (Z 0.1 + X 0.2 + Z 0.1)
+            return None
+
     def _dlp_projector_on(self):
         """프로젝터 ON"""
         print("[PrintWorker] 프로젝터 ON")
@@ -525,7 +752,7 @@ class PrintWorker(QThread):
         if self.dlp and not self.simulation:
             self.dlp.projector_off()
 
-    def _dlp_led_on(self, brightness: int):
+    def _dlp_led_on(self, brightness: Optional[int] = None):
         """LED ON"""
         if self.dlp and not self.simulation:
             self.dlp.led_on(brightness)
@@ -535,10 +762,127 @@ class PrintWorker(QThread):
         if self.dlp and not self.simulation:
             self.dlp.led_off()
 
+    def _prepare_layer_image(self, layer_idx: int, timings: Optional[Dict[str, float]] = None) -> QImage:
+        """
+        레이어 이미지 준비 (읽기 + MASK + 디코딩)
+
+        프리페치 스레드와 워커 스레드 양쪽에서 호출됨
+
+        레이어 캐시에 있으면 압축된 프레임만 풀어서 반환 (읽기/디코딩/MASK 생략),
+        없으면 준비한 프레임을 캐시에 저장 (다음 출력부터 적중)
+
+        Args:
+            layer_idx: 레이어 인덱스
+            timings: 단계별 시간 기록용 dict ('layer_cache', 'image_fetch', 'mask', 'decode')
+
+        Returns:
+            표시 가능한 QImage
+
+        Raises:
+            이미지 읽기/디코딩 실패 시 예외
+        """
+        if self._archive is None or not self._archive.is_open:
+            raise IOError(f"레이어 아카이브가 열려있지 않음: {self._archive.zip_path if self._archive else ''}")
+
+        timings = timings if timings is not None else {}
+
+        cache_key = self._cache_key
+        if cache_key is not None:
+            t0 = self._now()
+            frame = get_layer_cache().get(*cache_key, layer_idx)
+            if frame is not None:
+                qimage = MaskEngine.frame_to_qimage(frame)
+                MaskEngine.tag_bbox(qimage, self._layer_bbox(layer_idx))
+                timings['layer_cache'] = self._now() - t0
+                return qimage
+
+        t0 = self._now()
+        image_data = self._archive.read_layer(layer_idx)
+        timings['image_fetch'] = self._now() - t0
+        if not image_data:
+            raise FileNotFoundError(f"레이어 {layer_idx} 이미지를 찾을 수 없음")
+
+        # 디코딩 + MASK 적용 (활성화된 경우)
+        qimage = self._decode_layer(image_data, timings, layer_idx)
+        if qimage.isNull():
+            raise ValueError(f"이미지 데이터 손상 (레이어 {layer_idx})")
+
+        # 다음 출력을 위해 캐시에 저장 (프리페치 스레드에서 대부분 처리)
+        # MASK 합성이 실패해 원본만 디코딩된 프레임은 저장하지 않음
+        if cache_key is not None and (cache_key[1] == NO_MASK or 'mask' in timings):
+            t0 = self._now()
+            frame = MaskEngine.frame_from_qimage(qimage)
+            if frame is not None:
+                get_layer_cache().put(*cache_key, layer_idx, frame)
+            timings['layer_cache'] = self._now() - t0
+        return qimage
+
+    def _start_prefetch(self, job: PrintJob, total_layers: int):
+        """레이어 프리페치 스레드 시작"""
+        self._stop_prefetch()
+
+        if job.prefetch_depth <= 0 or total_layers <= 0:
+            print("[PrintWorker] 프리페치 사용 안 함")
+            return
+
+        self._prefetcher = LayerPrefetcher(
+            self._prepare_layer_image,
+            total_layers,
+            depth=job.prefetch_depth
+        )
+        self._prefetcher.start()
+
+    def _stop_prefetch(self):
+        """레이어 프리페치 스레드 정지"""
+        if self._prefetcher is not None:
+            self._prefetcher.stop()
+            self._prefetcher = None
+
+    def _start_staging(self, job: PrintJob):
+        """작업 ZIP 로컬 복사 스레드 시작 (이미 로컬에 있으면 생략)"""
+        self._stop_staging()
+        self._staging_percent = -1
+
+        if not job.stage_local or self._archive is None:
+            return
+
+        stager = get_job_stager()
+        if not stager.should_stage(job.file_path):
+            print("[PrintWorker] 작업 파일이 로컬 저장소에 있음 - 복사 생략")
+            return
+
+        self._staging = StagingTask(stager, job.file_path,
+                                    self._on_staging_progress, self._on_staged)
+        self._staging.start()
+
+    def _stop_staging(self):
+        """로컬 복사 중단 (아카이브를 닫기 전에 호출)"""
+        if self._staging is not None:
+            self._staging.cancel()
+            self._staging = None
+
+    def _on_staging_progress(self, copied: int, total: int):
+        """복사 진행률 (복사 스레드에서 호출, 1% 단위로만 시그널)"""
+        percent = min(99, copied * 100 // total) if total > 0 else 99
+        if percent != self._staging_percent:
+            self._staging_percent = percent
+            self.staging_progress.emit(percent)
+
+    def _on_staged(self, local_path: Optional[str]):
+        """복사 완료 (복사 스레드에서 호출) → 아카이브를 복사본으로 전환"""
+        archive = self._archive
+        if local_path and archive is not None and archive.relocate(local_path):
+            print(f"[PrintWorker] 로컬 복사본에서 읽기: {local_path}")
+            self.staging_progress.emit(100)
+        else:
+            print("[PrintWorker] 로컬 복사 실패 - USB에서 계속 읽기")
+
     def _show_layer_image(self, zip_path: str, layer_idx: int) -> bool:
         """
         레이어 이미지 표시 (MASK 적용 포함)
 
+        프리페치된 이미지가 있으면 바로 교체, 없거나 실패했으면 직접 준비 (재시도)
+
         Args:
             zip_path: ZIP 파일 경로
             layer_idx: 레이어 인덱스
@@ -546,37 +890,55 @@ class PrintWorker(QThread):
         Returns:
             bool: 성공 시 True, 실패 시 False
         """
-        max_retries = 3
-        retry_delay = 0.5  # 500ms
-
-        for attempt in range(max_retries):
-            try:
-                image_data = GCodeParser.get_layer_image(zip_path, layer_idx)
-                if image_data:
-                    # MASK 적용 (활성화된 경우)
-                    if self._use_mask and self._mask_image is not None:
-                        image_data = self._apply_mask(image_data)
-
-                    qimage = QImage.fromData(image_data)
-                    if qimage.isNull():
-                        raise ValueError(f"이미지 데이터 손상 (레이어 {layer_idx})")
-                    pixmap = QPixmap.fromImage(qimage)
-                    self.show_image.emit(pixmap)
-                    return True
-                else:
-                    raise FileNotFoundError(f"레이어 {layer_idx} 이미지를 찾을 수 없음")
-            except Exception as e:
-                print(f"[PrintWorker] 이미지 로드 오류 (시도 {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                else:
-                    # 모든 재시도 실패
-                    error_msg = f"레이어 {layer_idx} 이미지 로드 실패: {e}"
-                    print(f"[PrintWorker] 치명적 오류: {error_msg}")
-                    self.error_occurred.emit(error_msg)
-                    return False
-
-        return False
+        qimage = None
+
+        # 1. 프리페치 버퍼에서 꺼내기
+        if self._prefetcher is not None:
+            t0 = self._now()
+            prepared = self._prefetcher.take(layer_idx)
+            self._profile('prefetch_wait', self._now() - t0)
+            if prepared is not None and prepared.ok:
+                qimage = prepared.image
+                for phase, seconds in prepared.timings.items():
+                    self._profile(phase, seconds)
+            elif prepared is not None:
+                print(f"[PrintWorker] 프리페치 실패, 직접 로드: {prepared.error}")
+
+        # 2. 직접 준비 (재시도 포함)
+        if qimage is None:
+            max_retries = 3
+            retry_delay = 0.5  # 500ms
+
+            for attempt in range(max_retries):
+                try:
+                    timings = {}
+                    qimage = self._prepare_layer_image(layer_idx, timings)
+                    for phase, seconds in timings.items():
+                        self._profile(phase, seconds)
+                    break
+                except Exception as e:
+                    print(f"[PrintWorker] 이미지 로드 오류 (시도 {attempt + 1}/{max_retries}): {e}")
+                    if attempt < max_retries - 1:
+                        time.sleep(retry_delay)
+                        # USB 일시 오류 대비 아카이브 다시 열기
+                        if self._archive is not None:
+                            self._archive.reopen()
+                    else:
+                        # 모든 재시도 실패
+                        error_msg = f"레이어 {layer_idx} 이미지 로드 실패: {e}"
+                        print(f"[PrintWorker] 치명적 오류: {error_msg}")
+                        self.error_occurred.emit(error_msg)
+                        return False
+
+        # QPixmap 변환은 GUI 스레드에서 (워커에서는 8비트 QImage만 전달)
+        t0 = self._now()
+        self._emit_frame(qimage, layer_idx)
+
+        # 프로젝터에 실제로 그려질 때까지 대기 (LED ON 전)
+        if self._frame_ack_enabled and not self._wait_frame_presented(layer_idx):
+            print(f"[PrintWorker] 레이어 {layer_idx} 표시 확인 타임아웃 ({self._frame_ack_timeout_ms}ms)")
+        self._profile('display', self._now() - t0)
+        return True
 
     # ==================== 유틸리티 ====================
 
@@ -594,26 +956,129 @@ class PrintWorker(QThread):
                 print(f"[PrintWorker] 평탄화 {i+1}/{cycles}")
                 time.sleep(0.5)
 
-    def _wait_exposure(self, duration: float):
+    # ==================== 노광 ====================
+
+    def _now(self) -> float:
+        """현재 시각 (monotonic, 초) - 시뮬레이터에서 가상 시계로 대체"""
+        return time.monotonic()
+
+    def _profile(self, phase: str, seconds: float):
+        """현재 레이어 단계 시간 기록 (프로파일러 사용 시)"""
+        if self._profiler is not None:
+            self._profiler.record(phase, seconds)
+
+    def _wait_until(self, deadline: float) -> str:
         """
-        노광 대기 (일시정지/정지 체크하면서)
+        deadline까지 대기 (일시정지/정지 시 즉시 깨어남)
 
-        Args:
-            duration: 노광 시간 (초)
+        폴링 대신 _pause_condition으로 대기 (pause/resume/stop이 wakeAll)
+
+        Returns:
+            'done' / 'paused' / 'stopped'
         """
-        elapsed = 0.0
-        interval = 0.1  # 100ms 간격으로 체크
+        self._mutex.lock()
+        try:
+            while True:
+                if self._is_stopped:
+                    return 'stopped'
+                if self._is_paused:
+                    return 'paused'
+
+                # 올림: 1ms 미만이 남아도 한 번 더 대기 (노광이 목표보다 짧아지지 않도록)
+                remaining_ms = math.ceil((deadline - self._now()) * 1000)
+                if remaining_ms <= 0:
+                    return 'done'
+                self._pause_condition.wait(self._mutex, remaining_ms)
+        finally:
+            self._mutex.unlock()
 
-        while elapsed < duration:
-            if self._check_stopped():
-                return
+    def _timed_led(self, on: bool, brightness: Optional[int] = None) -> float:
+        """
+        LED ON/OFF 명령 실행 후 실제 전환 시각 추정
+
+        시리얼 명령 왕복의 중간 시점에 LED가 전환된다고 보고 반환
+        (밝기 설정은 호출 전에 따로 처리해 측정에 포함하지 않음)
+
+        Returns:
+            LED 전환 추정 시각 (self._now() 기준)
+        """
+        start = self._now()
+        if on:
+            self._dlp_led_on(brightness)
+        else:
+            self._dlp_led_off()
+        elapsed = self._now() - start
+        half_rtt = elapsed / 2
+        self._profile('led_on' if on else 'led_off', elapsed)
+
+        if not on:
+            # 다음 노광의 OFF 명령을 그만큼 앞당겨 보냄
+            self._led_off_latency = half_rtt if self._led_off_latency == 0.0 \
+                else self._led_off_latency * 0.7 + half_rtt * 0.3
+
+        return start + half_rtt
+
+    def _run_exposure(self, layer_idx: int, duration: float, brightness: int) -> float:
+        """
+        노광 실행 (monotonic deadline 기반)
+
+        - LED ON 전환 시점부터 duration 뒤에 LED가 꺼지도록 OFF 명령 지연만큼 먼저 전송
+        - 노광 중 일시정지: LED OFF → 재개 시 남은 시간만큼 다시 노광 (LED를 켠 채 대기하지 않음)
+        - 노광 중 정지: 즉시 LED OFF
+
+        Args:
+            layer_idx: 레이어 인덱스
+            duration: 목표 노광 시간 (초)
+            brightness: LED 밝기
 
+        Returns:
+            실제 LED ON 시간 합계 (초)
+        """
+        # 밝기는 미리 설정 (캐시되어 있으면 전송 생략)
+        if self.dlp and not self.simulation:
+            self.dlp.set_brightness(brightness)
+
+        exposed = 0.0
+        while duration - exposed > 0.001:
             self._check_paused()
             if self._check_stopped():
-                return
+                break
+
+            on_at = self._timed_led(True)
+            reason = self._wait_until(on_at + (duration - exposed) - self._led_off_latency)
+            off_at = self._timed_led(False)
+            exposed += max(0.0, off_at - on_at)
+
+            if reason == 'stopped':
+                break
+            if reason == 'paused':
+                print(f"[PrintWorker] 노광 중 일시정지 - LED OFF ({exposed:.3f}/{duration:.3f}초)")
 
-            time.sleep(interval)
-            elapsed += interval
+        self._profile('exposure', exposed)
+        self._exposure_log.append((layer_idx, duration, exposed))
+        self.exposure_measured.emit(layer_idx, duration, exposed)
+        print(f"[PrintWorker] 노광 레이어 {layer_idx}: 목표 {duration:.3f}초, 실제 {exposed:.3f}초 "
+              f"({(exposed - duration) * 1000:+.1f}ms)")
+        return exposed
+
+    def exposure_stats(self) -> Dict[str, float]:
+        """
+        노광 정확도 통계 (실제 - 목표, 밀리초)
+
+        정지로 중단된 레이어도 포함
+
+        Returns:
+            {'count', 'mean_error', 'max_error'}
+        """
+        errors = [(actual - target) * 1000 for _, target, actual in self._exposure_log]
+        if not errors:
+            return {'count': 0, 'mean_error': 0.0, 'max_error': 0.0}
+
+        return {
+            'count': len(errors),
+            'mean_error': sum(errors) / len(errors),
+            'max_error': max(errors, key=abs),
+        }
 
     def _check_stopped(self) -> bool:
         """정지 여부 확인"""
@@ -638,12 +1103,38 @@ class PrintWorker(QThread):
 
         # projector_off() 제거 - Boot ON 상태 유지 (프로그램 종료 시에만 OFF)
 
+        # 레이어 프리페치 / 로컬 복사 정지
+        self._stop_prefetch()
+        self._stop_staging()
+
         # 이미지 클리어
         self.clear_image.emit()
 
         # X축만 홈 복귀 (Z축은 현재 위치 유지 - 안전을 위해)
         self._motor_x_home()
 
+        # 단계별 시간 요약 + CSV 닫기
+        if self._profiler is not None:
+            self._profiler.close()
+            self._profiler = None
+
+        # 노광 정확도 통계
+        stats = self.exposure_stats()
+        if stats['count'] > 0:
+            print(f"[PrintWorker] 노광 오차: {stats['count']}레이어, "
+                  f"평균 {stats['mean_error']:+.1f}ms, 최대 {stats['max_error']:+.1f}ms")
+
+        # 프레임 표시 지연 통계
+        stats = self.frame_latency_stats()
+        if stats['count'] > 0:
+            print(f"[PrintWorker] 프레임 표시 지연: {stats['count']}회, "
+                  f"평균 {stats['avg']:.1f}ms, 최소 {stats['min']:.1f}ms, 최대 {stats['max']:.1f}ms")
+
+        # 레이어 아카이브 닫기
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
         self._set_status(PrintStatus.IDLE)
         print("[PrintWorker] 정리 완료")
 